@@ -0,0 +1,63 @@
+"""
+Microbenchmark: calls/sec of the pure-Python module vs the compiled accelerator.
+
+Both are built from the same whenwords.py; run `python build_accel.py` first.
+
+Usage:
+    python benchmarks/bench_accel.py [--count N] [--number N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import random
+import sys
+from pathlib import Path
+
+from common import REFERENCE, calls_per_sec, make_timestamps, report, whenwords
+
+
+def load_pure():
+    spec = importlib.util.spec_from_file_location('whenwords_pure', Path(whenwords.__file__).parent / 'whenwords.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--number', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if not whenwords.COMPILED:
+        print('compiled accelerator not built; run python build_accel.py', file=sys.stderr)
+        return 1
+    pure = load_pure()
+
+    rng = random.Random(0)
+    timestamps = make_timestamps(args.count)
+    iso = [pure.datetime.fromtimestamp(ts, pure.timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ') for ts in timestamps]
+    seconds = [rng.randrange(0, 30 * whenwords.SECONDS_PER_DAY) for _ in range(args.count)]
+    texts = [pure.duration(s, pure.DurationOptions(compact=True)).replace(' ', '') for s in seconds]
+
+    cases = (
+        ('timeago', 'timeago', [(ts, REFERENCE) for ts in timestamps]),
+        ('timeago iso', 'timeago', [(ts, REFERENCE) for ts in iso]),
+        ('duration', 'duration', [(s,) for s in seconds]),
+        ('parse_duration', 'parse_duration', [(t,) for t in texts]),
+        ('human_date', 'human_date', [(ts, REFERENCE) for ts in timestamps]),
+        ('date_range', 'date_range', [(ts, ts + s) for ts, s in zip(timestamps, seconds)]),
+    )
+    for label, name, calls in cases:
+        slow, fast = getattr(pure, name), getattr(whenwords, name)
+        assert [slow(*a) for a in calls] == [fast(*a) for a in calls]
+        report(label, calls_per_sec(slow, calls, args.number, args.repeat),
+               calls_per_sec(fast, calls, args.number, args.repeat))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
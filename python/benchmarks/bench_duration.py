@@ -0,0 +1,45 @@
+"""
+Microbenchmark: duration() calls/sec, per-call unit list vs static unit table,
+then duration() vs a duration_formatter() bound to the same options.
+
+Usage:
+    python benchmarks/bench_duration.py [--count N] [--number N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+
+from common import calls_per_sec, report, whenwords
+
+import reference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    # Elapsed times of scheduler jobs: seconds to a few weeks
+    rng = random.Random(0)
+    seconds = [rng.randrange(0, 30 * whenwords.SECONDS_PER_DAY) for _ in range(args.count)]
+
+    for label, fields in (('default', {}), ('compact', {'compact': True}), ('max_units=3', {'max_units': 3})):
+        old_calls = [(s, reference.DurationOptions(**fields)) for s in seconds]
+        new_calls = [(s, whenwords.DurationOptions(**fields)) for s in seconds]
+        assert [reference.duration(*a) for a in old_calls] == [whenwords.duration(*a) for a in new_calls]
+        report(f'duration {label}', calls_per_sec(reference.duration, old_calls, args.number, args.repeat),
+               calls_per_sec(whenwords.duration, new_calls, args.number, args.repeat))
+
+        format_duration = whenwords.duration_formatter(whenwords.DurationOptions(**fields))
+        bound_calls = [(s,) for s in seconds]
+        assert [format_duration(*a) for a in bound_calls] == [whenwords.duration(*a) for a in new_calls]
+        report(f'duration_formatter {label}', calls_per_sec(whenwords.duration, new_calls, args.number, args.repeat),
+               calls_per_sec(format_duration, bound_calls, args.number, args.repeat))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Microbenchmark: human_date() and date_range() calls/sec, datetime-based
+reference vs integer civil-date arithmetic.
+
+With --tz, also compares localizing each timestamp through datetime before
+calling the reference against human_date(..., tz=...) and its offset index.
+Then compares date_range() per pair against date_range_many() on lists and,
+if NumPy is installed, int64 arrays.
+
+Usage:
+    python benchmarks/bench_human_date.py [--count N] [--number N] [--repeat R] [--tz KEY]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+from datetime import datetime
+
+from common import REFERENCE, calls_per_sec, make_timestamps, report, whenwords
+
+import reference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--tz', default='America/New_York')
+    args = parser.parse_args()
+
+    # An inbox: a few hundred distinct days, many messages per day
+    timestamps = make_timestamps(args.count, span=whenwords.SECONDS_PER_YEAR)
+    human_date_calls = [(ts, REFERENCE) for ts in timestamps]
+    date_range_calls = list(zip(timestamps, timestamps[1:] + timestamps[:1]))
+
+    for name, calls in (('human_date', human_date_calls), ('date_range', date_range_calls)):
+        old, new = getattr(reference, name), getattr(whenwords, name)
+        assert [old(*a) for a in calls] == [new(*a) for a in calls]
+        report(name, calls_per_sec(old, calls, args.number, args.repeat),
+               calls_per_sec(new, calls, args.number, args.repeat))
+
+    from zoneinfo import ZoneInfo
+
+    tz = ZoneInfo(args.tz)
+
+    def localize(ts: int) -> int:
+        return ts + int(datetime.fromtimestamp(ts, tz).utcoffset().total_seconds())
+
+    def local_human_date(ts: int, ref: int) -> str:
+        return reference.human_date(localize(ts), localize(ref))
+
+    def zoned_human_date(ts: int, ref: int) -> str:
+        return whenwords.human_date(ts, ref, tz)
+
+    assert [local_human_date(*a) for a in human_date_calls] == [zoned_human_date(*a) for a in human_date_calls]
+    report(f'human_date tz={args.tz}', calls_per_sec(local_human_date, human_date_calls, args.number, args.repeat),
+           calls_per_sec(zoned_human_date, human_date_calls, args.number, args.repeat))
+
+    # Booking search results: check-ins over a year, stays of 1 to 14 nights
+    rng = random.Random(0)
+    starts = timestamps
+    ends = [ts + rng.randrange(1, 15) * whenwords.SECONDS_PER_DAY for ts in starts]
+    pairs = list(zip(starts, ends))
+    per_pair = calls_per_sec(whenwords.date_range, pairs, args.number, args.repeat)
+    batches = {'list': (starts, ends)}
+    try:
+        import numpy as np
+    except ImportError:
+        pass
+    else:
+        batches['numpy'] = (np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64))
+    for label, batch in batches.items():
+        assert whenwords.date_range_many(*batch) == [whenwords.date_range(*a) for a in pairs]
+        report(f'date_range_many {label}', per_pair,
+               calls_per_sec(whenwords.date_range_many, [batch], args.number, args.repeat) * len(pairs))
+
+
+if __name__ == '__main__':
+    main()
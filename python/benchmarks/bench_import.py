@@ -0,0 +1,106 @@
+"""
+Benchmark and regression check: the cost of `import whenwords` in a fresh interpreter.
+
+Runs `python -X importtime -c "import whenwords"` repeatedly, takes the best
+run, and compares it with the baseline module. Exits with status 1 if the
+import exceeds the budget or pulls in a module that should only load on use.
+
+Usage:
+    python benchmarks/bench_import.py [--runs N] [--budget-ms MS] [--self-budget-ms MS]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+# Published budget, best of --runs: whenwords plus everything it imports, and
+# the module body on its own. Even the best of 20 runs swings by about a third
+# between invocations on one machine (7.7-11.4 ms total, 2.0-2.7 ms body), so
+# the budget sits above the slowest best-of-20 seen rather than the typical one.
+BUDGET_MS = 15.0
+SELF_BUDGET_MS = 4.0
+
+# Loaded on first use (re, threading) or never (typing, dataclasses)
+DEFERRED_MODULES = ('re', 'typing', 'dataclasses', 'threading', 'argparse', 'json', 'csv', 'asyncio')
+
+
+def _env(pure: bool = True) -> dict[str, str]:
+    """
+    Child environment that may write bytecode, so runs measure a warm .pyc as users see it.
+
+    The budget is for the pure-Python module; pure=False lets a built
+    compiled accelerator load too.
+    """
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    env.pop('WHENWORDS_PURE_PYTHON', None)
+    if pure:
+        env['WHENWORDS_PURE_PYTHON'] = '1'
+    return env
+
+
+def import_time(module: str, cwd: Path, pure: bool = True) -> tuple[float, float]:
+    """(self ms, cumulative ms) of one fresh `import module`."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, env=_env(pure), capture_output=True, text=True, check=True,
+    )
+    for line in proc.stderr.splitlines():
+        fields = line.removeprefix('import time:').split('|')
+        if len(fields) == 3 and fields[2].strip() == module:
+            return int(fields[0]) / 1000, int(fields[1]) / 1000
+    raise RuntimeError(f'No importtime line for {module}')
+
+
+def best_import_time(module: str, cwd: Path, runs: int, pure: bool = True) -> tuple[float, float]:
+    import_time(module, cwd, pure)  # warm the bytecode cache
+    samples = [import_time(module, cwd, pure) for _ in range(runs)]
+    return min(s[0] for s in samples), min(s[1] for s in samples)
+
+
+def loaded_modules(module: str, cwd: Path) -> set[str]:
+    """Top-level modules that `import module` adds to a fresh interpreter."""
+    code = f'import sys; before = set(sys.modules); import {module}; print(*set(sys.modules) - before)'
+    proc = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=_env(), capture_output=True, text=True, check=True)
+    return set(proc.stdout.split())
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--budget-ms', type=float, default=BUDGET_MS)
+    parser.add_argument('--self-budget-ms', type=float, default=SELF_BUDGET_MS)
+    args = parser.parse_args()
+
+    before_self, before_total = best_import_time('reference', HERE, args.runs)
+    after_self, after_total = best_import_time('whenwords', HERE.parent, args.runs)
+    print(f'import before: {before_total:7.2f} ms  (module body {before_self:.2f} ms)')
+    print(f'import after:  {after_total:7.2f} ms  (module body {after_self:.2f} ms, '
+          f'{before_total / after_total:.1f}x faster)')
+    print(f'budget:        {args.budget_ms:7.2f} ms  (module body {args.self_budget_ms:.2f} ms)')
+    if list(HERE.parent.glob('_whenwords_accel.*')):
+        # Informational: the pure module body runs, then hands over to the extension
+        compiled_self, compiled_total = best_import_time('whenwords', HERE.parent, args.runs, pure=False)
+        print(f'compiled:      {compiled_total:7.2f} ms  (module bodies {compiled_self:.2f} ms)')
+
+    failures = []
+    if after_total > args.budget_ms:
+        failures.append(f'import takes {after_total:.2f} ms, over the {args.budget_ms:.2f} ms budget')
+    if after_self > args.self_budget_ms:
+        failures.append(f'module body takes {after_self:.2f} ms, over the {args.self_budget_ms:.2f} ms budget')
+    eager = sorted(set(DEFERRED_MODULES) & loaded_modules('whenwords', HERE.parent))
+    if eager:
+        failures.append(f'imported eagerly: {", ".join(eager)}')
+    for failure in failures:
+        print(f'FAIL: {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
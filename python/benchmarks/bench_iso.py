@@ -0,0 +1,73 @@
+"""
+Benchmark: ISO 8601 timestamp normalization throughput on a million mixed strings.
+
+Compares the reference parser, the strict-layout fast path, and the fast
+path with set_iso_cache() enabled on a workload where strings repeat.
+
+Usage:
+    python benchmarks/bench_iso.py [--count N] [--distinct N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import datetime, timezone
+
+from common import REFERENCE, whenwords
+
+import reference
+
+
+def make_iso_strings(count: int, distinct: int, seed: int = 0) -> list[str]:
+    """Mostly strict YYYY-MM-DDTHH:MM:SSZ, plus offset, fractional and date-only forms."""
+    rng = random.Random(seed)
+    pool = []
+    for _ in range(distinct):
+        dt = datetime.fromtimestamp(REFERENCE + rng.randrange(-10 ** 8, 10 ** 8), tz=timezone.utc)
+        kind = rng.random()
+        if kind < 0.85:
+            pool.append(dt.strftime('%Y-%m-%dT%H:%M:%SZ'))
+        elif kind < 0.90:
+            pool.append(dt.isoformat())
+        elif kind < 0.95:
+            pool.append(dt.strftime('%Y-%m-%dT%H:%M:%S.') + f'{rng.randrange(1000):03d}Z')
+        else:
+            pool.append(dt.strftime('%Y-%m-%d'))
+    return [rng.choice(pool) for _ in range(count)] if count > distinct else pool[:count]
+
+
+def throughput(func, strings: list[str]) -> float:
+    start = time.perf_counter()
+    for s in strings:
+        func(s)
+    return len(strings) / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--distinct', type=int, default=50_000, help='distinct strings in the repeated workload')
+    parser.add_argument('--cache-size', type=int, default=65_536)
+    args = parser.parse_args()
+
+    unique = make_iso_strings(args.count, args.count)
+    repeated = make_iso_strings(args.count, args.distinct, seed=1)
+    normalize = whenwords._normalize_timestamp
+    assert [reference._normalize_timestamp(s) for s in unique[:10_000]] == [normalize(s) for s in unique[:10_000]]
+
+    print(f'{args.count:,} mixed ISO strings ({args.distinct:,} distinct in the repeated run)')
+    print(f'reference, all distinct:  {throughput(reference._normalize_timestamp, unique):>12,.0f} /sec')
+    print(f'fast path, all distinct:  {throughput(normalize, unique):>12,.0f} /sec')
+    print(f'reference, repeated:      {throughput(reference._normalize_timestamp, repeated):>12,.0f} /sec')
+    whenwords.set_iso_cache(args.cache_size)
+    try:
+        print(f'fast path + cache:        {throughput(normalize, repeated):>12,.0f} /sec')
+        print(f'  {whenwords.iso_cache_info()}')
+    finally:
+        whenwords.set_iso_cache(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""
+Benchmark: a live dashboard re-rendering timeago labels once a second.
+
+Compares recomputing every label on each tick (with the reference
+implementation) against TimeagoScheduler, which recomputes only the labels
+whose string changed.
+
+Usage:
+    python benchmarks/bench_live.py [--items N] [--seconds S]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from common import REFERENCE, make_timestamps, whenwords
+
+import reference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--items', type=int, default=10_000)
+    parser.add_argument('--seconds', type=int, default=600)
+    args = parser.parse_args()
+
+    # Recent activity: items from the last day, the case where labels churn most
+    timestamps = make_timestamps(args.items, span=whenwords.SECONDS_PER_DAY)
+    ticks = range(REFERENCE, REFERENCE + args.seconds)
+
+    start = time.perf_counter()
+    labels = [reference.timeago(ts, REFERENCE) for ts in timestamps]
+    full_changes = 0
+    for ref in ticks:
+        current = [reference.timeago(ts, ref) for ts in timestamps]
+        full_changes += sum(a != b for a, b in zip(labels, current))
+        labels = current
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scheduler = whenwords.TimeagoScheduler(REFERENCE)
+    for key, ts in enumerate(timestamps):
+        scheduler.add(key, ts)
+    live_changes = sum(len(scheduler.tick(ref)) for ref in ticks)
+    live = time.perf_counter() - start
+
+    assert live_changes == full_changes
+    assert [scheduler.label(key) for key in range(args.items)] == labels
+    print(f'{args.items:,} items, {args.seconds:,} one-second ticks, {live_changes:,} label changes')
+    print(f'recompute all before: {full:8.3f} s')
+    print(f'scheduler after:      {live:8.3f} s  ({full / live:.0f}x)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Microbenchmark: parse_duration_lines() over a memory-mapped file vs reading,
+decoding and splitting the file and calling parse_duration() per line.
+
+Reports lines/sec and the peak traced allocation of each approach.
+
+Usage:
+    python benchmarks/bench_parse_duration_lines.py [--count N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from bench_parse_duration_many import make_inputs
+from common import report, whenwords
+
+
+def read_and_split(path: Path) -> list:
+    results = []
+    for line_no, text in enumerate(path.read_text().splitlines(), start=1):
+        try:
+            results.append((line_no, whenwords.parse_duration(text)))
+        except ValueError as e:
+            results.append((line_no, whenwords.ParseFailure(text, str(e))))
+    return results
+
+
+def streamed(path: Path) -> int:
+    return sum(1 for _ in whenwords.parse_duration_lines(path))
+
+
+def lines_per_sec(func, path: Path, count: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(path)
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def peak_bytes(func, path: Path) -> int:
+    tracemalloc.start()
+    try:
+        func(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / 'durations.txt'
+        path.write_text('\n'.join(make_inputs(args.count)) + '\n')
+        assert list(whenwords.parse_duration_lines(path)) == read_and_split(path)
+
+        print(f'{args.count:,} lines, {path.stat().st_size:,} bytes')
+        report('parse_duration_lines', lines_per_sec(read_and_split, path, args.count, args.repeat),
+               lines_per_sec(streamed, path, args.count, args.repeat))
+        before, after = peak_bytes(read_and_split, path), peak_bytes(streamed, path)
+        print(f'peak traced memory before: {before:>12,} bytes')
+        print(f'peak traced memory after:  {after:>12,} bytes')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""
+Scaling benchmark: parse_duration_many() throughput from 1 to N worker processes.
+
+Usage:
+    python benchmarks/bench_parse_duration_many.py [--count N] [--max-workers N] [--chunksize N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import time
+
+from common import whenwords
+
+
+def make_inputs(count: int, seed: int = 0) -> list[str]:
+    """User-entered durations in assorted styles, with ~1% invalid entries."""
+    rng = random.Random(seed)
+    inputs = []
+    for _ in range(count):
+        hours, minutes, seconds = rng.randrange(48), rng.randrange(60), rng.randrange(60)
+        inputs.append(rng.choice([
+            f'{hours}h{minutes}m',
+            f'{hours} hours and {minutes} minutes',
+            f'{hours}:{minutes:02d}:{seconds:02d}',
+            f'{minutes}m {seconds}s',
+            f'{hours}.5 hrs',
+        ]) if rng.random() > 0.01 else 'n/a')
+    return inputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=2_000_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunksize', type=int, default=10_000)
+    args = parser.parse_args()
+
+    inputs = make_inputs(args.count)
+    print(f'{args.count:,} inputs, chunksize {args.chunksize:,}, {os.cpu_count()} CPUs')
+
+    baseline = None
+    for workers in range(1, args.max_workers + 1):
+        start = time.perf_counter()
+        failures = sum(
+            isinstance(result, whenwords.ParseFailure)
+            for result in whenwords.parse_duration_many(inputs, workers=workers, chunksize=args.chunksize)
+        )
+        rate = args.count / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f'workers={workers:<3} {rate:>12,.0f} inputs/sec  ({rate / baseline:.2f}x)  failures={failures:,}')
+
+
+if __name__ == '__main__':
+    main()
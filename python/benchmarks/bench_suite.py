@@ -0,0 +1,162 @@
+"""
+Benchmark suite for the public whenwords functions (requires pytest-benchmark).
+
+Runs every function over the tests.yaml corpus and over large synthetic
+inputs, with timestamps given separately as int, float, ISO string and
+datetime. See usage.md for saving baselines and failing on regressions.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timezone
+
+import pytest
+
+import whenwords
+from whenwords import DurationOptions
+
+pytest.importorskip('pytest_benchmark')
+
+REFERENCE = 1704067200
+SYNTHETIC_SIZE = 10_000
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _datetime(ts: int) -> datetime:
+    return datetime.fromtimestamp(ts, tz=timezone.utc)
+
+
+# Converters from Unix seconds to each accepted timestamp type
+TIMESTAMP_KINDS = {
+    'int': int,
+    'float': lambda ts: ts + 0.25,
+    'iso': _iso,
+    'datetime': _datetime,
+}
+
+
+def _run_all(func, calls):
+    def run():
+        for args in calls:
+            func(*args)
+    return run
+
+
+def _synthetic_timestamps(seed: int) -> list[int]:
+    rng = random.Random(seed)
+    span = 3 * whenwords.SECONDS_PER_YEAR
+    return [REFERENCE + rng.randrange(-span, span) for _ in range(SYNTHETIC_SIZE)]
+
+
+# tests.yaml corpus
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_timeago_corpus(benchmark, corpus, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    cases = corpus['timeago']
+    calls = [(convert(c['input']['timestamp']), convert(c['input']['reference'])) for c in cases]
+    assert [whenwords.timeago(*args) for args in calls] == [c['output'] for c in cases]
+    benchmark.group = 'timeago'
+    benchmark(_run_all(whenwords.timeago, calls))
+
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_human_date_corpus(benchmark, corpus, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    cases = corpus['human_date']
+    calls = [(convert(c['input']['timestamp']), convert(c['input']['reference'])) for c in cases]
+    assert [whenwords.human_date(*args) for args in calls] == [c['output'] for c in cases]
+    benchmark.group = 'human_date'
+    benchmark(_run_all(whenwords.human_date, calls))
+
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_date_range_corpus(benchmark, corpus, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    cases = corpus['date_range']
+    calls = [(convert(c['input']['start']), convert(c['input']['end'])) for c in cases]
+    assert [whenwords.date_range(*args) for args in calls] == [c['output'] for c in cases]
+    benchmark.group = 'date_range'
+    benchmark(_run_all(whenwords.date_range, calls))
+
+
+def test_duration_corpus(benchmark, corpus):
+    cases = [c for c in corpus['duration'] if not c.get('error')]
+    calls = [
+        (c['input']['seconds'], DurationOptions(**c['input']['options']) if 'options' in c['input'] else None)
+        for c in cases
+    ]
+    assert [whenwords.duration(*args) for args in calls] == [c['output'] for c in cases]
+    benchmark.group = 'duration'
+    benchmark(_run_all(whenwords.duration, calls))
+
+
+def test_parse_duration_corpus(benchmark, corpus):
+    cases = [c for c in corpus['parse_duration'] if not c.get('error')]
+    calls = [(c['input'],) for c in cases]
+    assert [whenwords.parse_duration(*args) for args in calls] == [c['output'] for c in cases]
+    benchmark.group = 'parse_duration'
+    benchmark(_run_all(whenwords.parse_duration, calls))
+
+
+# Large synthetic inputs
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_timeago_synthetic(benchmark, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    calls = [(convert(ts), REFERENCE) for ts in _synthetic_timestamps(1)]
+    benchmark.group = 'timeago-synthetic'
+    benchmark(_run_all(whenwords.timeago, calls))
+
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_human_date_synthetic(benchmark, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    calls = [(convert(ts), REFERENCE) for ts in _synthetic_timestamps(2)]
+    benchmark.group = 'human_date-synthetic'
+    benchmark(_run_all(whenwords.human_date, calls))
+
+
+@pytest.mark.parametrize('kind', TIMESTAMP_KINDS)
+def test_date_range_synthetic(benchmark, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    timestamps = [convert(ts) for ts in _synthetic_timestamps(3)]
+    calls = list(zip(timestamps, timestamps[1:] + timestamps[:1]))
+    benchmark.group = 'date_range-synthetic'
+    benchmark(_run_all(whenwords.date_range, calls))
+
+
+def test_duration_synthetic(benchmark):
+    rng = random.Random(4)
+    options = [None, DurationOptions(compact=True), DurationOptions(max_units=1), DurationOptions(max_units=3)]
+    calls = [(rng.randrange(0, 2 * whenwords.SECONDS_PER_YEAR), rng.choice(options)) for _ in range(SYNTHETIC_SIZE)]
+    benchmark.group = 'duration-synthetic'
+    benchmark(_run_all(whenwords.duration, calls))
+
+
+def test_parse_duration_synthetic(benchmark):
+    rng = random.Random(5)
+    calls = []
+    for _ in range(SYNTHETIC_SIZE):
+        hours, minutes, seconds = rng.randrange(100), rng.randrange(60), rng.randrange(60)
+        calls.append((rng.choice([
+            f'{hours}h{minutes}m',
+            f'{hours} hours and {minutes} minutes',
+            f'{hours}:{minutes:02d}:{seconds:02d}',
+            f'{hours}.5 hrs',
+            f'{minutes}m {seconds}s',
+        ]),))
+    benchmark.group = 'parse_duration-synthetic'
+    benchmark(_run_all(whenwords.parse_duration, calls))
+
+
+@pytest.mark.parametrize('kind', ['int', 'iso'])
+def test_timeago_many_synthetic(benchmark, kind):
+    convert = TIMESTAMP_KINDS[kind]
+    timestamps = [convert(ts) for ts in _synthetic_timestamps(6)]
+    benchmark.group = 'timeago_many-synthetic'
+    benchmark(whenwords.timeago_many, timestamps, REFERENCE)
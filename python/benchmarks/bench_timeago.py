@@ -0,0 +1,33 @@
+"""
+Microbenchmark: timeago() calls/sec, reference if/elif ladder vs table lookup.
+
+Usage:
+    python benchmarks/bench_timeago.py [--count N] [--number N] [--repeat R]
+"""
+
+from __future__ import annotations
+
+import argparse
+
+from common import REFERENCE, calls_per_sec, make_timestamps, report, whenwords
+
+import reference
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10_000)
+    parser.add_argument('--number', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    calls = [(ts, REFERENCE) for ts in make_timestamps(args.count)]
+    assert [reference.timeago(*a) for a in calls] == [whenwords.timeago(*a) for a in calls]
+
+    before = calls_per_sec(reference.timeago, calls, args.number, args.repeat)
+    after = calls_per_sec(whenwords.timeago, calls, args.number, args.repeat)
+    report('timeago', before, after)
+
+
+if __name__ == '__main__':
+    main()
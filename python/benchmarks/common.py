@@ -0,0 +1,36 @@
+"""Shared helpers for the whenwords microbenchmarks."""
+
+from __future__ import annotations
+
+import random
+import sys
+import timeit
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import whenwords  # noqa: E402
+
+REFERENCE = 1704067200
+
+
+def make_timestamps(count: int, span: int = 3 * whenwords.SECONDS_PER_YEAR, seed: int = 0) -> list[int]:
+    """Timestamps spread over +/- span seconds around REFERENCE, like an activity feed."""
+    rng = random.Random(seed)
+    return [REFERENCE + rng.randrange(-span, span) for _ in range(count)]
+
+
+def calls_per_sec(func: Callable[..., object], args: Sequence[tuple], number: int, repeat: int) -> float:
+    """Best-of-repeat throughput of calling func(*a) for every a in args."""
+    def run():
+        for a in args:
+            func(*a)
+
+    best = min(timeit.repeat(run, number=number, repeat=repeat))
+    return len(args) * number / best
+
+
+def report(name: str, before: float, after: float) -> None:
+    print(f'{name} before: {before:>12,.0f} calls/sec')
+    print(f'{name} after:  {after:>12,.0f} calls/sec  ({after / before:.2f}x)')
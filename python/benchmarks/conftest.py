@@ -0,0 +1,41 @@
+"""pytest configuration for the benchmark suite (bench_suite.py)."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TESTS_YAML = Path(__file__).resolve().parent.parent.parent / 'tests.yaml'
+
+DEFAULT_MAX_REGRESSION = 15
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--max-regression', type=int, default=DEFAULT_MAX_REGRESSION, metavar='PCT',
+        help='with --benchmark-compare, fail any benchmark whose mean is more than PCT%% '
+             f'slower than the baseline (default {DEFAULT_MAX_REGRESSION})',
+    )
+
+
+def pytest_configure(config):
+    # Runs before pytest-benchmark's own (trylast) configure hook, so the
+    # threshold is in place when its session reads --benchmark-compare-fail
+    if config.getoption('benchmark_compare', None) and not config.getoption('benchmark_compare_fail', None):
+        from pytest_benchmark.utils import parse_compare_fail
+
+        config.option.benchmark_compare_fail = [
+            parse_compare_fail(f'mean:{config.getoption("max_regression")}%'),
+        ]
+
+
+@pytest.fixture(scope='session')
+def corpus():
+    """The shared tests.yaml cases, keyed by function name."""
+    yaml = pytest.importorskip('yaml')
+    with open(TESTS_YAML, encoding='utf-8') as f:
+        return yaml.safe_load(f)
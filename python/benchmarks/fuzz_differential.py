@@ -0,0 +1,419 @@
+"""
+Differential fuzzing: a candidate implementation against the current one on random edge inputs.
+
+Generates seeded random inputs concentrated on the places where engines
+diverge: the timeago bucket thresholds (45 s, 90 s, 45 min, 90 min, 22 h,
+36 h, 26 d, 46 d, 320 d, 548 d) and half-unit rounding edges, duration
+rounding under every max_units, hand-written and mutated parse_duration
+strings, and day, month and year boundaries for human_date and date_range.
+Timestamps are sent as int, float, ISO 8601 string and datetime. Each input
+goes to both implementations; results, or exception types and messages, must
+match. Mismatches are shrunk to a small repro before printing. Runs offline
+with no dependencies beyond the standard library.
+
+Implementations are importable module names or paths to a .py file. The
+oracle defaults to whenwords.py itself (bypassing any compiled accelerator)
+and the candidate to whatever `import whenwords` returns.
+
+Usage:
+    python benchmarks/fuzz_differential.py [--count N] [--seed S] [--functions F ...]
+        [--candidate MODULE_OR_PATH] [--oracle MODULE_OR_PATH] [--max-failures N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import random
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import ModuleType
+
+from common import whenwords
+
+DAY = 86400
+# Spelled out here rather than read from whenwords, so a candidate that
+# changes its tables is still tested against the documented boundaries
+TIMEAGO_THRESHOLDS = (
+    45, 90, 45 * 60, 90 * 60, 22 * 3600, 36 * 3600, 26 * DAY, 46 * DAY, 320 * DAY, 548 * DAY,
+)
+ROUNDING_UNITS = (60, 3600, DAY, 30 * DAY, 365 * DAY)
+DURATION_UNITS = (365 * DAY, 30 * DAY, DAY, 3600, 60, 1)
+UNIT_SPELLINGS = (
+    ('w', 'wk', 'wks', 'week', 'weeks', 'W', 'Weeks'),
+    ('d', 'day', 'days', 'D', 'DAYS'),
+    ('h', 'hr', 'hrs', 'hour', 'hours', 'H', 'Hours'),
+    ('m', 'min', 'mins', 'minute', 'minutes', 'M', 'MIN'),
+    ('s', 'sec', 'secs', 'second', 'seconds', 'S', 'Secs'),
+)
+SEPARATORS = ('', ' ', ' ', ', ', ' and ', '  ', ',', '\t')
+MUTATION_CHARS = ' -.,:;+0123456789hmsdwayen١'
+TIMESTAMP_KINDS = ('int', 'int', 'int', 'int', 'float', 'iso', 'iso_offset', 'datetime')
+NEW_YEARS = tuple(int(datetime(year, 1, 1, tzinfo=timezone.utc).timestamp()) for year in range(1900, 2200))
+
+# A generated case: the fields the shrinker edits, and how to turn them into call arguments
+Fields = list
+MakeArgs = Callable[[ModuleType, Fields], tuple]
+
+
+def load_implementation(spec: str) -> ModuleType:
+    """Imports a module by name, or loads a .py file under a private name."""
+    path = Path(spec)
+    if path.suffix != '.py':
+        return importlib.import_module(spec)
+    module_spec = importlib.util.spec_from_file_location(f'fuzz_{path.stem}', path)
+    module = importlib.util.module_from_spec(module_spec)
+    sys.modules[module_spec.name] = module  # dataclasses looks the module up
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def describe(module: ModuleType) -> str:
+    compiled = ' (compiled)' if getattr(module, 'COMPILED', False) else ''
+    return f'{module.__file__}{compiled}'
+
+
+# Timestamps
+
+
+def as_timestamp(ts: int, kind: str, fraction: float) -> object:
+    """ts in one of the accepted input types."""
+    if kind == 'float':
+        return ts + fraction
+    if kind == 'datetime':
+        return datetime.fromtimestamp(ts, timezone.utc)
+    if kind == 'iso':
+        return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    if kind == 'iso_offset':
+        # The same instant written in +05:30 local time
+        local = datetime.fromtimestamp(ts, timezone(timedelta(hours=5, minutes=30)))
+        return local.isoformat()
+    return ts
+
+
+def random_instant(rng: random.Random) -> int:
+    """Somewhere in 1900-2200, biased to midnights and new years."""
+    start = rng.choice(NEW_YEARS)
+    roll = rng.random()
+    if roll < 0.3:
+        return start + rng.randrange(-3, 3) * DAY + rng.choice((0, 1, -1, DAY - 1, DAY // 2))
+    if roll < 0.6:
+        return start + rng.randrange(366) * DAY + rng.choice((0, 1, -1, DAY - 1))
+    return start + rng.randrange(366 * DAY)
+
+
+def near(rng: random.Random, edge: int) -> int:
+    return edge + rng.choice((-2, -1, -1, 0, 0, 1, 1, 2))
+
+
+def timestamp_field(rng: random.Random) -> tuple[str, float]:
+    return rng.choice(TIMESTAMP_KINDS), rng.choice((0.0, 0.25, 0.5, 0.999, rng.random()))
+
+
+# Generators: fields for one case
+
+
+def gen_timeago(rng: random.Random) -> Fields:
+    roll = rng.random()
+    if roll < 0.4:
+        diff = near(rng, rng.choice(TIMEAGO_THRESHOLDS))
+    elif roll < 0.75:
+        unit = rng.choice(ROUNDING_UNITS)
+        diff = near(rng, rng.randrange(0, 120) * unit + unit // 2)
+    elif roll < 0.95:
+        diff = rng.randrange(0, 200 * 365 * DAY)
+    else:
+        diff = rng.randrange(0, 2 ** 40)
+    diff *= rng.choice((1, -1))
+    kind, fraction = timestamp_field(rng)
+    reference = random_instant(rng)
+    # Keep string and datetime inputs inside datetime's year range
+    if kind not in ('int', 'float') and not -2208988800 <= reference - diff <= 253402300799:
+        kind = 'int'
+    return [reference, diff, kind, fraction]
+
+
+def args_timeago(module: ModuleType, fields: Fields) -> tuple:
+    reference, diff, kind, fraction = fields
+    return as_timestamp(reference - diff, kind, fraction), reference
+
+
+def gen_duration(rng: random.Random) -> Fields:
+    seconds = sum(rng.choice((0, 0, 1, 2, rng.randrange(60))) * unit for unit in DURATION_UNITS)
+    if rng.random() < 0.7:
+        seconds += near(rng, rng.choice(DURATION_UNITS[:-1]) // 2)
+    if rng.random() < 0.02:
+        seconds = -seconds - 1
+    max_units = rng.choice((1, 1, 2, 2, 2, 3, 4, 6, 7, 0, -1, -2, None))
+    fraction = rng.choice((0.0, 0.0, 0.0, 0.5, 0.999, rng.random()))
+    return [max(seconds, -10), rng.random() < 0.5, max_units, fraction]
+
+
+def args_duration(module: ModuleType, fields: Fields) -> tuple:
+    seconds, compact, max_units, fraction = fields
+    value = seconds + fraction if fraction else seconds
+    if max_units is None and not compact:
+        return (value,)
+    if max_units is None:
+        return value, module.DurationOptions(compact=compact)
+    return value, module.DurationOptions(compact=compact, max_units=max_units)
+
+
+def random_number(rng: random.Random) -> str:
+    roll = rng.random()
+    if roll < 0.6:
+        return str(rng.choice((0, 1, 2, 5, 10, 30, 45, 59, 60, 90, rng.randrange(1000))))
+    if roll < 0.85:
+        return f'{rng.randrange(100)}.{rng.randrange(1000):0{rng.randrange(1, 4)}d}'
+    return rng.choice(('007', '1.', '.5', '0.0', '99999999999999999999', '1.5.5', '2,5'))
+
+
+def gen_parse_duration(rng: random.Random) -> Fields:
+    roll = rng.random()
+    if roll < 0.15:
+        parts = [str(rng.randrange(0, 200))] + [f'{rng.randrange(0, 100):0{rng.randrange(1, 3)}d}'
+                                                for _ in range(rng.choice((1, 2, 2, 3)))]
+        text = ':'.join(parts)
+    else:
+        units = rng.sample(range(len(UNIT_SPELLINGS)), rng.randrange(1, 4))
+        if rng.random() < 0.1:
+            units.append(rng.choice(units))  # a repeated unit
+        if rng.random() < 0.5:
+            units.sort()
+        text = ''
+        for index, unit in enumerate(units):
+            if index:
+                text += rng.choice(SEPARATORS)
+            text += random_number(rng) + rng.choice(('', '', ' ')) + rng.choice(UNIT_SPELLINGS[unit])
+    if rng.random() < 0.25:
+        text = mutate(rng, text)
+    if rng.random() < 0.05:
+        text = rng.choice((' ', '\n')) + text + rng.choice(('', ' '))
+    return [text]
+
+
+def mutate(rng: random.Random, text: str) -> str:
+    position = rng.randrange(len(text) + 1)
+    roll = rng.random()
+    if roll < 0.4:
+        return text[:position] + rng.choice(MUTATION_CHARS) + text[position:]
+    if roll < 0.7 and text:
+        return text[:position] + text[position + 1:]
+    if roll < 0.85:
+        return '-' + text
+    return rng.choice(('', ' ', 'soon', '1', 'h', text + text))
+
+
+def args_parse_duration(module: ModuleType, fields: Fields) -> tuple:
+    return (fields[0],)
+
+
+def gen_human_date(rng: random.Random) -> Fields:
+    reference = random_instant(rng)
+    roll = rng.random()
+    if roll < 0.6:
+        # Around a nearby midnight: the day-number comparisons
+        midnight = reference - reference % DAY + rng.randrange(-9, 9) * DAY
+        timestamp = midnight + rng.choice((0, -1, 1, DAY - 1, DAY // 2))
+    elif roll < 0.8:
+        timestamp = reference + rng.randrange(-400, 400) * DAY + rng.randrange(DAY)
+    else:
+        timestamp = random_instant(rng)
+    kind, fraction = timestamp_field(rng)
+    return [timestamp, reference, kind, fraction]
+
+
+def args_human_date(module: ModuleType, fields: Fields) -> tuple:
+    timestamp, reference, kind, fraction = fields
+    return as_timestamp(timestamp, kind, fraction), reference
+
+
+def gen_date_range(rng: random.Random) -> Fields:
+    start = random_instant(rng)
+    roll = rng.random()
+    if roll < 0.5:
+        end = start - start % DAY + rng.randrange(0, 70) * DAY + rng.choice((0, -1, 1, DAY - 1))
+    elif roll < 0.8:
+        end = start + rng.randrange(0, 800 * DAY)
+    else:
+        end = random_instant(rng)
+    kind, fraction = timestamp_field(rng)
+    if rng.random() < 0.2:
+        start, end = end, start
+    return [start, end, kind, fraction]
+
+
+def args_date_range(module: ModuleType, fields: Fields) -> tuple:
+    start, end, kind, fraction = fields
+    return as_timestamp(start, kind, fraction), as_timestamp(end, kind, fraction)
+
+
+GENERATORS: dict[str, tuple[Callable[[random.Random], Fields], MakeArgs]] = {
+    'timeago': (gen_timeago, args_timeago),
+    'duration': (gen_duration, args_duration),
+    'parse_duration': (gen_parse_duration, args_parse_duration),
+    'human_date': (gen_human_date, args_human_date),
+    'date_range': (gen_date_range, args_date_range),
+}
+
+
+# Comparison and shrinking
+
+
+def outcome(module: ModuleType, name: str, args: tuple) -> tuple:
+    try:
+        return 'ok', getattr(module, name)(*args)
+    except Exception as e:  # noqa: BLE001 - any difference in behavior is a finding
+        return 'raises', type(e).__name__, str(e)
+
+
+def mismatch(oracle: ModuleType, candidate: ModuleType, name: str, make_args: MakeArgs, fields: Fields) -> bool:
+    try:
+        oracle_args, candidate_args = make_args(oracle, fields), make_args(candidate, fields)
+    except (ValueError, OverflowError, OSError):
+        return False  # shrunk to something the generator cannot express
+    return outcome(oracle, name, oracle_args) != outcome(candidate, name, candidate_args)
+
+
+def simpler_values(value: object) -> list:
+    """Candidate replacements for one field, simplest first."""
+    if isinstance(value, bool):
+        return [False] if value else []
+    if isinstance(value, int):
+        digits = len(str(abs(value)))
+        rounded = [round(value, -k) for k in range(digits, 0, -1)]
+        return [0, *rounded, value // 2, value - (value > 0) + (value < 0)]
+    if isinstance(value, float):
+        return [0.0, 0.5] if value not in (0.0, 0.5) else ([0.0] if value else [])
+    if isinstance(value, str):
+        if value in TIMESTAMP_KINDS:
+            return ['int'] if value != 'int' else []
+        cuts = [value[:i] + value[i + 1:] for i in range(len(value))]
+        return [value.strip(), value.lower(), *cuts]
+    return [None] if value is not None else []
+
+
+def complexity(value: object) -> tuple:
+    if isinstance(value, bool) or value is None:
+        return (0, int(bool(value)))
+    if isinstance(value, int):
+        return (len(str(abs(value)).rstrip('0')), abs(value))
+    if isinstance(value, float):
+        return (value != 0.0, value)
+    if isinstance(value, str):
+        return (value not in ('int', ''), len(value), value)
+    return (1, 0)
+
+
+def shrink(fields: Fields, fails: Callable[[Fields], bool], budget: int = 5000) -> Fields:
+    """Greedily simplifies one field at a time while the mismatch persists."""
+    fields = list(fields)
+    improved = True
+    while improved and budget > 0:
+        improved = False
+        for index, value in enumerate(fields):
+            for replacement in simpler_values(value):
+                if budget <= 0:
+                    break
+                if type(replacement) is not type(value) or complexity(replacement) >= complexity(value):
+                    continue
+                budget -= 1
+                trial = fields[:index] + [replacement] + fields[index + 1:]
+                if fails(trial):
+                    fields = trial
+                    improved = True
+                    break
+    return fields
+
+
+def format_call(name: str, args: tuple) -> str:
+    rendered = ', '.join(
+        f'DurationOptions(compact={a.compact}, max_units={a.max_units})' if hasattr(a, 'max_units') else repr(a)
+        for a in args
+    )
+    return f'{name}({rendered})'
+
+
+def fuzz(
+    name: str, oracle: ModuleType, candidate: ModuleType, count: int, seed: int, max_failures: int,
+) -> tuple[int, float, list[str]]:
+    """Runs count cases; returns (mismatches, seconds, reports)."""
+    generate, make_args = GENERATORS[name]
+    rng = random.Random(f'{seed}:{name}')
+    oracle_func, candidate_func = getattr(oracle, name), getattr(candidate, name)
+    failures: list[Fields] = []
+    mismatches = 0
+
+    start = time.perf_counter()
+    for _ in range(count):
+        fields = generate(rng)
+        oracle_args, candidate_args = make_args(oracle, fields), make_args(candidate, fields)
+        try:
+            expected = 'ok', oracle_func(*oracle_args)
+        except Exception as e:  # noqa: BLE001
+            expected = 'raises', type(e).__name__, str(e)
+        try:
+            actual = 'ok', candidate_func(*candidate_args)
+        except Exception as e:  # noqa: BLE001
+            actual = 'raises', type(e).__name__, str(e)
+        if expected != actual:
+            mismatches += 1
+            if len(failures) < max_failures:
+                failures.append(fields)
+    elapsed = time.perf_counter() - start
+
+    reports = []
+    seen = set()
+    for fields in failures:
+        small = shrink(fields, lambda trial: mismatch(oracle, candidate, name, make_args, trial))
+        call = format_call(name, make_args(oracle, small))
+        if call in seen:
+            continue  # several random failures often shrink to the same repro
+        seen.add(call)
+        reports.append(
+            f'{call}\n'
+            f'    oracle:    {outcome(oracle, name, make_args(oracle, small))}\n'
+            f'    candidate: {outcome(candidate, name, make_args(candidate, small))}\n'
+            f'    original:  {format_call(name, make_args(oracle, fields))}'
+        )
+    return mismatches, elapsed, reports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=200_000, help='cases per function (default 200000)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--functions', nargs='+', choices=tuple(GENERATORS), default=tuple(GENERATORS))
+    parser.add_argument('--candidate', default='whenwords', help='module name or .py path (default: whenwords)')
+    parser.add_argument('--oracle', default=str(Path(whenwords.__file__).parent / 'whenwords.py'),
+                        help='module name or .py path (default: the pure-Python whenwords.py)')
+    parser.add_argument('--max-failures', type=int, default=5, help='repros to shrink and print per function')
+    args = parser.parse_args()
+
+    oracle, candidate = load_implementation(args.oracle), load_implementation(args.candidate)
+    print(f'oracle:    {describe(oracle)}')
+    print(f'candidate: {describe(candidate)}')
+    print(f'seed {args.seed}, {args.count:,} cases per function')
+
+    total_cases = total_mismatches = 0
+    total_time = 0.0
+    for name in args.functions:
+        mismatches, elapsed, reports = fuzz(name, oracle, candidate, args.count, args.seed, args.max_failures)
+        total_cases += args.count
+        total_mismatches += mismatches
+        total_time += elapsed
+        print(f'{name:15s} {args.count:>10,} inputs  {args.count / elapsed:>10,.0f} inputs/sec  '
+              f'{mismatches:>6,} mismatches')
+        for report in reports:
+            print(f'  MISMATCH {report}')
+    print(f'{"total":15s} {total_cases:>10,} inputs  {total_cases / total_time:>10,.0f} inputs/sec  '
+          f'{total_mismatches:>6,} mismatches')
+    return 1 if total_mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Builds the optional compiled accelerator: whenwords.py, unchanged, compiled by Cython.
+
+The extension is written beside whenwords.py as _whenwords_accel<EXT_SUFFIX>
+and picked up automatically by `import whenwords`. Annotation typing is off,
+so the compiled module keeps Python's integer and float semantics exactly.
+The build records a SHA-256 of the source it compiled; once whenwords.py is
+edited, import ignores the stale build (with a RuntimeWarning) until it is
+rebuilt. Needs Cython 3 and setuptools (`uv sync --group accel`) and a C
+compiler.
+
+Usage:
+    python build_accel.py            # build for the running interpreter
+    python build_accel.py --clean    # remove built accelerators
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import shutil
+import sys
+import sysconfig
+import tempfile
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+SOURCE = HERE / 'whenwords.py'
+TARGET = HERE / ('_whenwords_accel' + sysconfig.get_config_var('EXT_SUFFIX'))
+
+DIGEST_LINE = '_SOURCE_DIGEST = None\n'
+
+DIRECTIVES = {
+    'language_level': 3,
+    'annotation_typing': False,
+    'binding': True,
+}
+
+
+def build() -> Path:
+    from Cython.Build import cythonize
+    from setuptools import Distribution
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Compiled as the module `whenwords` so names, reprs and pickles match
+        source = Path(tmp) / 'whenwords.py'
+        text = SOURCE.read_text(encoding='utf-8')
+        if text.count(DIGEST_LINE) != 1:
+            raise RuntimeError(f'{SOURCE.name} must contain one {DIGEST_LINE.strip()!r} line')
+        digest = hashlib.sha256(SOURCE.read_bytes()).hexdigest()
+        source.write_text(text.replace(DIGEST_LINE, f'_SOURCE_DIGEST = {digest!r}\n'), encoding='utf-8')
+        extensions = cythonize([str(source)], compiler_directives=DIRECTIVES, quiet=True)
+        dist = Distribution({'ext_modules': extensions})
+        command = dist.get_command_obj('build_ext')
+        command.build_lib = str(Path(tmp) / 'lib')
+        command.build_temp = str(Path(tmp) / 'temp')
+        command.ensure_finalized()
+        command.run()
+        built, = Path(command.build_lib).glob('whenwords*')
+        shutil.copyfile(built, TARGET)
+    return TARGET
+
+
+def clean() -> list[Path]:
+    removed = sorted(HERE.glob('_whenwords_accel.*'))
+    for path in removed:
+        path.unlink()
+    return removed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clean', action='store_true', help='remove built accelerators and exit')
+    args = parser.parse_args()
+
+    if args.clean:
+        for path in clean():
+            print(f'removed {path.name}')
+        return 0
+    try:
+        target = build()
+    except ImportError as e:
+        print(f'build_accel: {e} (install the accel dependency group)', file=sys.stderr)
+        return 1
+    print(f'built {target.name}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
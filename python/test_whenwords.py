@@ -1,7 +1,48 @@
 """Tests for whenwords library."""
 
+import asyncio
+import io
+import json
+import os
+import pickle
+import random
+import subprocess
+import sys
+import threading
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
 import pytest
-from whenwords import timeago, duration, parse_duration, human_date, date_range, DurationOptions
+from whenwords import (
+    timeago, timeago_many, duration, duration_formatter, parse_duration, human_date, date_range, date_range_many,
+    DurationOptions,
+    DurationCache, Formatter, set_iso_cache, iso_cache_info, aformat,
+    parse_duration_many, parse_duration_lines, ParseFailure, timeago_into, duration_into, timeago_codes, human_date_codes,
+    timeago_with_expiry, TimeagoScheduler, register_locale, available_locales,
+)
+import whenwords
+
+REFERENCE = 1704067200
+
+# Signed offsets from REFERENCE straddling every timeago bucket and rounding edge
+TIMEAGO_OFFSETS = sorted({
+    sign * offset
+    for sign in (1, -1)
+    for base in (0, 45, 90, 1770, 2670, 2700, 5400, 77400, 79200, 129600, 2203200,
+                 2246400, 3974400, 27648000, 47347200, 31536000 * 99 + 15768000)
+    for offset in (base - 1, base, base + 1)
+})
+
+TESTS_YAML = Path(__file__).resolve().parent.parent / 'tests.yaml'
+
+
+def load_corpus(section):
+    """Loads the shared tests.yaml cases for one function (skips if PyYAML is missing)."""
+    yaml = pytest.importorskip('yaml')
+    with open(TESTS_YAML, encoding='utf-8') as f:
+        return yaml.safe_load(f)[section]
 
 
 class TestTimeago:
@@ -113,6 +154,187 @@ class TestTimeago:
     def test_future_in_1_year(self):
         assert timeago(1735689600, 1704067200) == 'in 1 year'
 
+    def test_45_minutes_ago_rounds_up_below_hour_bucket(self):
+        assert timeago(1704067200 - 2670, 1704067200) == '45 minutes ago'
+
+    def test_44_minutes_ago_just_below_half(self):
+        assert timeago(1704067200 - 2669, 1704067200) == '44 minutes ago'
+
+    def test_months_capped_at_10(self):
+        assert timeago(1704067200 - 319 * 86400, 1704067200) == '10 months ago'
+
+    def test_100_years_ago_last_table_entry(self):
+        assert timeago(1704067200 - 3169368000 + 1, 1704067200) == '100 years ago'
+
+    def test_101_years_ago_beyond_table(self):
+        assert timeago(1704067200 - 3169368000, 1704067200) == '101 years ago'
+
+    def test_future_beyond_table(self):
+        assert timeago(1704067200 + 200 * 31536000, 1704067200) == 'in 200 years'
+
+
+class TestTimeagoExpiry:
+    @pytest.mark.parametrize('offset', TIMEAGO_OFFSETS)
+    def test_label_holds_until_expiry(self, offset):
+        label, changes_at = timeago_with_expiry(REFERENCE, REFERENCE + offset)
+        assert label == timeago(REFERENCE, REFERENCE + offset)
+        assert changes_at > REFERENCE + offset
+        assert timeago(REFERENCE, changes_at - 1) == label
+        assert timeago(REFERENCE, changes_at) != label
+
+    @pytest.mark.parametrize('diff, expected', [
+        (0, ('just now', 45)),
+        (-44, ('just now', 45)),
+        (44, ('just now', 45)),
+        (45, ('1 minute ago', 90)),
+        (-45, ('in 1 minute', -44)),
+        (600, ('10 minutes ago', 630)),
+        (-600, ('in 10 minutes', -569)),
+        (31536000 * 200, ('200 years ago', 31536000 * 200 + 15768000)),
+        (-31536000 * 200, ('in 200 years', -31536000 * 200 + 15768001)),
+    ])
+    def test_change_points(self, diff, expected):
+        label, changes_at = timeago_with_expiry(REFERENCE, REFERENCE + diff)
+        assert (label, changes_at - REFERENCE) == expected
+
+
+class TestTimeagoScheduler:
+    def test_tick_returns_only_changed_labels(self):
+        scheduler = TimeagoScheduler(REFERENCE)
+        assert scheduler.add('a', REFERENCE - 30) == 'just now'
+        assert scheduler.add('b', REFERENCE - 3600) == '1 hour ago'
+        assert scheduler.add('c', REFERENCE + 600) == 'in 10 minutes'
+        assert scheduler.next_change == REFERENCE + 15
+
+        assert scheduler.tick(REFERENCE + 10) == []
+        assert scheduler.tick(REFERENCE + 15) == [('a', '1 minute ago')]
+        assert scheduler.tick(REFERENCE + 40) == [('c', 'in 9 minutes')]
+        assert scheduler.label('b') == '1 hour ago'
+        assert scheduler.reference == REFERENCE + 40
+
+    def test_matches_full_recompute(self):
+        timestamps = {i: REFERENCE + offset for i, offset in enumerate(TIMEAGO_OFFSETS)}
+        scheduler = TimeagoScheduler(REFERENCE)
+        for key, ts in timestamps.items():
+            scheduler.add(key, ts)
+        labels = {key: timeago(ts, REFERENCE) for key, ts in timestamps.items()}
+
+        for reference in [REFERENCE + step for step in (1, 45, 50, 3000, 100000, 200000, 50)]:
+            current = {key: timeago(ts, reference) for key, ts in timestamps.items()}
+            expected = {key: label for key, label in current.items() if labels[key] != label}
+            assert dict(scheduler.tick(reference)) == expected
+            assert {key: scheduler.label(key) for key in timestamps} == current
+            labels = current
+
+    def test_remove_and_replace(self):
+        scheduler = TimeagoScheduler(REFERENCE)
+        scheduler.add('a', REFERENCE - 30)
+        scheduler.add('b', REFERENCE - 30)
+        scheduler.remove('a')
+        scheduler.add('b', REFERENCE - 7200)
+        assert 'a' not in scheduler and len(scheduler) == 1
+        assert scheduler.tick(REFERENCE + 60) == []
+        with pytest.raises(KeyError):
+            scheduler.remove('a')
+
+        scheduler.remove('b')
+        assert scheduler.next_change is None
+
+
+class TestIsoTimestamps:
+    def test_strict_utc_form(self):
+        assert timeago('2024-01-01T00:00:00Z', 1704067200) == 'just now'
+        assert timeago('2023-12-31T23:58:30Z', 1704067200) == '2 minutes ago'
+
+    def test_offset_form(self):
+        assert timeago('2024-01-01T02:00:00+02:00', 1704067200) == 'just now'
+
+    def test_fractional_seconds(self):
+        assert timeago('2023-12-31T23:58:30.500Z', 1704067200) == '2 minutes ago'
+
+    def test_before_epoch(self):
+        assert human_date('1969-12-31T23:59:59Z', 0) == 'Yesterday'
+
+    def test_error_invalid_month_in_strict_layout(self):
+        with pytest.raises(ValueError):
+            timeago('2024-13-01T00:00:00Z', 1704067200)
+
+    def test_error_not_a_date(self):
+        with pytest.raises(ValueError):
+            timeago('yesterday-ish tz Z', 1704067200)
+
+    def test_cache_hits_and_disable(self):
+        set_iso_cache(16)
+        try:
+            for _ in range(3):
+                assert timeago('2023-12-31T23:00:00Z', 1704067200) == '1 hour ago'
+            with pytest.raises(ValueError):
+                timeago('2024-02-30T00:00:00Z', 1704067200)
+            info = iso_cache_info()
+            assert (info.hits, info.currsize) == (2, 1)
+        finally:
+            set_iso_cache(0)
+        assert iso_cache_info() is None
+
+    def test_cache_negative_size(self):
+        with pytest.raises(ValueError):
+            set_iso_cache(-1)
+
+
+class TestTimeagoMany:
+    def _expected(self, timestamps):
+        return [timeago(ts, REFERENCE) for ts in timestamps]
+
+    def test_list_matches_scalar(self):
+        timestamps = [REFERENCE + offset for offset in TIMEAGO_OFFSETS]
+        assert timeago_many(timestamps, REFERENCE) == self._expected(timestamps)
+
+    def test_array_matches_scalar(self):
+        timestamps = array('q', [REFERENCE + offset for offset in TIMEAGO_OFFSETS])
+        assert timeago_many(timestamps, REFERENCE) == self._expected(timestamps)
+
+    def test_mixed_input_types(self):
+        timestamps = [
+            1704067155,
+            1704061800.9,
+            '2023-12-31T00:00:00Z',
+            datetime(2024, 1, 1, 3, tzinfo=timezone.utc),
+        ]
+        assert timeago_many(timestamps, REFERENCE) == [
+            '1 minute ago', '2 hours ago', '1 day ago', 'in 3 hours',
+        ]
+
+    def test_matches_corpus(self):
+        cases = load_corpus('timeago')
+        by_reference = {}
+        for case in cases:
+            by_reference.setdefault(case['input']['reference'], []).append(case)
+        for reference, group in by_reference.items():
+            timestamps = [case['input']['timestamp'] for case in group]
+            assert timeago_many(timestamps, reference) == [case['output'] for case in group]
+
+    def test_empty(self):
+        assert timeago_many([], REFERENCE) == []
+
+    def test_numpy_int64_matches_scalar(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array([REFERENCE + offset for offset in TIMEAGO_OFFSETS], dtype=np.int64)
+        assert timeago_many(timestamps, REFERENCE) == self._expected(timestamps.tolist())
+
+    def test_numpy_float_truncates_like_scalar(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array([REFERENCE + offset + 0.9 for offset in TIMEAGO_OFFSETS])
+        assert timeago_many(timestamps, REFERENCE) == self._expected(timestamps.tolist())
+
+    def test_numpy_huge_diffs_fall_back_to_scalar(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array([2 ** 62, -(2 ** 62)], dtype=np.int64)
+        assert timeago_many(timestamps, REFERENCE) == self._expected(timestamps.tolist())
+
+    def test_invalid_timestamp_raises(self):
+        with pytest.raises(ValueError):
+            timeago_many([REFERENCE, 'not a date'], REFERENCE)
+
 
 class TestDuration:
     def test_zero_seconds(self):
@@ -194,6 +416,40 @@ class TestDuration:
         with pytest.raises(ValueError):
             duration(-100)
 
+    def test_exactly_half_dropped_rounds_down(self):
+        assert duration(5430) == '1 hour, 30 minutes'
+
+    def test_over_half_dropped_rounds_up(self):
+        assert duration(5431) == '1 hour, 31 minutes'
+
+    def test_rounding_uses_all_dropped_units(self):
+        assert duration(90061, DurationOptions(max_units=1)) == '1 day'
+        assert duration(129601, DurationOptions(max_units=1)) == '2 days'
+
+    def test_float_seconds_truncated(self):
+        assert duration(3661.9) == '1 hour, 1 minute'
+
+
+class TestDurationFormatter:
+    SECONDS = [0, 0.4, 0.5, 1, 1.5, 45, 59.9, 60, 90, 3599, 3600, 3661, 5400, 86399, 86400, 93661, 9000000, 123456789]
+    OPTIONS = [None, DurationOptions(compact=True), DurationOptions(max_units=1), DurationOptions(max_units=3),
+               DurationOptions(compact=True, max_units=7), DurationOptions(max_units=0), DurationOptions(max_units=-1)]
+
+    @pytest.mark.parametrize('options', OPTIONS)
+    def test_matches_duration(self, options):
+        format_duration = duration_formatter(options)
+        assert [format_duration(s) for s in self.SECONDS] == [duration(s, options) for s in self.SECONDS]
+
+    def test_cached_per_option_values(self):
+        assert duration_formatter(DurationOptions(compact=True)) is duration_formatter(DurationOptions(compact=True))
+        assert duration_formatter(DurationOptions(compact=True)) is not duration_formatter(DurationOptions())
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            duration_formatter()(-1)
+        with pytest.raises(ValueError):
+            duration_formatter(DurationOptions(), 'xx')
+
 
 class TestParseDuration:
     def test_compact_hours_minutes(self):
@@ -296,6 +552,243 @@ class TestParseDuration:
         with pytest.raises(ValueError):
             parse_duration('42')
 
+    def test_leading_decimal_point(self):
+        assert parse_duration('.5h') == 1800
+
+    def test_all_units_concatenated(self):
+        assert parse_duration('1w2d3h4m5s') == 788645
+
+    def test_error_repeated_unit(self):
+        with pytest.raises(ValueError):
+            parse_duration('1h 2h')
+
+    def test_error_repeated_unit_across_aliases(self):
+        with pytest.raises(ValueError):
+            parse_duration('1 hour 30 minutes 2 mins')
+
+    def test_error_trailing_number_without_unit(self):
+        with pytest.raises(ValueError):
+            parse_duration('1h30')
+
+    def test_error_malformed_decimal(self):
+        with pytest.raises(ValueError):
+            parse_duration('1.5.5h')
+
+    def test_error_negative_later_component(self):
+        with pytest.raises(ValueError):
+            parse_duration('5m -3s')
+
+
+class TestDurationCache:
+    def test_parse_duration_hits_after_first_call(self):
+        cache = DurationCache()
+        assert cache.parse_duration('1h30m') == 5400
+        assert cache.parse_duration('1h30m') == 5400
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_duration_keyed_on_option_values(self):
+        cache = DurationCache()
+        assert cache.duration(3661, DurationOptions(compact=True)) == '1h 1m'
+        assert cache.duration(3661, DurationOptions(compact=True)) == '1h 1m'
+        assert cache.duration(3661, DurationOptions(max_units=1)) == '1 hour'
+        assert cache.duration(3661) == '1 hour, 1 minute'
+        assert cache.duration(3661, DurationOptions()) == '1 hour, 1 minute'
+        info = cache.cache_info()
+        assert (info.hits, info.misses) == (2, 3)
+
+    def test_evicts_least_recently_used(self):
+        cache = DurationCache(maxsize=2)
+        cache.parse_duration('1h')
+        cache.parse_duration('2h')
+        cache.parse_duration('1h')
+        cache.parse_duration('3h')
+        assert cache.cache_info().evictions == 1
+        cache.parse_duration('1h')
+        assert cache.cache_info().hits == 2
+        cache.parse_duration('2h')
+        assert cache.cache_info().misses == 4
+
+    def test_errors_are_not_cached(self):
+        cache = DurationCache()
+        for _ in range(2):
+            with pytest.raises(ValueError):
+                cache.parse_duration('hello world')
+            with pytest.raises(ValueError):
+                cache.duration(-100)
+        info = cache.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (0, 4, 0)
+
+    def test_cache_clear_resets_entries_and_counters(self):
+        cache = DurationCache()
+        cache.parse_duration('5m')
+        cache.parse_duration('5m')
+        cache.cache_clear()
+        assert cache.cache_info() == type(cache.cache_info())(0, 0, 0, 1024, 0)
+
+    def test_invalid_maxsize(self):
+        with pytest.raises(ValueError):
+            DurationCache(maxsize=0)
+
+    def test_concurrent_use(self):
+        cache = DurationCache(maxsize=8)
+        inputs = [f'{n}m' for n in range(1, 17)]
+        errors = []
+
+        def worker():
+            for text in inputs * 50:
+                if cache.parse_duration(text) != parse_duration(text):
+                    errors.append(text)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        info = cache.cache_info()
+        assert not errors
+        assert info.hits + info.misses == 8 * 16 * 50
+        assert info.currsize == 8
+
+
+class TestParseDurationMany:
+    INPUTS = ['2h30m', '90 minutes', 'bogus', '1:30:00', '', '1h 1h', '45s'] * 20
+
+    def _expected(self):
+        expected = []
+        for text in self.INPUTS:
+            try:
+                expected.append(parse_duration(text))
+            except ValueError as e:
+                expected.append(ParseFailure(text, str(e)))
+        return expected
+
+    def test_in_process(self):
+        assert list(parse_duration_many(self.INPUTS, chunksize=4)) == self._expected()
+
+    def test_worker_processes_preserve_order(self):
+        assert list(parse_duration_many(iter(self.INPUTS), workers=2, chunksize=3)) == self._expected()
+
+    def test_failures_do_not_abort_batch(self):
+        results = list(parse_duration_many(['5m', 'nope', None, '1h']))
+        assert results[0] == 300 and results[3] == 3600
+        assert results[1] == ParseFailure('nope', 'Cannot parse duration: nope')
+        assert isinstance(results[2], ParseFailure) and results[2].input is None
+
+    def test_lazy(self):
+        def endless():
+            while True:
+                yield '1m'
+
+        results = parse_duration_many(endless(), chunksize=5)
+        assert [next(results) for _ in range(12)] == [60] * 12
+
+    def test_invalid_chunksize(self):
+        with pytest.raises(ValueError):
+            parse_duration_many(['1m'], chunksize=0)
+
+
+class TestParseDurationLines:
+    LINES = [
+        '2h30m', '90 minutes', 'bogus', '1:30:00', '', '  ', '1h 1h', '45s', '-5m', '1h -5m', '5',
+        '1H30M', ' \t2 days\t ', '1:30\r', '1.5.5h', '\x1c1h', '1h\x1f', '１h', '2 wks ñ', '.5h',
+    ]
+
+    def _expected(self, lines):
+        expected = []
+        for line_no, text in enumerate(lines, start=1):
+            text = text.removesuffix('\r')
+            try:
+                expected.append((line_no, parse_duration(text)))
+            except ValueError as e:
+                expected.append((line_no, ParseFailure(text, str(e))))
+        return expected
+
+    @pytest.mark.parametrize('wrap', [bytes, bytearray, memoryview, io.BytesIO])
+    def test_buffers(self, wrap):
+        data = '\n'.join(self.LINES).encode()
+        assert list(parse_duration_lines(wrap(data))) == self._expected(self.LINES)
+
+    def test_lines_span_block_boundaries(self, monkeypatch):
+        monkeypatch.setattr(whenwords, '_DURATION_LINES_BLOCK', 5)
+        data = '\n'.join(self.LINES).encode()
+        assert list(parse_duration_lines(data)) == self._expected(self.LINES)
+
+    def test_memory_mapped_path(self, tmp_path):
+        path = tmp_path / 'durations.txt'
+        path.write_bytes('\r\n'.join(self.LINES).encode() + b'\r\n')
+        expected = self._expected(self.LINES)
+        assert list(parse_duration_lines(path)) == expected
+        assert list(parse_duration_lines(str(path))) == expected
+        with open(path, 'rb') as f:
+            assert list(parse_duration_lines(f)) == expected
+
+    def test_file_object_outlives_caller_reference(self, tmp_path):
+        path, other = tmp_path / 'durations.txt', tmp_path / 'other.txt'
+        path.write_bytes(b'1h\n2m\n')
+        other.write_bytes(b'5s\n')
+        results = parse_duration_lines(open(path, 'rb'))
+        with open(other, 'rb'):  # would take over a descriptor freed too early
+            assert list(results) == [(1, 3600), (2, 120)]
+
+    @pytest.mark.parametrize('mode', ['rb', 'r'])
+    def test_pipe(self, mode):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'1h\nnope\rnot\n2m\r\n')
+        with os.fdopen(read_fd, mode) as reader:
+            # A lone '\r' does not end a line, even where universal newlines would
+            assert list(parse_duration_lines(reader)) == self._expected(['1h', 'nope\rnot', '2m\r'])
+
+    def test_partly_read_text_pipe_continues_as_text(self):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'header\n1h\nnope\rnot\n')
+        with os.fdopen(read_fd, 'r', newline='') as reader:
+            reader.readline()
+            assert list(parse_duration_lines(reader)) == self._expected(['1h', 'nope\rnot'])
+
+    def test_compressed_stream_is_not_mapped(self, tmp_path):
+        import gzip
+
+        path = tmp_path / 'durations.txt.gz'
+        with gzip.open(path, 'wb') as f:
+            f.write(b'1h\n2m\n')
+        with gzip.open(path, 'rb') as f:
+            assert list(parse_duration_lines(f)) == [(1, 3600), (2, 120)]
+
+    def test_partly_read_file_continues_from_position(self, tmp_path):
+        path = tmp_path / 'durations.txt'
+        path.write_bytes(b'header\n1h\n')
+        with open(path, 'rb') as f:
+            f.readline()
+            assert list(parse_duration_lines(f)) == [(1, 3600)]
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.txt'
+        path.write_bytes(b'')
+        assert list(parse_duration_lines(path)) == []
+
+    def test_text_stream(self):
+        assert list(parse_duration_lines(io.StringIO('1h\n\n2m'))) == self._expected(['1h', '', '2m'])
+        stream = io.StringIO('1h\rx\r\n2m\r', newline='')
+        assert list(parse_duration_lines(stream)) == self._expected(['1h\rx\r', '2m\r'])
+
+    def test_invalid_utf8(self):
+        (line_no, failure), = parse_duration_lines(b'\xff1h\n')
+        assert line_no == 1 and failure.input == b'\xff1h'
+        assert failure.message.startswith('Invalid UTF-8')
+
+    def test_lazy(self):
+        results = parse_duration_lines(b'1m\n' * 1000 + b'nope\n')
+        assert [next(results) for _ in range(3)] == [(1, 60), (2, 60), (3, 60)]
+
+    def test_matches_parse_duration_on_random_input(self):
+        rng = random.Random(7)
+        alphabet = '0123456789 .:-hmsdwkrinutecayHMS\t\r'
+        lines = [''.join(rng.choice(alphabet) for _ in range(rng.randrange(12))) for _ in range(3000)]
+        assert list(parse_duration_lines('\n'.join(lines).encode())) == self._expected(lines)
+
 
 class TestHumanDate:
     # Reference: 2024-01-15 00:00:00 UTC (Monday) = timestamp 1705276800
@@ -360,6 +853,109 @@ class TestHumanDate:
     def test_next_year(self):
         assert human_date(1736121600, 1705276800) == 'January 6, 2025'
 
+    def test_leap_day(self):
+        assert human_date(1709208000, 1705276800) == 'February 29'
+
+    def test_century_non_leap_year(self):
+        assert human_date(4107456000, 1705276800) == 'February 28, 2100'
+        assert human_date(4107542400, 1705276800) == 'March 1, 2100'
+
+    def test_before_epoch(self):
+        assert human_date(-1, 1705276800) == 'December 31, 1969'
+
+    def test_first_supported_day(self):
+        assert human_date(-62135596800, 1705276800) == 'January 1, 1'
+
+    def test_last_supported_day(self):
+        assert human_date(253402300799, 1705276800) == 'December 31, 9999'
+
+    def test_last_weekday_before_epoch(self):
+        assert human_date(-3 * 86400, 0) == 'Last Monday'
+
+    def test_error_out_of_range(self):
+        with pytest.raises(ValueError):
+            human_date(253402300800, 1705276800)
+
+    def test_matches_datetime_across_years(self):
+        for year in (1, 4, 100, 400, 1600, 1900, 1969, 1970, 2000, 2024, 2100, 9999):
+            for month, day in ((1, 1), (2, 28), (3, 1), (12, 31)):
+                dt = datetime(year, month, day, 12, tzinfo=timezone.utc)
+                expected = f'{dt:%B} {day}, {year}' if year != 2024 else f'{dt:%B} {day}'
+                assert human_date(dt, 1705276800) == expected
+
+
+def zone(key):
+    """ZoneInfo for key, skipping the test if the system has no tzdata for it."""
+    zoneinfo = pytest.importorskip('zoneinfo')
+    try:
+        return zoneinfo.ZoneInfo(key)
+    except zoneinfo.ZoneInfoNotFoundError:
+        pytest.skip(f'no tzdata for {key}')
+
+
+def local_seconds(ts, tz):
+    """Wall-clock seconds of ts in tz, computed through datetime."""
+    return ts + int(datetime.fromtimestamp(ts, tz).utcoffset().total_seconds())
+
+
+class TestTimeZones:
+    # 2024-01-15 03:00:00 UTC is still Sunday the 14th in New York
+    REF = 1705287600
+    TZ_KEYS = ['America/New_York', 'Europe/Paris', 'Australia/Lord_Howe', 'Asia/Kathmandu', 'Pacific/Apia']
+
+    def test_fixed_offset(self):
+        tz = timezone(timedelta(hours=-5))
+        assert human_date(self.REF, self.REF + 3600, tz=tz) == 'Today'
+        assert human_date(self.REF - 4 * 3600, self.REF, tz=tz) == 'Today'
+        assert human_date(self.REF - 4 * 3600, self.REF) == 'Yesterday'
+        assert human_date(self.REF, tz=timezone.utc) == 'Today'
+
+    def test_zone_key_and_tzinfo_agree(self):
+        new_york = zone('America/New_York')
+        assert human_date(self.REF + 86400, self.REF, tz=new_york) == 'Tomorrow'
+        assert human_date(self.REF - 4 * 3600, self.REF, tz='America/New_York') == 'Today'
+        assert date_range(self.REF, self.REF + 86400, tz=new_york) == 'January 14–15, 2024'
+        assert date_range(self.REF, self.REF + 86400) == 'January 15–16, 2024'
+
+    @pytest.mark.parametrize('key', TZ_KEYS)
+    def test_matches_datetime_conversion(self, key):
+        tz = zone(key)
+        # Hourly for two years, crossing every DST change in both directions
+        timestamps = range(self.REF - 365 * 86400, self.REF + 365 * 86400, 3600)
+        ref = local_seconds(self.REF, tz)
+        expected = [human_date(local_seconds(ts, tz), ref) for ts in timestamps]
+        assert [human_date(ts, self.REF, tz=tz) for ts in timestamps] == expected
+        formatter = Formatter(self.REF, tz=tz)
+        assert [formatter.human_date(ts) for ts in timestamps] == expected
+        categories, codes = human_date_codes(list(timestamps), self.REF, tz=tz)
+        assert [categories[c] for c in codes] == expected
+
+    def test_short_lived_offset(self):
+        # Freetown kept -0:40 for four days (1939-09-01 to 09-05) between spells of -1:00
+        tz = zone('Africa/Freetown')
+        timestamps = range(-957308400 - 3600, -956964000 + 3600, 600)
+        assert [human_date(ts, self.REF, tz=tz) for ts in timestamps] == \
+            [human_date(local_seconds(ts, tz), self.REF) for ts in timestamps]
+
+    def test_numpy_codes(self):
+        np = pytest.importorskip('numpy')
+        tz = zone('Europe/Paris')
+        timestamps = np.arange(self.REF - 400 * 86400, self.REF + 400 * 86400, 1800)
+        categories, codes = human_date_codes(timestamps, self.REF, tz=tz)
+        assert [categories[c] for c in codes.tolist()] == \
+            [human_date(ts, self.REF, tz=tz) for ts in timestamps.tolist()]
+
+    def test_outside_indexed_years(self):
+        tz = zone('Europe/Paris')
+        for ts in (-5364662400, 10413792000):  # 1800 and 2300
+            assert human_date(ts, self.REF, tz=tz) == human_date(local_seconds(ts, tz), self.REF)
+
+    def test_invalid_zone(self):
+        with pytest.raises(ValueError):
+            human_date(self.REF, tz='Not/AZone')
+        with pytest.raises(TypeError):
+            human_date(self.REF, tz=5)
+
 
 class TestDateRange:
     def test_same_day(self):
@@ -388,3 +984,811 @@ class TestDateRange:
 
     def test_multi_year_span(self):
         assert date_range(1672531200, 1735689600) == 'January 1, 2023 – January 1, 2025'
+
+
+class TestDateRangeMany:
+    # Same day, same month, same year, cross-year, swapped, and both sides of a New York DST change
+    STARTS = [1705276800, 1705276800, 1705276800, 1703721600, 1705881600, 1672531200, 1710054000, 1699164000]
+    ENDS = [1705320000, 1705881600, 1707955200, 1705276800, 1705276800, 1735689600, 1710140400, 1699250400]
+
+    @staticmethod
+    def _pairs(count):
+        rng = random.Random(5)
+        starts = [REFERENCE + rng.randrange(-800, 800) * 86400 + rng.randrange(86400) for _ in range(count)]
+        ends = [start + rng.choice((0, 3600, 86400 * rng.randrange(40), -86400 * rng.randrange(800))) for start in starts]
+        return starts, ends
+
+    def test_corpus(self):
+        cases = load_corpus('date_range')
+        starts = [case['input']['start'] for case in cases]
+        ends = [case['input']['end'] for case in cases]
+        assert date_range_many(starts, ends) == [case['output'] for case in cases]
+
+    @pytest.mark.parametrize('tz', [None, 'America/New_York', timezone(timedelta(hours=5, minutes=30))])
+    def test_matches_scalar(self, tz):
+        starts, ends = self._pairs(2000)
+        starts, ends = starts + self.STARTS, ends + self.ENDS
+        expected = [date_range(start, end, tz) for start, end in zip(starts, ends)]
+        assert date_range_many(starts, ends, tz) == expected
+        assert date_range_many(array('q', starts), array('q', ends), tz) == expected
+
+    @pytest.mark.parametrize('tz', [None, 'America/New_York'])
+    def test_numpy_matches_scalar(self, tz):
+        np = pytest.importorskip('numpy')
+        starts, ends = self._pairs(2000)
+        starts, ends = starts + self.STARTS, ends + self.ENDS
+        expected = [date_range(start, end, tz) for start, end in zip(starts, ends)]
+        assert date_range_many(np.array(starts), np.array(ends), tz) == expected
+        floats = np.array(starts, dtype=np.float64) + 0.75
+        assert date_range_many(floats, np.array(ends), tz) == [date_range(s, e, tz) for s, e in zip(floats.tolist(), ends)]
+        ms = np.array(starts) * 1000 + 999
+        assert date_range_many(ms, np.array(ends) * 1000, tz, unit='ms') == expected
+
+    def test_mixed_inputs(self):
+        starts = ['2024-01-15T10:00:00Z', datetime(2024, 3, 1, tzinfo=timezone.utc), 1705276800.5]
+        ends = [1705276800, '2024-02-29T23:00:00Z', 1705881600]
+        assert date_range_many(starts, ends) == [date_range(s, e) for s, e in zip(starts, ends)]
+
+    def test_numpy_falls_back_for_scalar_only_inputs(self):
+        np = pytest.importorskip('numpy')
+        starts = np.array(['2024-01-15T10:00:00Z', '2024-03-01T00:00:00Z'])
+        assert date_range_many(starts, [1705276800, 1709856000]) == ['January 15, 2024', 'March 1–8, 2024']
+        with pytest.raises(ValueError):
+            date_range_many(np.array([10 ** 15]), np.array([0]))
+
+    def test_errors(self):
+        with pytest.raises(ValueError):
+            date_range_many([1705276800, 1705276800], [1705276800])
+        with pytest.raises(ValueError):
+            date_range_many([1705276800], [1705276800], unit='h')
+        assert date_range_many([], []) == []
+
+
+class TestFormatter:
+    # Reference: 2024-01-15 00:00:00 UTC (Monday) = timestamp 1705276800
+
+    def test_matches_human_date_for_surrounding_weeks(self):
+        fmt = Formatter(1705276800)
+        for offset in range(-400, 400):
+            ts = 1705276800 + offset * 86400 + 43200
+            assert fmt.human_date(ts) == human_date(ts, 1705276800)
+
+    def test_near_labels(self):
+        fmt = Formatter('2024-01-15T18:00:00Z')
+        assert fmt.human_date(1705190400) == 'Yesterday'
+        assert fmt.human_date(1705104000) == 'Last Saturday'
+        assert fmt.human_date(1705795200) == 'This Sunday'
+        assert fmt.human_date(1705881600) == 'January 22'
+
+    def test_timeago_matches_module_function(self):
+        fmt = Formatter(REFERENCE)
+        for offset in TIMEAGO_OFFSETS:
+            assert fmt.timeago(REFERENCE + offset) == timeago(REFERENCE + offset, REFERENCE)
+
+    def test_date_range(self):
+        assert Formatter(0).date_range(1705881600, 1705276800) == 'January 15–22, 2024'
+
+    def test_reference_is_normalized(self):
+        assert Formatter(datetime(2024, 1, 1, tzinfo=timezone.utc)).reference == 1704067200
+
+    def test_has_no_instance_dict(self):
+        fmt = Formatter(REFERENCE)
+        with pytest.raises(AttributeError):
+            fmt.extra = 1
+
+    def test_error_past_last_supported_day(self):
+        fmt = Formatter(253402300799)
+        assert fmt.human_date(253402300799) == 'Today'
+        with pytest.raises(ValueError):
+            fmt.human_date(253402300800)
+
+
+def decode_rows(data, offsets, count):
+    return [bytes(data[offsets[i]:offsets[i + 1]]).decode() for i in range(count)]
+
+
+class TestColumnarOutput:
+    def test_timeago_into_matches_scalar(self):
+        timestamps = [REFERENCE + offset for offset in TIMEAGO_OFFSETS] + [REFERENCE - 10 ** 12]
+        data = bytearray(32 * len(timestamps))
+        offsets = array('i', [0] * (len(timestamps) + 1))
+        written = timeago_into(timestamps, REFERENCE, data, offsets)
+        assert written == offsets[-1]
+        assert decode_rows(data, offsets, len(timestamps)) == [timeago(ts, REFERENCE) for ts in timestamps]
+
+    def test_timeago_into_int_array(self):
+        timestamps = array('q', [1704067110, 1704070200])
+        data, offsets = bytearray(64), array('i', [0, 0, 0])
+        assert timeago_into(timestamps, REFERENCE, data, offsets) == 22
+        assert bytes(data[:22]) == b'2 minutes agoin 1 hour'
+        assert list(offsets) == [0, 13, 22]
+
+    def test_duration_into_matches_scalar(self):
+        values = [0, 1, 45, 3661, 5430, 5431, 93600, 36720000, 10 ** 11, 3661.9]
+        for options in (None, DurationOptions(compact=True), DurationOptions(max_units=3)):
+            data = bytearray(64 * len(values))
+            offsets = array('i', [0] * (len(values) + 1))
+            duration_into(values, data, offsets, options)
+            assert decode_rows(data, offsets, len(values)) == [duration(v, options) for v in values]
+
+    def test_numpy_buffers(self):
+        np = pytest.importorskip('numpy')
+        values = np.array([90, 3600, 0])
+        data = np.zeros(64, dtype=np.uint8)
+        offsets = np.zeros(4, dtype=np.int32)
+        duration_into(values, data, offsets, DurationOptions(compact=True))
+        assert data[:offsets[-1]].tobytes() == b'1m 30s1h0s'
+        assert offsets.tolist() == [0, 6, 8, 10]
+
+    def test_error_data_too_small(self):
+        with pytest.raises(ValueError):
+            timeago_into([1704067110, 1704070200], REFERENCE, bytearray(20), array('i', [0, 0, 0]))
+
+    def test_error_offsets_too_small(self):
+        with pytest.raises(ValueError):
+            duration_into([1, 2], bytearray(64), array('i', [0, 0]))
+
+    def test_error_offsets_wrong_type(self):
+        with pytest.raises(TypeError):
+            duration_into([1], bytearray(64), array('q', [0, 0]))
+
+    def test_error_read_only_data(self):
+        with pytest.raises(TypeError):
+            duration_into([1], bytes(64), array('i', [0, 0]))
+
+    def test_error_negative_duration(self):
+        with pytest.raises(ValueError):
+            duration_into([5, -1], bytearray(64), array('i', [0, 0, 0]))
+
+
+class TestDictionaryEncoded:
+    TIMESTAMPS = [REFERENCE + offset for offset in TIMEAGO_OFFSETS] * 3
+
+    def test_timeago_codes(self):
+        categories, codes = timeago_codes(self.TIMESTAMPS, REFERENCE)
+        assert codes.typecode == 'H'
+        assert len(categories) == len(set(categories)) < len(self.TIMESTAMPS)
+        assert [categories[c] for c in codes] == [timeago(ts, REFERENCE) for ts in self.TIMESTAMPS]
+
+    def test_timeago_codes_first_seen_order(self):
+        categories, codes = timeago_codes([1704067110, 1704070200, 1704067100], REFERENCE)
+        assert categories == ['2 minutes ago', 'in 1 hour']
+        assert list(codes) == [0, 1, 0]
+
+    def test_timeago_codes_numpy(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array(self.TIMESTAMPS + [REFERENCE - 10 ** 12, REFERENCE + 10 ** 12])
+        categories, codes = timeago_codes(timestamps, REFERENCE)
+        assert codes.dtype == np.uint16
+        assert len(categories) == len(set(categories))
+        assert [categories[c] for c in codes.tolist()] == [timeago(ts, REFERENCE) for ts in timestamps.tolist()]
+
+    def test_human_date_codes(self):
+        # Reference: 2024-01-15 00:00:00 UTC (Monday)
+        timestamps = [1705276800 + hours * 3600 for hours in range(-24 * 30, 24 * 30, 5)]
+        categories, codes = human_date_codes(timestamps, 1705276800)
+        assert len(categories) == 60
+        assert [categories[c] for c in codes] == [human_date(ts, 1705276800) for ts in timestamps]
+
+    def test_human_date_codes_numpy(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array([1705190400, 1709251200, 1705190401, -1])
+        categories, codes = human_date_codes(timestamps, 1705276800)
+        assert [categories[c] for c in codes.tolist()] == \
+            ['Yesterday', 'March 1', 'Yesterday', 'December 31, 1969']
+
+    def test_empty(self):
+        categories, codes = human_date_codes([], REFERENCE)
+        assert categories == [] and len(codes) == 0
+
+
+class TestUnits:
+    UNITS = [('s', 1), ('ms', 10 ** 3), ('us', 10 ** 6), ('ns', 10 ** 9)]
+    # One nanosecond before REFERENCE (2024-01-01 00:00:00 UTC); a float
+    # division would round it up to midnight
+    LAST_NS_OF_2023 = REFERENCE * 10 ** 9 - 1
+
+    @pytest.mark.parametrize('unit, ticks', UNITS)
+    def test_scalar_functions(self, unit, ticks):
+        for offset in TIMEAGO_OFFSETS:
+            ts = REFERENCE + offset
+            assert timeago(ts * ticks, REFERENCE * ticks, unit=unit) == timeago(ts, REFERENCE)
+            assert human_date(ts * ticks, REFERENCE * ticks, unit=unit) == human_date(ts, REFERENCE)
+            assert date_range(REFERENCE * ticks, ts * ticks, unit=unit) == date_range(REFERENCE, ts)
+
+    def test_nanoseconds_are_floored_exactly(self):
+        assert human_date(self.LAST_NS_OF_2023, REFERENCE * 10 ** 9, unit='ns') == 'Yesterday'
+        assert date_range(self.LAST_NS_OF_2023, REFERENCE * 10 ** 9, unit='ns') == 'December 31, 2023 – January 1, 2024'
+        assert timeago(self.LAST_NS_OF_2023 - 44 * 10 ** 9, REFERENCE * 10 ** 9, unit='ns') == '1 minute ago'
+
+    def test_negative_values_floor(self):
+        assert human_date(-1, 0, unit='ms') == 'Yesterday'
+        assert human_date(-1.5, 0, unit='ms') == 'Yesterday'
+        assert human_date(0.5, 0, unit='ms') == 'Today'
+
+    def test_strings_and_datetimes_are_absolute(self):
+        ref_ms = REFERENCE * 1000
+        assert timeago('2023-12-31T22:00:00Z', ref_ms, unit='ms') == '2 hours ago'
+        assert human_date(datetime(2023, 12, 31, tzinfo=timezone.utc), ref_ms, unit='ms') == 'Yesterday'
+
+    def test_float_milliseconds(self):
+        assert timeago(1704067110999.9, 1704067200000.0, unit='ms') == '2 minutes ago'
+
+    def test_invalid_unit(self):
+        for bad in ('m', 'sec', 'MS', None):
+            with pytest.raises(ValueError, match='Invalid unit'):
+                timeago(0, 0, unit=bad)
+        with pytest.raises(ValueError):
+            timeago_many([0], 0, unit='h')
+
+    def test_batch_functions(self):
+        timestamps_ms = [(REFERENCE + offset) * 1000 + 999 for offset in TIMEAGO_OFFSETS]
+        expected = [timeago(ts // 1000, REFERENCE) for ts in timestamps_ms]
+        assert timeago_many(timestamps_ms, REFERENCE * 1000, unit='ms') == expected
+        assert timeago_many(array('q', timestamps_ms), REFERENCE * 1000, unit='ms') == expected
+
+        categories, codes = timeago_codes(timestamps_ms, REFERENCE * 1000, unit='ms')
+        assert [categories[c] for c in codes] == expected
+
+        data = bytearray(32 * len(timestamps_ms))
+        offsets = array('i', [0] * (len(timestamps_ms) + 1))
+        timeago_into(array('q', timestamps_ms), REFERENCE * 1000, data, offsets, unit='ms')
+        assert decode_rows(data, offsets, len(timestamps_ms)) == expected
+
+        categories, codes = human_date_codes(timestamps_ms, REFERENCE * 1000, unit='ms')
+        assert [categories[c] for c in codes] == [human_date(ts // 1000, REFERENCE) for ts in timestamps_ms]
+
+    def test_numpy_nanoseconds(self):
+        np = pytest.importorskip('numpy')
+        timestamps = np.array([self.LAST_NS_OF_2023, REFERENCE * 10 ** 9, (REFERENCE - 5400) * 10 ** 9],
+                              dtype=np.int64)
+        assert timeago_many(timestamps, REFERENCE * 10 ** 9, unit='ns') == ['just now', 'just now', '2 hours ago']
+        categories, codes = human_date_codes(timestamps, REFERENCE * 10 ** 9, unit='ns')
+        assert [categories[c] for c in codes.tolist()] == ['Yesterday', 'Today', 'Yesterday']
+        categories, codes = timeago_codes(timestamps.astype(np.float64), REFERENCE * 10 ** 9, unit='ns')
+        assert [categories[c] for c in codes.tolist()] == ['just now', 'just now', '2 hours ago']
+
+    def test_formatter(self):
+        formatter = Formatter(REFERENCE * 1000, unit='ms')
+        assert formatter.reference == REFERENCE
+        assert repr(formatter) == f"Formatter(reference={REFERENCE}, unit='ms')"
+        assert formatter.timeago((REFERENCE - 5400) * 1000) == '2 hours ago'
+        assert formatter.human_date(REFERENCE * 1000 - 1) == 'Yesterday'
+        assert formatter.date_range(REFERENCE * 1000 - 1, REFERENCE * 1000) == 'December 31, 2023 – January 1, 2024'
+
+
+class TestAformat:
+    TIMESTAMPS = [REFERENCE - offset for offset in range(0, 5000 * 37, 37)]
+
+    def _expected(self):
+        return [timeago(ts, REFERENCE) for ts in self.TIMESTAMPS]
+
+    def test_small_batch_inline(self):
+        assert asyncio.run(aformat(human_date, [1705190400, 1705104000], 1705276800)) == \
+            ['Yesterday', 'Last Saturday']
+
+    def test_chunked_batch_in_order(self):
+        assert asyncio.run(aformat(timeago, self.TIMESTAMPS, REFERENCE, chunk_size=64)) == self._expected()
+
+    def test_yields_between_chunks(self):
+        ticks = []
+
+        async def ticker():
+            while True:
+                ticks.append(1)
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            result = await aformat(timeago, self.TIMESTAMPS, REFERENCE, chunk_size=500)
+            task.cancel()
+            return result
+
+        assert asyncio.run(main()) == self._expected()
+        assert len(ticks) >= 10
+
+    def test_executor_offload(self):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            result = asyncio.run(aformat(
+                timeago, self.TIMESTAMPS, REFERENCE, chunk_size=256, executor=executor, offload_threshold=1000,
+            ))
+        assert result == self._expected()
+
+    def test_cancellation_mid_batch(self):
+        calls = []
+
+        def counting_timeago(ts, reference):
+            calls.append(ts)
+            return timeago(ts, reference)
+
+        async def main():
+            task = asyncio.create_task(aformat(counting_timeago, self.TIMESTAMPS, REFERENCE, chunk_size=10))
+            for _ in range(5):
+                await asyncio.sleep(0)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(main())
+        assert 0 < len(calls) < len(self.TIMESTAMPS)
+
+    def test_errors_propagate(self):
+        with pytest.raises(ValueError):
+            asyncio.run(aformat(parse_duration, ['5m'] * 10 + ['bogus'], chunk_size=3))
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            asyncio.run(aformat(timeago, [REFERENCE], REFERENCE, chunk_size=0))
+
+
+class TestStats:
+    @pytest.fixture(autouse=True)
+    def _stats(self):
+        whenwords.enable_stats()
+        whenwords.reset_stats()
+        yield
+        whenwords.disable_stats()
+        whenwords.reset_stats()
+
+    def test_counts_calls_errors_and_latency(self):
+        whenwords.timeago(REFERENCE - 30, REFERENCE)
+        whenwords.timeago(REFERENCE - 3600, REFERENCE)
+        with pytest.raises(ValueError):
+            whenwords.parse_duration('soon')
+        functions = whenwords.stats().functions
+        assert (functions['timeago'].calls, functions['timeago'].errors) == (2, 0)
+        assert (functions['parse_duration'].calls, functions['parse_duration'].errors) == (1, 1)
+        assert sum(functions['timeago'].latency_ns.values()) == 2
+        assert functions['timeago'].total_ns > 0
+        assert functions['duration'].calls == 0
+
+    def test_latency_buckets_are_powers_of_two(self):
+        for _ in range(10):
+            whenwords.duration(3661)
+        latency = whenwords.stats().functions['duration'].latency_ns
+        assert sum(latency.values()) == 10
+        assert all(bound & (bound - 1) == 0 for bound in latency)
+
+    def test_input_types(self):
+        whenwords.timeago(1704067110, REFERENCE)
+        whenwords.timeago(1704067110.5, '2024-01-01T00:00:00Z')
+        whenwords.human_date(datetime(2024, 1, 1, tzinfo=timezone.utc), REFERENCE)
+        whenwords.timeago(True, None)
+        assert whenwords.stats().input_types == {'int': 4, 'float': 1, 'str': 1, 'datetime': 1}
+
+    def test_reset_and_disable(self):
+        whenwords.human_date(REFERENCE, REFERENCE)
+        whenwords.reset_stats()
+        assert whenwords.stats().functions['human_date'].calls == 0
+        assert whenwords.stats().input_types == {}
+
+        whenwords.disable_stats()
+        whenwords.human_date(REFERENCE, REFERENCE)
+        snapshot = whenwords.stats()
+        assert not snapshot.enabled
+        assert snapshot.functions['human_date'].calls == 0
+        assert whenwords.human_date is human_date
+
+    def test_threads_are_summed(self):
+        def work():
+            for _ in range(100):
+                whenwords.timeago(1704067110, REFERENCE)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = whenwords.stats()
+        assert snapshot.functions['timeago'].calls == 400
+        assert snapshot.input_types == {'int': 800}
+
+        whenwords.reset_stats()
+        assert whenwords.stats().functions['timeago'].calls == 0
+
+    def test_internal_callers_are_counted(self):
+        list(whenwords.parse_duration_many(['1h', '2m']))
+        assert whenwords.stats().functions['parse_duration'].calls == 2
+
+    def test_public_delegation_is_counted_once(self):
+        whenwords.timeago_codes([1, 2, 3], 100)
+        whenwords.Formatter(REFERENCE).date_range(REFERENCE, REFERENCE + 86400)
+        snapshot = whenwords.stats()
+        assert snapshot.functions['timeago_codes'].calls == 1
+        assert snapshot.functions['timeago_many'].calls == 0
+        assert snapshot.functions['date_range'].calls == 0
+        # Three timestamps and one reference each for timeago_codes and the Formatter, two range ends
+        assert snapshot.input_types == {'int': 7}
+
+
+# German locale for the locale tests. Plurals are dative, which suits "vor"/"in"
+GERMAN = {
+    'units': {
+        'year': {'one': '{n} Jahr', 'other': '{n} Jahren'},
+        'month': {'one': '{n} Monat', 'other': '{n} Monaten'},
+        'day': {'one': '{n} Tag', 'other': '{n} Tagen'},
+        'hour': {'one': '{n} Stunde', 'other': '{n} Stunden'},
+        'minute': {'one': '{n} Minute', 'other': '{n} Minuten'},
+        'second': {'one': '{n} Sekunde', 'other': '{n} Sekunden'},
+    },
+    'compact_units': {
+        'year': '{n} J.', 'month': '{n} Mon.', 'day': '{n} T.', 'hour': '{n} Std.', 'minute': '{n} Min.', 'second': '{n} Sek.',
+    },
+    'just_now': 'gerade eben', 'past': 'vor {}', 'future': 'in {}',
+    'weekdays': ['Sonntag', 'Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag'],
+    'months': ['Januar', 'Februar', 'März', 'April', 'Mai', 'Juni', 'Juli', 'August', 'September', 'Oktober', 'November', 'Dezember'],
+    'today': 'Heute', 'yesterday': 'Gestern', 'tomorrow': 'Morgen',
+    'last_weekday': 'Letzten {weekday}', 'next_weekday': 'Diesen {weekday}',
+    'date': '{day}. {month}', 'date_year': '{day}. {month} {year}',
+    'range_same_day': '{day}. {month} {year}',
+    'range_same_month': '{start_day}.–{end_day}. {month} {year}',
+    'range_same_year': '{start_day}. {start_month} – {end_day}. {end_month} {year}',
+    'range': '{start_day}. {start_month} {start_year} – {end_day}. {end_month} {end_year}',
+}
+
+
+class TestLocales:
+    @pytest.fixture(autouse=True)
+    def _registry(self, monkeypatch):
+        monkeypatch.setattr(whenwords, '_locale_definitions', dict(whenwords._locale_definitions))
+        monkeypatch.setattr(whenwords, '_compiled_locales', {})
+        register_locale('de', GERMAN)
+
+    def test_german(self):
+        assert timeago(1704067110, REFERENCE, locale='de') == 'vor 2 Minuten'
+        assert timeago(1704070800, REFERENCE, locale='de') == 'in 1 Stunde'
+        assert timeago(REFERENCE, REFERENCE, locale='de') == 'gerade eben'
+        assert duration(3661, locale='de') == '1 Stunde, 1 Minute'
+        assert duration(3661, DurationOptions(compact=True), locale='de') == '1 Std. 1 Min.'
+        assert duration(0, locale='de') == '0 Sekunden'
+        # Reference: Monday Jan 15, 2024
+        assert human_date(1705190400, 1705276800, locale='de') == 'Gestern'
+        assert human_date(1705104000, 1705276800, locale='de') == 'Letzten Samstag'
+        assert human_date(1709251200, 1705276800, locale='de') == '1. März'
+        assert human_date(1672531200, 1705276800, locale='de') == '1. Januar 2023'
+        assert date_range(1705276800, 1705881600, locale='de') == '15.–22. Januar 2024'
+        assert date_range(1705276800, 1736899200, locale='de') == '15. Januar 2024 – 15. Januar 2025'
+
+    def test_english_locale_matches_default(self):
+        timestamps = [REFERENCE + offset for offset in TIMEAGO_OFFSETS]
+        assert [timeago(ts, REFERENCE, 'en') for ts in timestamps] == [timeago(ts, REFERENCE) for ts in timestamps]
+        assert [human_date(ts, REFERENCE, locale='en') for ts in timestamps] == \
+            [human_date(ts, REFERENCE) for ts in timestamps]
+        pairs = list(zip(timestamps, timestamps[::-1]))
+        assert [date_range(a, b, locale='en') for a, b in pairs] == [date_range(a, b) for a, b in pairs]
+        for options in (None, DurationOptions(compact=True), DurationOptions(max_units=4), DurationOptions(max_units=0)):
+            for seconds in (0, 0.5, 1, 45, 3600, 3661, 86399, 9000000, 123456789):
+                assert duration(seconds, options, 'en') == duration(seconds, options)
+
+    def test_duration_formatter(self):
+        for options in TestDurationFormatter.OPTIONS:
+            format_duration = duration_formatter(options, 'de')
+            assert [format_duration(s) for s in TestDurationFormatter.SECONDS] == \
+                [duration(s, options, 'de') for s in TestDurationFormatter.SECONDS]
+
+    def test_plural_rules(self):
+        register_locale('ru', dict(GERMAN, plural='east_slavic', units=dict(
+            GERMAN['units'], minute={'one': '{n} минуту', 'few': '{n} минуты', 'many': '{n} минут', 'other': '{n} минуты'},
+        )))
+        assert [duration(n * 60, locale='ru') for n in (1, 2, 5, 11, 21, 22, 25)] == [
+            '1 минуту', '2 минуты', '5 минут', '11 минут', '21 минуту', '22 минуты', '25 минут',
+        ]
+        register_locale('fn', dict(GERMAN, plural=lambda n: 'one' if n % 2 else 'other'))
+        assert duration(180, locale='fn') == '3 Minute'
+
+    def test_date_range_many(self):
+        starts = [1705276800, 1705276800, 1705276800, 1703721600]
+        ends = [1705276800, 1705881600, 1707955200, 1705276800]
+        expected = [date_range(s, e, locale='de') for s, e in zip(starts, ends)]
+        assert date_range_many(starts, ends, locale='de') == expected
+        np = pytest.importorskip('numpy')
+        assert date_range_many(np.array(starts), np.array(ends), locale='de') == expected
+
+    def test_formatter_and_codes(self):
+        formatter = Formatter(1705276800, locale='de')
+        assert formatter.timeago(1705276800 - 7200) == 'vor 2 Stunden'
+        assert formatter.human_date(1705190400) == 'Gestern'
+        assert formatter.date_range(1705276800, 1705276800) == '15. Januar 2024'
+        assert repr(formatter) == "Formatter(reference=1705276800, locale='de')"
+        categories, codes = human_date_codes([1705190400, 1709251200, 1705190400], 1705276800, locale='de')
+        assert [categories[c] for c in codes] == ['Gestern', '1. März', 'Gestern']
+
+    def test_lazy_loading(self):
+        calls = []
+
+        def load():
+            calls.append(1)
+            return GERMAN
+
+        register_locale('de-AT', load)
+        assert calls == [] and 'de-AT' in available_locales()
+        assert timeago(1704067110, REFERENCE, locale='de-AT') == 'vor 2 Minuten'
+        assert timeago(1704067110, REFERENCE, locale='de-AT') == 'vor 2 Minuten'
+        assert calls == [1]
+
+    def test_region_falls_back_to_language(self):
+        assert timeago(1704067110, REFERENCE, locale='de_CH') == 'vor 2 Minuten'
+
+    def test_reregistering_replaces(self):
+        assert timeago(REFERENCE, REFERENCE, locale='de') == 'gerade eben'
+        assert timeago(REFERENCE, REFERENCE, locale='de-AT') == 'gerade eben'
+        register_locale('de', dict(GERMAN, just_now='soeben'))
+        assert timeago(REFERENCE, REFERENCE, locale='de') == 'soeben'
+        assert timeago(REFERENCE, REFERENCE, locale='de-AT') == 'soeben'
+
+    def test_invalid_locales(self):
+        with pytest.raises(ValueError, match='Unknown locale'):
+            timeago(REFERENCE, locale='xx')
+        register_locale('bad', {'units': GERMAN['units']})
+        with pytest.raises(ValueError, match='missing'):
+            timeago(REFERENCE, locale='bad')
+        register_locale('bad', dict(GERMAN, date='{month} {weekday}'))
+        with pytest.raises(ValueError, match='Unknown field'):
+            timeago(REFERENCE, locale='bad')
+
+
+class TestImport:
+    def _fresh(self, code):
+        return subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent,
+        ).stdout.split()
+
+    def test_heavy_modules_are_deferred(self):
+        loaded = self._fresh('import sys, whenwords; print(*sys.modules)')
+        for module in ('re', 'typing', 'dataclasses', 'threading'):
+            assert module not in loaded
+
+    def test_first_use_loads_what_it_needs(self):
+        loaded = self._fresh(
+            'import sys, whenwords; whenwords.parse_duration("1h 30m"); whenwords.DurationCache(); '
+            'print(*sys.modules)'
+        )
+        assert 're' in loaded and 'threading' in loaded
+        assert 'dataclasses' not in loaded
+
+    def test_duration_options_value_semantics(self):
+        options = DurationOptions(max_units=1)
+        assert options == DurationOptions(compact=False, max_units=1)
+        assert options != DurationOptions()
+        assert repr(options) == 'DurationOptions(compact=False, max_units=1)'
+        with pytest.raises(AttributeError):
+            options.compact = True
+        assert hash(options) == hash(DurationOptions(max_units=1))
+        assert {options: 'one unit'}[DurationOptions(max_units=1)] == 'one unit'
+        assert pickle.loads(pickle.dumps(options)) == options
+
+    def test_frozen_records(self):
+        failure = ParseFailure('soon', 'Cannot parse duration: soon')
+        with pytest.raises(AttributeError):
+            failure.message = 'changed'
+        assert hash(failure) == hash(ParseFailure('soon', 'Cannot parse duration: soon'))
+        assert pickle.loads(pickle.dumps(failure)) == failure
+        assert repr(failure) == "ParseFailure(input='soon', message='Cannot parse duration: soon')"
+
+    def test_record_fields_are_annotated(self):
+        # Type checkers read the class annotations, not __slots__
+        records = [whenwords.DurationOptions, whenwords.CacheInfo, whenwords.ParseFailure,
+                   whenwords.FunctionStats, whenwords.Stats, whenwords._CivilDate]
+        for record in records:
+            assert tuple(record.__annotations__) == record.__slots__
+
+
+def load_pure_module():
+    """Loads whenwords.py itself, bypassing any compiled accelerator."""
+    import importlib.util
+    spec = importlib.util.spec_from_file_location('whenwords_pure', Path(whenwords.__file__).parent / 'whenwords.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module', params=['pure', 'compiled'])
+def implementation(request):
+    if request.param == 'pure':
+        return load_pure_module()
+    if not whenwords.COMPILED:
+        pytest.skip('compiled accelerator not built (python build_accel.py)')
+    return whenwords
+
+
+class TestAccelerator:
+    """The full tests.yaml corpus against both the pure-Python and the compiled module."""
+
+    def test_timeago_corpus(self, implementation):
+        for case in load_corpus('timeago'):
+            inputs = case['input']
+            assert implementation.timeago(inputs['timestamp'], inputs['reference']) == case['output'], case['name']
+
+    def test_duration_corpus(self, implementation):
+        for case in load_corpus('duration'):
+            inputs = case['input']
+            options = inputs.get('options')
+            options = implementation.DurationOptions(**options) if options else None
+            if case.get('error'):
+                with pytest.raises(ValueError):
+                    implementation.duration(inputs['seconds'], options)
+            else:
+                assert implementation.duration(inputs['seconds'], options) == case['output'], case['name']
+
+    def test_parse_duration_corpus(self, implementation):
+        for case in load_corpus('parse_duration'):
+            if case.get('error'):
+                with pytest.raises(ValueError):
+                    implementation.parse_duration(case['input'])
+            else:
+                assert implementation.parse_duration(case['input']) == case['output'], case['name']
+
+    def test_human_date_corpus(self, implementation):
+        for case in load_corpus('human_date'):
+            inputs = case['input']
+            assert implementation.human_date(inputs['timestamp'], inputs['reference']) == case['output'], case['name']
+
+    def test_date_range_corpus(self, implementation):
+        for case in load_corpus('date_range'):
+            inputs = case['input']
+            assert implementation.date_range(inputs['start'], inputs['end']) == case['output'], case['name']
+
+    def test_pure_module_is_not_compiled(self):
+        assert load_pure_module().COMPILED is False
+
+    def test_opt_out(self):
+        code = 'import whenwords; print(whenwords.COMPILED, whenwords.__name__)'
+        result = subprocess.run(
+            [sys.executable, '-c', code], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).resolve().parent, env={**os.environ, 'WHENWORDS_PURE_PYTHON': '1'},
+        )
+        assert result.stdout.split() == ['False', 'whenwords']
+
+    def test_compiled_pickles_as_whenwords(self):
+        if not whenwords.COMPILED:
+            pytest.skip('compiled accelerator not built (python build_accel.py)')
+        failure = whenwords.ParseFailure('soon', 'Cannot parse duration: soon')
+        assert type(failure).__module__ == 'whenwords'
+        assert pickle.loads(pickle.dumps(failure)) == failure
+
+    def test_compiled_build_matches_source(self):
+        if not whenwords.COMPILED:
+            pytest.skip('compiled accelerator not built (python build_accel.py)')
+        pure = load_pure_module()
+        assert whenwords._SOURCE_DIGEST == pure._source_digest(pure.__file__)
+
+    def test_stale_build_is_ignored(self, tmp_path):
+        if not whenwords.COMPILED:
+            pytest.skip('compiled accelerator not built (python build_accel.py)')
+        source = Path(__file__).resolve().parent / 'whenwords.py'
+        extension = Path(whenwords.__file__)
+        (tmp_path / extension.name).write_bytes(extension.read_bytes())
+        code = 'import whenwords; print(whenwords.COMPILED)'
+
+        def run():
+            return subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True,
+                                  cwd=tmp_path, env={k: v for k, v in os.environ.items() if k != 'WHENWORDS_PURE_PYTHON'})
+
+        (tmp_path / 'whenwords.py').write_bytes(source.read_bytes())
+        assert run().stdout.split() == ['True']
+        (tmp_path / 'whenwords.py').write_bytes(source.read_bytes() + b'# edited\n')
+        result = run()
+        assert result.stdout.split() == ['False']
+        assert 'built from an older whenwords.py' in result.stderr
+
+
+class TestDifferentialFuzz:
+    def _run(self, *args):
+        return subprocess.run(
+            [sys.executable, 'benchmarks/fuzz_differential.py', '--count', '2000', *args],
+            capture_output=True, text=True, cwd=Path(__file__).resolve().parent,
+        )
+
+    def test_agrees_with_reference_implementation(self):
+        # parse_duration deliberately differs from the original (see usage.md)
+        result = self._run(
+            '--oracle', 'benchmarks/reference.py',
+            '--functions', 'timeago', 'duration', 'human_date', 'date_range',
+        )
+        assert result.returncode == 0, result.stdout
+        assert 'inputs/sec' in result.stdout
+
+    def test_reports_shrunk_repro(self, tmp_path):
+        broken = tmp_path / 'broken.py'
+        broken.write_text(
+            'from whenwords import *\n'
+            'from whenwords import timeago as _timeago\n\n\n'
+            'def timeago(timestamp, reference=None):\n'
+            '    label = _timeago(timestamp, reference)\n'
+            "    return '1 minute ago' if label == '2 minutes ago' else label\n"
+        )
+        result = self._run('--functions', 'timeago', '--candidate', str(broken))
+        assert result.returncode == 1
+        assert 'MISMATCH timeago(-90, 0)' in result.stdout
+
+
+class TestCli:
+    def _run(self, stdin, *args):
+        return subprocess.run(
+            [sys.executable, '-m', 'whenwords', *args],
+            input=stdin, capture_output=True, text=True, encoding='utf-8',
+            cwd=Path(__file__).resolve().parent,
+        )
+
+    def test_jsonl_timeago_in_place(self):
+        result = self._run(
+            '{"ts": 1704067110, "id": 1}\n{"ts": "2024-01-01T01:00:00Z", "id": 2}\n',
+            '--field', 'ts', '--op', 'timeago', '--reference', '1704067200',
+        )
+        assert result.returncode == 0
+        assert [json.loads(line) for line in result.stdout.splitlines()] == [
+            {'ts': '2 minutes ago', 'id': 1},
+            {'ts': 'in 1 hour', 'id': 2},
+        ]
+
+    def test_csv_duration_new_column(self):
+        result = self._run(
+            'id,secs\n1,5400\n2,93600\n',
+            '--format', 'csv', '--field', 'secs', '--op', 'duration', '--compact', '--output-field', 'human',
+        )
+        assert result.returncode == 0
+        assert result.stdout == 'id,secs,human\n1,5400,1h 30m\n2,93600,1d 2h\n'
+
+    def test_csv_human_date_iso_reference(self):
+        result = self._run(
+            'when\n1705190400\n1709251200\n',
+            '--format', 'csv', '--field', 'when', '--op', 'human_date', '--reference', '2024-01-15T00:00:00Z',
+        )
+        assert result.stdout == 'when\nYesterday\nMarch 1\n'
+
+    def test_workers_preserve_order(self):
+        lines = [json.dumps({'d': f'{n}m'}) for n in range(1, 501)]
+        result = self._run(
+            '\n'.join(lines) + '\n',
+            '--field', 'd', '--op', 'parse_duration', '--workers', '2', '--chunk-size', '7',
+        )
+        assert result.returncode == 0
+        assert [json.loads(line)['d'] for line in result.stdout.splitlines()] == \
+            [n * 60 for n in range(1, 501)]
+
+    def test_error_reports_line_and_fails(self):
+        result = self._run('{"d": "5m"}\n{"d": "bogus"}\n', '--field', 'd', '--op', 'parse_duration')
+        assert result.returncode == 1
+        assert 'line 2' in result.stderr
+
+    def test_on_error_null(self):
+        result = self._run(
+            '{"d": "5m"}\n{"d": "bogus"}\n{"x": 1}\n',
+            '--field', 'd', '--op', 'parse_duration', '--on-error', 'null',
+        )
+        assert result.returncode == 0
+        assert [json.loads(line).get('d') for line in result.stdout.splitlines()] == [300, None, None]
+
+    def test_malformed_jsonl(self):
+        stdin = '{"d": "5m"}\nnot json\n[1, 2]\n"text"\n{"d": "1h"}\n'
+        result = self._run(stdin, '--field', 'd', '--op', 'parse_duration')
+        assert result.returncode == 1
+        assert 'line 2' in result.stderr and 'Traceback' not in result.stderr
+        result = self._run('{"d": "5m"}\n[1, 2]\n', '--field', 'd', '--op', 'parse_duration')
+        assert result.returncode == 1
+        assert 'line 2' in result.stderr and 'Traceback' not in result.stderr
+        result = self._run(stdin, '--field', 'd', '--op', 'parse_duration', '--on-error', 'null')
+        assert result.returncode == 0
+        assert [json.loads(line) for line in result.stdout.splitlines()] == [
+            {'d': 300}, None, [1, 2], 'text', {'d': 3600},
+        ]
+
+    def test_csv_short_row_fills_target_column(self):
+        result = self._run(
+            'a,ts,ago\n1\n2,1704067110\n',
+            '--format', 'csv', '--field', 'ts', '--op', 'timeago', '--reference', '1704067200',
+            '--output-field', 'ago', '--on-error', 'null',
+        )
+        assert result.returncode == 0
+        assert result.stdout == 'a,ts,ago\n1,,\n2,1704067110,2 minutes ago\n'
+
+    def test_reference_defaults_to_now(self):
+        result = self._run('{"ts": 1704067200}\n', '--field', 'ts', '--op', 'human_date')
+        assert result.returncode == 0
+        assert json.loads(result.stdout)['ts'] == 'January 1, 2024'
+
+    def test_unknown_csv_column(self):
+        result = self._run('a,b\n1,2\n', '--format', 'csv', '--field', 'ts', '--op', 'timeago')
+        assert result.returncode == 2
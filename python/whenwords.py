@@ -5,13 +5,28 @@ Version 0.1.0
 
 from __future__ import annotations
 
-import re
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Union
+import sys
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
+from types import FunctionType
+
+# Import time matters to short-lived CLIs and serverless handlers: re,
+# threading and collections are imported on first use, and typing and
+# dataclasses not at all (see benchmarks/bench_import.py for the budget)
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import re
+    import threading
+    from collections import OrderedDict
+    from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+    from concurrent.futures import Executor
+    from functools import _lru_cache_wrapper
+    from typing import Any
 
 # Type alias for timestamps
-Timestamp = Union[int, float, str, datetime]
+Timestamp = int | float | str | datetime
 
 # Constants
 SECONDS_PER_MINUTE = 60
@@ -27,24 +42,210 @@ MONTHS = [
     'July', 'August', 'September', 'October', 'November', 'December'
 ]
 
+# Lower bound (in seconds) of each timeago bucket after "just now"
+_TIMEAGO_THRESHOLDS = (
+    45, 90,
+    45 * SECONDS_PER_MINUTE, 90 * SECONDS_PER_MINUTE,
+    22 * SECONDS_PER_HOUR, 36 * SECONDS_PER_HOUR,
+    26 * SECONDS_PER_DAY, 46 * SECONDS_PER_DAY,
+    320 * SECONDS_PER_DAY, 548 * SECONDS_PER_DAY,
+)
+# Rounding unit of each bucket; 0 means the bucket always shows a value of 1
+_TIMEAGO_BUCKET_UNITS = (
+    0, 0, SECONDS_PER_MINUTE, 0, SECONDS_PER_HOUR, 0,
+    SECONDS_PER_DAY, 0, SECONDS_PER_MONTH, 0, SECONDS_PER_YEAR,
+)
+_TIMEAGO_BUCKET_NAMES = (
+    '', 'minute', 'minute', 'hour', 'hour', 'day', 'day', 'month', 'month', 'year', 'year',
+)
+_TIMEAGO_MONTHS_BUCKET = 8
+
+# Diffs below this (~100 years) are answered from the precomputed timeago table
+_TIMEAGO_TABLE_END = 100 * SECONDS_PER_YEAR + SECONDS_PER_YEAR // 2
+
+# Largest absolute diff the vectorized paths handle without int64 overflow
+_VECTOR_MAX_DIFF = 2 ** 62
+
+_INT_TYPECODES = frozenset('bBhHiIlLqQ')
+
+# duration units as (singular, plural, compact suffix, seconds), largest first
+_DURATION_PARTS = (
+    ('year', 'years', 'y', SECONDS_PER_YEAR),
+    ('month', 'months', 'mo', SECONDS_PER_MONTH),
+    ('day', 'days', 'd', SECONDS_PER_DAY),
+    ('hour', 'hours', 'h', SECONDS_PER_HOUR),
+    ('minute', 'minutes', 'm', SECONDS_PER_MINUTE),
+    ('second', 'seconds', 's', 1),
+)
+_DURATION_PART_SECONDS = tuple(part[3] for part in _DURATION_PARTS)
+
+# parse_duration grammar; see _duration_grammar()
+_COLON_DURATION = r'^(\d+):(\d{1,2})(?::(\d{1,2}))?$'
+# One alternation for every unit (groups 3-7); a number with no recognizable
+# unit after it falls through to the trailing "stray" group 8
+_DURATION_TOKEN = (
+    r'(-\s*)?(\d+(?:\.\d+)?|\.\d+)\s*'
+    r'(?:(?:(weeks?|wks?|w)|(days?|d)|(hours?|hrs?|h)|(minutes?|mins?|m)|(seconds?|secs?|s))'
+    r'(?:\b|(?=\d|$))|()(?!\d))'
+)
+# Indexed by token group; groups 0-2 are the whole match, sign and number
+_DURATION_UNIT_SECONDS = (
+    0, 0, 0,
+    SECONDS_PER_WEEK, SECONDS_PER_DAY, SECONDS_PER_HOUR, SECONDS_PER_MINUTE, 1,
+)
+_DURATION_UNIT_NAMES = ('', '', '', 'weeks', 'days', 'hours', 'minutes', 'seconds')
+_DURATION_STRAY = 8
+# parse_duration_lines() copies this many bytes at a time, rounded up to a whole line
+_DURATION_LINES_BLOCK = 1 << 16
+
+
+@lru_cache(maxsize=None)
+def _duration_grammar() -> tuple[re.Pattern, re.Pattern]:
+    """Compiles the parse_duration patterns on first use rather than at import."""
+    import re
+    return re.compile(_COLON_DURATION), re.compile(_DURATION_TOKEN)
+
+
+@lru_cache(maxsize=None)
+def _duration_bytes_grammar() -> tuple[re.Pattern, re.Pattern, re.Pattern]:
+    """
+    The parse_duration patterns compiled for bytes, for parse_duration_lines().
+
+    IGNORECASE stands in for lower(). The third pattern finds bytes the str
+    patterns treat differently: non-ASCII, and \\x1c-\\x1f, which str.strip()
+    and str patterns count as whitespace.
+    """
+    import re
+    return (
+        re.compile(_COLON_DURATION.encode()),
+        re.compile(_DURATION_TOKEN.encode(), re.IGNORECASE),
+        re.compile(rb'[^\x00-\x1b\x20-\x7f]'),
+    )
+
+
+class _Record:
+    """
+    Slotted value object whose repr, equality and pickling follow __slots__.
+
+    A hand-written stand-in for @dataclass, whose code generation cost more
+    at import than the rest of the module. Subclasses list their fields in
+    __slots__ and take them positionally, in that order, in __init__.
+    """
+    __slots__: tuple[str, ...] = ()
+
+    def _astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__)
+        return f'{type(self).__name__}({fields})'
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __reduce__(self) -> tuple:
+        return type(self), self._astuple()
+
+
+class _FrozenRecord(_Record):
+    """Immutable, hashable _Record; __init__ assigns through object.__setattr__."""
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise AttributeError(f'cannot assign to field {name!r}')
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f'cannot delete field {name!r}')
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+
+def _parse_iso_timestamp(timestamp: str) -> int:
+    """Parses an ISO 8601 string to Unix seconds."""
+    # Fast path for the strict YYYY-MM-DDTHH:MM:SSZ layout: fromisoformat
+    # reads the trailing Z natively, so skip the replace() copy
+    if len(timestamp) == 20 and timestamp[19] == 'Z' and timestamp[10] == 'T':
+        try:
+            return int(datetime.fromisoformat(timestamp).timestamp())
+        except ValueError:
+            pass
+    try:
+        # Handle various ISO 8601 formats
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+        return int(dt.timestamp())
+    except ValueError:
+        raise ValueError(f"Invalid timestamp format: {timestamp}")
+
+
+_parse_iso_uncached = _parse_iso_timestamp
+# The cached parser _parse_iso_timestamp is bound to, while set_iso_cache() has one enabled
+_iso_cache: _lru_cache_wrapper[int] | None = None
+
+
+def set_iso_cache(maxsize: int) -> None:
+    """
+    Enables a bounded LRU cache of parsed ISO 8601 strings, shared by every function.
+
+    Pays off when the same timestamp strings repeat (e.g. many rows from one
+    API payload). Pass 0 to disable the cache again; invalid strings are never cached.
+    """
+    global _parse_iso_timestamp, _iso_cache
+    if maxsize < 0:
+        raise ValueError('maxsize must be non-negative')
+    _iso_cache = lru_cache(maxsize=maxsize)(_parse_iso_uncached) if maxsize else None
+    _parse_iso_timestamp = _iso_cache or _parse_iso_uncached
+
+
+def iso_cache_info() -> tuple | None:
+    """Returns functools-style hit/miss counters of the ISO cache, or None if it is disabled."""
+    return _iso_cache.cache_info() if _iso_cache is not None else None
+
 
 def _normalize_timestamp(timestamp: Timestamp) -> int:
     """Normalizes a timestamp to Unix seconds."""
+    # Exact-type checks first for the two most common inputs
+    if type(timestamp) is int:
+        return timestamp
+    if type(timestamp) is str:
+        return _parse_iso_timestamp(timestamp)
     if isinstance(timestamp, (int, float)):
         return int(timestamp)
     if isinstance(timestamp, datetime):
         return int(timestamp.timestamp())
     if isinstance(timestamp, str):
-        # Try ISO 8601 parsing
-        try:
-            # Handle various ISO 8601 formats
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            return int(dt.timestamp())
-        except ValueError:
-            raise ValueError(f"Invalid timestamp format: {timestamp}")
+        return _parse_iso_timestamp(timestamp)
     raise TypeError(f"Invalid timestamp type: {type(timestamp).__name__}")
 
 
+# Ticks per second of the integer timestamp units accepted by unit=
+_UNIT_TICKS = {'s': 1, 'ms': 1_000, 'us': 1_000_000, 'ns': 1_000_000_000}
+
+
+def _unit_ticks(unit: str) -> int:
+    """Ticks per second of a unit= name."""
+    try:
+        return _UNIT_TICKS[unit]
+    except (KeyError, TypeError):
+        raise ValueError(f"Invalid unit: {unit!r} (expected 's', 'ms', 'us' or 'ns')") from None
+
+
+def _normalize_ticks(timestamp: Timestamp, ticks: int) -> int:
+    """
+    Normalizes a timestamp to Unix seconds, reading numbers as counts of 1/ticks seconds.
+
+    Numbers become integer ticks exactly as in seconds mode (int()), then are
+    floor-divided, so int64 nanoseconds never pass through a float. ISO
+    strings and datetimes are absolute and ignore the unit.
+    """
+    normalized = _normalize_timestamp(timestamp)
+    if isinstance(timestamp, (str, datetime)):
+        return normalized
+    return normalized // ticks
+
+
 def _round_half_up(n: float) -> int:
     """Rounds a number using half-up rounding (2.5 → 3, 2.4 → 2)."""
     return int(n + 0.5)
@@ -55,78 +256,411 @@ def _pluralize(count: int, singular: str, plural: str) -> str:
     return singular if count == 1 else plural
 
 
-def timeago(timestamp: Timestamp, reference: Timestamp | None = None) -> str:
+def _build_timeago_table() -> tuple[list[int], list[tuple[str, int] | None], list[str], list[str]]:
+    """
+    Precomputes every timeago string for diffs below _TIMEAGO_TABLE_END.
+
+    Returns sorted lower bounds of each distinct output, the (unit, value)
+    each bound shows (None for "just now"), and the interned past ("... ago")
+    and future ("in ...") strings for each bound.
+    """
+    bounds = [0]
+    rows: list[tuple[str, int] | None] = [None]
+    past = ['just now']
+    future = ['just now']
+    uppers = _TIMEAGO_THRESHOLDS[1:] + (_TIMEAGO_TABLE_END,)
+
+    for bucket, (lower, upper) in enumerate(zip(_TIMEAGO_THRESHOLDS, uppers), start=1):
+        unit = _TIMEAGO_BUCKET_UNITS[bucket]
+        name = _TIMEAGO_BUCKET_NAMES[bucket]
+        if unit:
+            # Half-up rounding reaches value k at exactly k * unit - unit / 2
+            first = _round_half_up(lower / unit)
+            last = _round_half_up((upper - 1) / unit)
+            starts = [(lower, first)] + [(k * unit - unit // 2, k) for k in range(first + 1, last + 1)]
+        else:
+            starts = [(lower, 1)]
+
+        for start, value in starts:
+            if bucket == _TIMEAGO_MONTHS_BUCKET:
+                value = min(10, value)
+            label = f'{value} {_pluralize(value, name, name + "s")}'
+            if past[-1] == f'{label} ago':
+                continue
+            bounds.append(start)
+            rows.append((name, value))
+            past.append(sys.intern(f'{label} ago'))
+            future.append(sys.intern(f'in {label}'))
+
+    return bounds, rows, past, future
+
+
+_TIMEAGO_BOUNDS, _TIMEAGO_ROWS, _TIMEAGO_PAST, _TIMEAGO_FUTURE = _build_timeago_table()
+# Past and future strings interleaved, indexed by ``row * 2 + is_future``
+_TIMEAGO_LABELS = [label for pair in zip(_TIMEAGO_PAST, _TIMEAGO_FUTURE) for label in pair]
+_TIMEAGO_LABELS_UTF8 = [label.encode() for label in _TIMEAGO_LABELS]
+
+
+def _timeago_from_diff(diff: int) -> str:
+    """Formats the signed difference ``reference - timestamp`` as a relative time string."""
+    if diff >= 0:
+        if diff < _TIMEAGO_TABLE_END:
+            return _TIMEAGO_PAST[bisect_right(_TIMEAGO_BOUNDS, diff) - 1]
+        value = _round_half_up(diff / SECONDS_PER_YEAR)
+        return f'{value} years ago'
+
+    abs_diff = -diff
+    if abs_diff < _TIMEAGO_TABLE_END:
+        return _TIMEAGO_FUTURE[bisect_right(_TIMEAGO_BOUNDS, abs_diff) - 1]
+    value = _round_half_up(abs_diff / SECONDS_PER_YEAR)
+    return f'in {value} years'
+
+
+def timeago(
+    timestamp: Timestamp,
+    reference: Timestamp | None = None,
+    locale: str | None = None,
+    unit: str = 's',
+) -> str:
     """
     Converts timestamps to relative time strings like "3 hours ago" or "in 2 days".
 
     Args:
         timestamp: Unix seconds, ISO 8601 string, or datetime object
         reference: Optional comparison time (defaults to timestamp, returning "just now")
+        locale: Optional registered locale code (see register_locale()); defaults to English
+        unit: What numeric timestamps count: 's', 'ms', 'us' or 'ns' since the
+            epoch. Each is floored to whole seconds with integer division.
 
     Returns:
         Human-readable relative time string
+
+    Raises:
+        ValueError: If unit is not one of the above
     """
-    ts = _normalize_timestamp(timestamp)
-    ref = _normalize_timestamp(reference) if reference is not None else ts
-
-    diff = ref - ts
-    abs_diff = abs(diff)
-    is_future = diff < 0
-
-    if abs_diff < 45:
-        return 'just now'
-    elif abs_diff < 90:
-        value = 1
-        unit = 'minute'
-    elif abs_diff < 45 * SECONDS_PER_MINUTE:
-        value = _round_half_up(abs_diff / SECONDS_PER_MINUTE)
-        unit = _pluralize(value, 'minute', 'minutes')
-    elif abs_diff < 90 * SECONDS_PER_MINUTE:
-        value = 1
-        unit = 'hour'
-    elif abs_diff < 22 * SECONDS_PER_HOUR:
-        value = _round_half_up(abs_diff / SECONDS_PER_HOUR)
-        unit = _pluralize(value, 'hour', 'hours')
-    elif abs_diff < 36 * SECONDS_PER_HOUR:
-        value = 1
-        unit = 'day'
-    elif abs_diff < 26 * SECONDS_PER_DAY:
-        value = _round_half_up(abs_diff / SECONDS_PER_DAY)
-        unit = _pluralize(value, 'day', 'days')
-    elif abs_diff < 46 * SECONDS_PER_DAY:
-        value = 1
-        unit = 'month'
-    elif abs_diff < 320 * SECONDS_PER_DAY:
-        # Use half-up rounding but cap at 10 months to avoid showing "11 months"
-        # since 320 days is already "1 year ago"
-        value = min(10, _round_half_up(abs_diff / SECONDS_PER_MONTH))
-        unit = _pluralize(value, 'month', 'months')
-    elif abs_diff < 548 * SECONDS_PER_DAY:
-        value = 1
-        unit = 'year'
+    if unit == 's':
+        ts = _normalize_timestamp(timestamp)
+        ref = _normalize_timestamp(reference) if reference is not None else ts
     else:
-        value = _round_half_up(abs_diff / SECONDS_PER_YEAR)
-        unit = _pluralize(value, 'year', 'years')
+        ticks = _unit_ticks(unit)
+        ts = _normalize_ticks(timestamp, ticks)
+        ref = _normalize_ticks(reference, ticks) if reference is not None else ts
+
+    if locale is not None:
+        return _get_locale(locale).timeago(ref - ts)
+    return _timeago_from_diff(ref - ts)
+
+
+def _timeago_next_diff(diff: int) -> int:
+    """The smallest diff after ``diff`` (as the reference moves forward) with a different timeago string."""
+    half_year = SECONDS_PER_YEAR // 2
+    if diff >= 0:
+        if diff < _TIMEAGO_TABLE_END:
+            row = bisect_right(_TIMEAGO_BOUNDS, diff)
+            return _TIMEAGO_BOUNDS[row] if row < len(_TIMEAGO_BOUNDS) else _TIMEAGO_TABLE_END
+        # "N years ago" becomes N + 1 once diff / YEAR reaches N + 0.5
+        return _round_half_up(diff / SECONDS_PER_YEAR) * SECONDS_PER_YEAR + half_year
+
+    abs_diff = -diff
+    if abs_diff < _TIMEAGO_TABLE_END:
+        row = bisect_right(_TIMEAGO_BOUNDS, abs_diff) - 1
+        if row == 0:
+            # Future "just now" runs on into past "just now"
+            return _TIMEAGO_BOUNDS[1]
+        # The reference moves toward the timestamp: the string changes as
+        # soon as abs_diff drops below its row's lower bound
+        return 1 - _TIMEAGO_BOUNDS[row]
+    return half_year + 1 - _round_half_up(abs_diff / SECONDS_PER_YEAR) * SECONDS_PER_YEAR
+
+
+def timeago_with_expiry(timestamp: Timestamp, reference: Timestamp) -> tuple[str, int]:
+    """
+    Returns the timeago() string together with the reference time at which it next changes.
 
-    if is_future:
-        return f'in {value} {unit}'
-    return f'{value} {unit} ago'
+    Lets live views re-render a label only when it actually changes rather
+    than on every tick. The string stays the same for every reference from
+    ``reference`` up to, but not including, ``changes_at``.
 
+    Args:
+        timestamp: Unix seconds, ISO 8601 string, or datetime object
+        reference: Current time
+
+    Returns:
+        (label, changes_at): ``label == timeago(timestamp, reference)`` and
+        ``changes_at`` is the first later reference, in Unix seconds, at which
+        timeago() returns a different string
+    """
+    ts = _normalize_timestamp(timestamp)
+    diff = _normalize_timestamp(reference) - ts
+    return _timeago_from_diff(diff), ts + _timeago_next_diff(diff)
 
-@dataclass
-class DurationOptions:
-    """Options for duration formatting."""
-    compact: bool = False
-    max_units: int = 2
 
+def _numpy_seconds(np, values, ticks: int = 1):
+    """
+    Converts a NumPy array of Unix seconds (or 1/ticks seconds) to int64
+    seconds, or returns None if it needs the scalar path (not 1-D numeric,
+    non-finite, or near int64 limits).
+    """
+    if values.ndim != 1 or values.dtype.kind not in 'iuf':
+        return None
+    if values.size and values.dtype.kind == 'f' and not np.isfinite(values).all():
+        return None
+    if values.size and max(abs(int(values.min())), abs(int(values.max()))) >= _VECTOR_MAX_DIFF:
+        return None
+    # astype truncates toward zero, matching int() in _normalize_timestamp
+    seconds = values.astype(np.int64)
+    return seconds if ticks == 1 else seconds // ticks
+
+
+def _timeago_numpy_codes(np, values, ref: int, ticks: int = 1) -> tuple[list[str], object] | None:
+    """
+    Vectorized timeago bucketing over a NumPy array.
 
-def duration(seconds: int | float, options: DurationOptions | None = None) -> str:
+    Returns a label list and an array of indexes into it, one per value, or
+    None if the array needs the scalar path.
+    """
+    seconds = _numpy_seconds(np, values, ticks)
+    if seconds is None:
+        return None
+    if seconds.size and max(abs(ref - int(seconds.min())), abs(ref - int(seconds.max()))) >= _VECTOR_MAX_DIFF:
+        return None
+
+    diffs = ref - seconds
+    abs_diffs = np.abs(diffs)
+    in_table = abs_diffs < _TIMEAGO_TABLE_END
+    rows = np.searchsorted(np.array(_TIMEAGO_BOUNDS, dtype=np.int64), abs_diffs, side='right') - 1
+    codes = np.where(in_table, rows * 2 + (diffs < 0), 0)
+
+    labels = _TIMEAGO_LABELS
+    if not in_table.all():
+        # Diffs past the table (~100 years) get their own labels appended
+        labels = list(labels)
+        extra: dict[str, int] = {}
+        for i in np.flatnonzero(~in_table).tolist():
+            label = _timeago_from_diff(int(diffs[i]))
+            if label not in extra:
+                extra[label] = len(labels)
+                labels.append(label)
+            codes[i] = extra[label]
+    return labels, codes
+
+
+def timeago_many(timestamps: Iterable[Timestamp], reference: Timestamp, unit: str = 's') -> list[str]:
+    """
+    Converts many timestamps to relative time strings against one shared reference.
+
+    Args:
+        timestamps: Sequence of timestamps, an integer ``array.array``, or a
+            NumPy integer/float array of Unix seconds
+        reference: Comparison time shared by every timestamp
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
+
+    Returns:
+        List of strings, identical to calling timeago() on each timestamp
+    """
+    ticks = _unit_ticks(unit)
+    return _timeago_many(timestamps, _normalize_ticks(reference, ticks), ticks)
+
+
+def _timeago_many(timestamps: Iterable[Timestamp], ref: int, ticks: int) -> list[str]:
+    """timeago_many() against a reference already normalized to Unix seconds."""
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(timestamps, np.ndarray):
+        encoded = _timeago_numpy_codes(np, timestamps, ref, ticks)
+        if encoded is not None:
+            labels, codes = encoded
+            return np.array(labels, dtype=object)[codes].tolist()
+        timestamps = timestamps.tolist()
+
+    if isinstance(timestamps, array) and timestamps.typecode in _INT_TYPECODES:
+        if ticks == 1:
+            return [_timeago_from_diff(ref - ts) for ts in timestamps]
+        return [_timeago_from_diff(ref - ts // ticks) for ts in timestamps]
+
+    if ticks == 1:
+        normalize = _normalize_timestamp
+        return [_timeago_from_diff(ref - normalize(ts)) for ts in timestamps]
+    return [_timeago_from_diff(ref - _normalize_ticks(ts, ticks)) for ts in timestamps]
+
+
+class TimeagoScheduler:
+    """
+    Keeps timeago() labels for many items current, recomputing only the ones that change.
+
+    Items sit in a heap ordered by the reference time at which their label
+    next changes (see timeago_with_expiry()), so a tick costs
+    O(changed * log n) instead of re-rendering all n labels.
+
+    Example:
+        scheduler = TimeagoScheduler(time.time())
+        scheduler.add(post.id, post.created_at)
+        ...
+        for key, label in scheduler.tick(time.time()):
+            rerender(key, label)
+    """
+
+    def __init__(self, reference: Timestamp):
+        self._reference = _normalize_timestamp(reference)
+        # key -> [timestamp, label, heap entry id]; heap holds (changes_at, entry id, key)
+        self._items: dict[Hashable, list] = {}
+        self._heap: list[tuple[int, int, Hashable]] = []
+        self._next_id = 0
+
+    @property
+    def reference(self) -> int:
+        """The reference time of the latest tick, in Unix seconds."""
+        return self._reference
+
+    @property
+    def next_change(self) -> int | None:
+        """The earliest reference time at which some label changes, or None when empty."""
+        from heapq import heappop
+
+        heap = self._heap
+        while heap and not self._is_current(heap[0]):
+            heappop(heap)
+        return heap[0][0] if heap else None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def label(self, key: Hashable) -> str:
+        """The current label of an item (KeyError if it was never added)."""
+        return self._items[key][1]
+
+    def add(self, key: Hashable, timestamp: Timestamp) -> str:
+        """Adds or replaces an item and returns its label at the current reference."""
+        ts = _normalize_timestamp(timestamp)
+        item = self._items[key] = [ts, None, 0]
+        self._schedule(key, item)
+        return item[1]
+
+    def remove(self, key: Hashable) -> None:
+        """Removes an item (KeyError if absent); its heap entry is dropped lazily."""
+        del self._items[key]
+        if len(self._heap) > 2 * len(self._items) + 64:
+            self._rebuild()
+
+    def tick(self, reference: Timestamp) -> list[tuple[Hashable, str]]:
+        """
+        Moves to a new reference time and returns the items whose label changed.
+
+        Args:
+            reference: Current time. If it is earlier than the previous tick
+                (e.g. the wall clock was adjusted), every label is recomputed.
+
+        Returns:
+            (key, new label) pairs, earliest change first (in insertion
+            order after a backwards jump)
+        """
+        from heapq import heappop
+
+        ref = _normalize_timestamp(reference)
+        moved_back = ref < self._reference
+        self._reference = ref
+        changed = []
+
+        if moved_back:
+            for key, item in self._items.items():
+                old = item[1]
+                self._update(item)
+                if item[1] != old:
+                    changed.append((key, item[1]))
+            self._rebuild()
+            return changed
+
+        heap = self._heap
+        while heap and heap[0][0] <= ref:
+            entry = heappop(heap)
+            if not self._is_current(entry):
+                continue
+            key = entry[2]
+            item = self._items[key]
+            old = item[1]
+            self._schedule(key, item)
+            if item[1] != old:
+                changed.append((key, item[1]))
+        return changed
+
+    def _is_current(self, entry: tuple[int, int, Hashable]) -> bool:
+        item = self._items.get(entry[2])
+        return item is not None and item[2] == entry[1]
+
+    def _update(self, item: list) -> int:
+        """Refreshes an item's label; returns when it next changes."""
+        diff = self._reference - item[0]
+        item[1] = _timeago_from_diff(diff)
+        return item[0] + _timeago_next_diff(diff)
+
+    def _schedule(self, key: Hashable, item: list) -> None:
+        from heapq import heappush
+
+        changes_at = self._update(item)
+        item[2] = self._next_id
+        self._next_id += 1
+        heappush(self._heap, (changes_at, item[2], key))
+
+    def _rebuild(self) -> None:
+        from heapq import heapify
+
+        self._heap = [
+            (item[0] + _timeago_next_diff(self._reference - item[0]), item[2], key)
+            for key, item in self._items.items()
+        ]
+        heapify(self._heap)
+
+
+class DurationOptions(_FrozenRecord):
+    """Options for duration formatting. Immutable and hashable, so usable as a cache key."""
+    __slots__ = ('compact', 'max_units')
+    compact: bool
+    max_units: int
+
+    def __init__(self, compact: bool = False, max_units: int = 2):
+        object.__setattr__(self, 'compact', compact)
+        object.__setattr__(self, 'max_units', max_units)
+
+
+def _duration_parts(remaining: int, max_units: int) -> list[tuple[int, int]]:
+    """Splits whole seconds into (unit index, value) pairs, rounded to max_units parts."""
+    # Non-zero units, largest first. Once max_units parts are kept,
+    # ``remaining`` is exactly the seconds of the dropped parts.
+    parts: list[tuple[int, int]] = []
+
+    for index, unit_seconds in enumerate(_DURATION_PART_SECONDS):
+        if remaining >= unit_seconds:
+            parts.append((index, remaining // unit_seconds))
+            remaining %= unit_seconds
+            if len(parts) == max_units:
+                break
+
+    if max_units < 1 and parts:
+        # Degenerate limits keep the slice semantics of parts[:max_units]
+        keep = max(len(parts) + max_units, 0) if max_units < 0 else 0
+        remaining = sum(value * _DURATION_PART_SECONDS[index] for index, value in parts[keep:])
+        parts = parts[:keep]
+
+    # Round the last kept unit based on the dropped seconds.
+    # Use > half (not >= half) so exactly half rounds down
+    if remaining and parts:
+        index, value = parts[-1]
+        if 2 * remaining > _DURATION_PART_SECONDS[index]:
+            parts[-1] = (index, value + 1)
+
+    return parts
+
+
+def duration(seconds: int | float, options: DurationOptions | None = None, locale: str | None = None) -> str:
     """
     Formats a duration in human-readable form.
 
     Args:
         seconds: Duration in seconds (must be non-negative)
         options: Optional formatting options (compact mode, max_units)
+        locale: Optional registered locale code; defaults to English
 
     Returns:
         Human-readable duration string
@@ -137,62 +671,109 @@ def duration(seconds: int | float, options: DurationOptions | None = None) -> st
     if seconds < 0:
         raise ValueError('Duration must be a non-negative number')
 
-    opts = options or DurationOptions()
-    compact = opts.compact
-    max_units = opts.max_units
+    if options is None:
+        compact, max_units = False, 2
+    else:
+        compact, max_units = options.compact, options.max_units
+
+    if locale is not None:
+        return _get_locale(locale).duration(seconds, compact, max_units)
 
     if seconds == 0:
         return '0s' if compact else '0 seconds'
 
-    units = [
-        ('year', 'y', SECONDS_PER_YEAR),
-        ('month', 'mo', SECONDS_PER_MONTH),
-        ('day', 'd', SECONDS_PER_DAY),
-        ('hour', 'h', SECONDS_PER_HOUR),
-        ('minute', 'm', SECONDS_PER_MINUTE),
-        ('second', 's', 1),
-    ]
-
-    parts: list[tuple[int, str, str]] = []
-    remaining = int(seconds)
-
-    for name, short, unit_seconds in units:
-        if remaining >= unit_seconds:
-            value = remaining // unit_seconds
-            remaining = remaining % unit_seconds
-            parts.append((value, name, short))
-
-    # Limit to max_units and round if needed
-    if len(parts) > max_units:
-        kept_parts = list(parts[:max_units])
-        dropped_parts = parts[max_units:]
-
-        # Calculate total seconds of dropped parts
-        dropped_seconds = 0
-        for value, name, _ in dropped_parts:
-            unit_info = next(u for u in units if u[0] == name)
-            dropped_seconds += value * unit_info[2]
-
-        # Round the last kept unit based on dropped seconds
-        # Use > 0.5 (not >= 0.5) so exactly half rounds down
-        if kept_parts and dropped_seconds > 0:
-            last_value, last_name, last_short = kept_parts[-1]
-            last_unit_info = next(u for u in units if u[0] == last_name)
-            fraction = dropped_seconds / last_unit_info[2]
-            if fraction > 0.5:
-                kept_parts[-1] = (last_value + 1, last_name, last_short)
-
-        parts = kept_parts
+    parts = _duration_parts(int(seconds), max_units)
 
     if compact:
-        return ' '.join(f'{value}{short}' for value, _, short in parts)
+        return ' '.join(f'{value}{_DURATION_PARTS[index][2]}' for index, value in parts)
 
     return ', '.join(
-        f'{value} {_pluralize(value, name, name + "s")}'
-        for value, name, _ in parts
+        f'{value} {_DURATION_PARTS[index][0] if value == 1 else _DURATION_PARTS[index][1]}'
+        for index, value in parts
     )
 
 
+@lru_cache(maxsize=64)
+def duration_formatter(
+    options: DurationOptions | None = None,
+    locale: str | None = None,
+) -> Callable[[int | float], str]:
+    """
+    Returns a duration() specialized for one set of options.
+
+    The joiner, unit labels and max_units are resolved once, so the returned
+    callable skips the per-call option handling in tight rendering loops.
+    Formatters are cached per (options, locale), so equal options share one.
+
+    Args:
+        options: Optional formatting options (compact mode, max_units)
+        locale: Optional registered locale code; defaults to English
+
+    Returns:
+        A function of seconds giving the same string as duration(seconds, options, locale)
+
+    Raises:
+        ValueError: If the locale is not registered
+    """
+    if options is None:
+        compact, max_units = False, 2
+    else:
+        compact, max_units = options.compact, options.max_units
+    parts = _duration_parts
+
+    if locale is not None:
+        _get_locale(locale)
+
+        # Looked up per call so a later register_locale() is picked up
+        def format_localized(seconds: int | float) -> str:
+            if seconds < 0:
+                raise ValueError('Duration must be a non-negative number')
+            return _get_locale(locale).duration(seconds, compact, max_units)
+
+        return format_localized
+
+    # (plural, singular) per unit, picked by value == 1; verbose labels carry their leading space
+    if compact:
+        zero, joiner = '0s', ' '
+        labels = tuple((part[2], part[2]) for part in _DURATION_PARTS)
+    else:
+        zero, joiner = '0 seconds', ', '
+        labels = tuple((f' {part[1]}', f' {part[0]}') for part in _DURATION_PARTS)
+
+    if max_units < 1:
+        def format_degenerate(seconds: int | float) -> str:
+            if seconds < 0:
+                raise ValueError('Duration must be a non-negative number')
+            if seconds == 0:
+                return zero
+            return joiner.join([f'{value}{labels[index][value == 1]}' for index, value in parts(int(seconds), max_units)])
+
+        return format_degenerate
+
+    units = tuple(zip(_DURATION_PART_SECONDS, labels))
+
+    # _duration_parts() inlined for max_units >= 1: the last kept unit is
+    # rounded on the seconds left over once max_units parts are taken
+    def format_duration(seconds: int | float) -> str:
+        if seconds < 0:
+            raise ValueError('Duration must be a non-negative number')
+        if seconds == 0:
+            return zero
+        remaining = int(seconds)
+        pieces: list[str] = []
+        for unit_seconds, label in units:
+            if remaining >= unit_seconds:
+                value, remaining = divmod(remaining, unit_seconds)
+                if len(pieces) + 1 == max_units and 2 * remaining > unit_seconds:
+                    value += 1
+                pieces.append(f'{value}{label[value == 1]}')
+                if len(pieces) == max_units:
+                    break
+        return joiner.join(pieces)
+
+    return format_duration
+
+
 def parse_duration(input_str: str) -> int:
     """
     Parses a human-written duration string into seconds.
@@ -216,70 +797,979 @@ def parse_duration(input_str: str) -> int:
         raise ValueError('Negative durations are not allowed')
 
     # Handle colon notation (h:mm or h:mm:ss)
-    colon_match = re.match(r'^(\d+):(\d{1,2})(?::(\d{1,2}))?$', normalized)
+    colon_pattern, token_pattern = _duration_grammar()
+    colon_match = colon_pattern.match(normalized)
     if colon_match:
         hours = int(colon_match.group(1))
         minutes = int(colon_match.group(2))
         seconds = int(colon_match.group(3)) if colon_match.group(3) else 0
         return hours * SECONDS_PER_HOUR + minutes * SECONDS_PER_MINUTE + seconds
 
-    # Unit patterns - use word boundary or lookahead for concatenated units like "2h30m"
-    unit_patterns = [
-        (r'(\d+(?:\.\d+)?)\s*(?:weeks?|wks?|w)(?:\b|(?=\d|$))', SECONDS_PER_WEEK),
-        (r'(\d+(?:\.\d+)?)\s*(?:days?|d)(?:\b|(?=\d|$))', SECONDS_PER_DAY),
-        (r'(\d+(?:\.\d+)?)\s*(?:hours?|hrs?|h)(?:\b|(?=\d|$))', SECONDS_PER_HOUR),
-        (r'(\d+(?:\.\d+)?)\s*(?:minutes?|mins?|m)(?:\b|(?=\d|$))', SECONDS_PER_MINUTE),
-        (r'(\d+(?:\.\d+)?)\s*(?:seconds?|secs?|s)(?:\b|(?=\d|$))', 1),
-    ]
-
+    # Single left-to-right pass over number/unit pairs. Each unit may appear
+    # at most once and every number must carry a unit, so inputs such as
+    # "1h 2h", "1h30" or "1.5.5h" are rejected rather than guessed at.
     total_seconds = 0.0
-    found_any = False
-
-    for pattern, unit_seconds in unit_patterns:
-        for match in re.finditer(pattern, normalized, re.IGNORECASE):
-            value = float(match.group(1))
-            if value < 0:
-                raise ValueError('Negative durations are not allowed')
-            total_seconds += value * unit_seconds
-            found_any = True
-
-    if not found_any:
+    seen = 0
+
+    for match in token_pattern.finditer(normalized):
+        unit = match.lastindex or _DURATION_STRAY  # a token always closes a unit group
+        if unit == _DURATION_STRAY:
+            raise ValueError(f'Number without a unit in duration: {input_str}')
+        if match.group(1) is not None:
+            raise ValueError('Negative durations are not allowed')
+        if seen & (1 << unit):
+            raise ValueError(f'Duplicate {_DURATION_UNIT_NAMES[unit]} in duration: {input_str}')
+        seen |= 1 << unit
+        total_seconds += float(match.group(2)) * _DURATION_UNIT_SECONDS[unit]
+
+    if not seen:
         raise ValueError(f'Cannot parse duration: {input_str}')
 
     return round(total_seconds)
 
 
-def _get_utc_date_components(timestamp: int) -> dict:
+class CacheInfo(_FrozenRecord):
+    """Snapshot of a DurationCache's counters."""
+    __slots__ = ('hits', 'misses', 'evictions', 'maxsize', 'currsize')
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    def __init__(self, hits: int, misses: int, evictions: int, maxsize: int, currsize: int):
+        set_field = object.__setattr__
+        set_field(self, 'hits', hits)
+        set_field(self, 'misses', misses)
+        set_field(self, 'evictions', evictions)
+        set_field(self, 'maxsize', maxsize)
+        set_field(self, 'currsize', currsize)
+
+
+class DurationCache:
+    """
+    Opt-in bounded LRU memoization for parse_duration() and duration().
+
+    Results are keyed on the input string, or on the seconds value together
+    with the DurationOptions, so equal options hit the same entry.
+    Inputs that raise ValueError are re-raised and never stored. Safe to
+    share between threads.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1')
+        import threading
+        from collections import OrderedDict
+
+        self.maxsize = maxsize
+        self._entries: OrderedDict[Hashable, int | str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse_duration(self, input_str: str) -> int:
+        """Cached parse_duration()."""
+        key = ('parse_duration', input_str)
+        cached = self._get(key)
+        if isinstance(cached, int):
+            return cached
+        result = parse_duration(input_str)
+        self._put(key, result)
+        return result
+
+    def duration(self, seconds: int | float, options: DurationOptions | None = None) -> str:
+        """Cached duration()."""
+        opts = options or DurationOptions()
+        key = ('duration', seconds, opts)
+        cached = self._get(key)
+        if isinstance(cached, str):
+            return cached
+        result = duration(seconds, opts)
+        self._put(key, result)
+        return result
+
+    def cache_info(self) -> CacheInfo:
+        """Returns hit/miss/eviction counters and the current size."""
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._evictions, self.maxsize, len(self._entries))
+
+    def cache_clear(self) -> None:
+        """Drops every entry and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = self._misses = self._evictions = 0
+
+    def _get(self, key: Hashable) -> int | str | None:
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            return result
+
+    def _put(self, key: Hashable, result: int | str) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[list]:
+    """Groups items into lists of at most size, preserving order."""
+    chunk: list = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _ordered_map(func: Callable[..., object], tasks: Iterable, workers: int) -> Iterator:
+    """
+    Yields func(task) for every task, in order.
+
+    With workers > 1 the calls run in a process pool that keeps at most
+    2 * workers tasks in flight, so arbitrarily long task streams use
+    constant memory.
+    """
+    if workers <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+
+    from collections import deque
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque = deque()
+        for task in tasks:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class ParseFailure(_FrozenRecord):
+    """Stands in for an input that parse_duration_many() or parse_duration_lines() could not parse."""
+    __slots__ = ('input', 'message')
+    input: object
+    message: str
+
+    def __init__(self, input: object, message: str):
+        object.__setattr__(self, 'input', input)
+        object.__setattr__(self, 'message', message)
+
+
+def _parse_duration_chunk(chunk: list) -> list[int | ParseFailure]:
+    """Parses one chunk, turning per-item errors into ParseFailure values."""
+    results: list[int | ParseFailure] = []
+    for text in chunk:
+        if not isinstance(text, str):
+            results.append(ParseFailure(text, f'Expected a string, got {type(text).__name__}'))
+            continue
+        try:
+            results.append(parse_duration(text))
+        except ValueError as e:
+            results.append(ParseFailure(text, str(e)))
+    return results
+
+
+def parse_duration_many(
+    inputs: Iterable[str],
+    workers: int = 1,
+    chunksize: int = 10_000,
+) -> Iterator[int | ParseFailure]:
+    """
+    Parses many duration strings, optionally across worker processes.
+
+    Results are streamed lazily in input order. Inputs are read in chunks of
+    chunksize and at most 2 * workers chunks are in flight, so memory stays
+    flat however long the input is.
+
+    Args:
+        inputs: Duration strings (any iterable, e.g. an open file's lines)
+        workers: Number of worker processes; 1 parses in the calling process
+        chunksize: Inputs sent to a worker at a time
+
+    Returns:
+        Iterator of seconds for each parsed input, or a ParseFailure for invalid ones
+    """
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+    chunks = _ordered_map(_parse_duration_chunk, _chunked(inputs, chunksize), workers)
+    return (result for results in chunks for result in results)
+
+
+def _parse_duration_text(raw: bytes) -> int | ParseFailure:
+    """parse_duration() of one raw line, decoded as UTF-8, with errors returned as ParseFailure."""
+    try:
+        text = raw.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return ParseFailure(raw, f'Invalid UTF-8 in duration: {e.reason}')
+    return _parse_duration_line(text)
+
+
+def _parse_duration_line(text: str) -> int | ParseFailure:
+    """parse_duration() of one line without its '\n', ignoring a trailing '\r', with errors returned as ParseFailure."""
+    if text.endswith('\r'):
+        text = text[:-1]
+    try:
+        return parse_duration(text)
+    except ValueError as e:
+        return ParseFailure(text, str(e))
+
+
+def _scan_duration_lines(buffer) -> Iterator[tuple[int, int | ParseFailure]]:
+    """Parses every line of a bytes-like buffer; see parse_duration_lines()."""
+    import re
+
+    colon_pattern, token_pattern, unusual = _duration_bytes_grammar()
+    find_newline = re.compile(b'\n').search  # works on every buffer type, unlike .find()
+    match_colon, find_tokens, find_unusual = colon_pattern.match, token_pattern.finditer, unusual.search
+    unit_seconds = _DURATION_UNIT_SECONDS
+    stray = _DURATION_STRAY
+    size = len(buffer)
+    pos = 0
+    line_no = 0
+
+    # Copy one block of whole lines at a time so memory stays bounded while
+    # split() and strip() still run in C
+    while pos < size:
+        newline = find_newline(buffer, pos + _DURATION_LINES_BLOCK)
+        stop = size if newline is None else newline.end()
+        block = bytes(buffer[pos:stop])
+        pos = stop
+        lines = block.split(b'\n')
+        if block.endswith(b'\n'):
+            lines.pop()
+        plain = find_unusual(block) is None
+
+        for raw in lines:
+            line_no += 1
+            text = raw.strip()
+            value = None
+
+            # Fast path over the bytes; anything it cannot settle (errors,
+            # negatives, unusual bytes) is re-parsed as text for the exact result
+            if text and text[0] != 45 and (plain or find_unusual(raw) is None):  # 45: '-'
+                colon = match_colon(text) if b':' in text else None
+                if colon is not None:
+                    hours, minutes, seconds = colon.groups()
+                    value = int(hours) * SECONDS_PER_HOUR + int(minutes) * SECONDS_PER_MINUTE + int(seconds or 0)
+                else:
+                    total = 0.0
+                    seen = 0
+                    for token in find_tokens(text):
+                        unit = token.lastindex or stray
+                        sign, number = token.group(1, 2)
+                        if unit == stray or sign is not None or seen & (1 << unit):
+                            seen = 0
+                            break
+                        seen |= 1 << unit
+                        total += float(number) * unit_seconds[unit]
+                    if seen:
+                        value = round(total)
+
+            yield line_no, _parse_duration_text(raw) if value is None else value
+
+
+def _mappable_fileno(source) -> int | None:
+    """
+    The descriptor of a plain file object read from its start, or None.
+
+    Only text and buffered wrappers over io.FileIO qualify: wrappers such as
+    GzipFile report the descriptor of bytes they transform, and a stream
+    already partly read must continue where it stands.
+    """
+    import io
+
+    raw = source
+    if isinstance(raw, io.TextIOWrapper):
+        raw = raw.buffer
+    if isinstance(raw, (io.BufferedReader, io.BufferedRandom)):
+        raw = raw.raw
+    if not isinstance(raw, io.FileIO):
+        return None
+    try:
+        return raw.fileno() if source.tell() == 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def _scan_duration_file(source) -> Iterator[tuple[int, int | ParseFailure]]:
+    """
+    Memory-maps a file object and parses its lines, unmapping it when the iterator finishes or is closed.
+
+    Holds the file object itself, not just its descriptor, so the file stays
+    open for as long as the iterator lives. Streams that cannot be mapped
+    (pipes, terminals, compressed files) are read line by line instead.
+    """
+    import mmap
+
+    fileno = _mappable_fileno(source)
+    mapped = None
+    if fileno is not None:
+        try:
+            mapped = mmap.mmap(fileno, 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return  # empty files cannot be mapped
+        except OSError:
+            pass  # pipes and character devices
+    if mapped is None:
+        yield from _scan_duration_stream(source)
+        return
+    try:
+        yield from _scan_duration_lines(mapped)
+    finally:
+        try:
+            mapped.close()
+        except BufferError:
+            pass  # still exported to a caller's memoryview; unmapped when that is released
+
+
+def _scan_duration_path(path) -> Iterator[tuple[int, int | ParseFailure]]:
+    """Opens and memory-maps a file by path; see _scan_duration_file()."""
+    with open(path, 'rb') as f:
+        yield from _scan_duration_file(f)
+
+
+def _scan_duration_stream(stream) -> Iterator[tuple[int, int | ParseFailure]]:
+    """
+    Parses lines read one at a time from a stream that cannot be mapped, binary or text.
+
+    Lines end at '\n' only, as in a mapped file. Universal newlines would
+    also end a line at a lone '\r', so a text stream not yet read from is
+    read through its binary buffer, like a file. Other text streams have the
+    pieces their iteration yields joined up to the next '\n'; one already
+    partly read cannot give back what it buffered, so it is continued as text.
+    """
+    import io
+
+    buffer = getattr(stream, 'buffer', None)
+    if buffer is not None:
+        try:
+            stream.reconfigure(newline='')  # refused once the stream has been read from
+        except (AttributeError, io.UnsupportedOperation):
+            pass
+        else:
+            stream = buffer
+    line_no = 0
+    pending: list[str] = []
+    for raw in stream:
+        if not isinstance(raw, str):
+            line_no += 1
+            for _, value in _scan_duration_lines(raw):
+                yield line_no, value
+            continue
+        if not raw.endswith('\n'):
+            pending.append(raw)  # ended by a lone '\r', or the last line
+            continue
+        line_no += 1
+        if pending:
+            raw = ''.join(pending) + raw
+            pending.clear()
+        yield line_no, _parse_duration_line(raw[:-1])
+    if pending:
+        yield line_no + 1, _parse_duration_line(''.join(pending))
+
+
+def parse_duration_lines(source) -> Iterator[tuple[int, int | ParseFailure]]:
+    """
+    Parses one duration per line of a file or buffer, lazily, without decoding every line.
+
+    Files are memory-mapped and scanned as bytes with the parse_duration()
+    grammar compiled for bytes, so memory stays flat however large the
+    input is. Each result matches parse_duration() on that line exactly,
+    with errors as ParseFailure values carrying the line text and message.
+    Lines end at b'\\n'; a trailing '\\r' and surrounding whitespace are
+    ignored, and a blank line is a failure like any other unparseable input.
+
+    Args:
+        source: A file path, a bytes-like buffer (bytes, bytearray,
+            memoryview, mmap), or a file object. Files on disk opened
+            with open() and not yet read from are memory-mapped; other
+            streams (pipes, sys.stdin, GzipFile) are read line by line.
+
+    Returns:
+        Iterator of (line_no, seconds or ParseFailure), with line_no counting from 1
+    """
+    import mmap
+    import os
+
+    if isinstance(source, (str, os.PathLike)):
+        return _scan_duration_path(source)
+    if isinstance(source, (bytes, bytearray, memoryview, mmap.mmap)):
+        return _scan_duration_lines(source)
+    if hasattr(source, 'getbuffer'):  # io.BytesIO
+        return _scan_duration_lines(source.getbuffer())
+    return _scan_duration_file(source)
+
+
+class _CivilDate(_FrozenRecord):
+    """UTC calendar date of a day number."""
+    __slots__ = (
+        'year',
+        'month',  # 0-indexed for consistency with MONTHS array
+        'day',
+        'weekday',  # Sunday=0, matching WEEKDAYS
+    )
+    year: int
+    month: int
+    day: int
+    weekday: int
+
+    def __init__(self, year: int, month: int, day: int, weekday: int):
+        set_field = object.__setattr__
+        set_field(self, 'year', year)
+        set_field(self, 'month', month)
+        set_field(self, 'day', day)
+        set_field(self, 'weekday', weekday)
+
+
+# Day numbers (days since 1970-01-01) of the first and last dates datetime supports
+_MIN_DAY = -719162  # 0001-01-01
+_MAX_DAY = 2932896  # 9999-12-31
+
+
+@lru_cache(maxsize=4096)
+def _civil_from_days(days: int) -> _CivilDate:
+    """
+    Converts days since the Unix epoch to a proleptic Gregorian date.
+
+    Integer-only (Howard Hinnant's civil_from_days), cached by day number
+    because rendered timestamps tend to fall on a small set of days.
+    """
+    if not _MIN_DAY <= days <= _MAX_DAY:
+        raise ValueError(f'Timestamp out of range: day {days} since epoch')
+
+    # Shift the epoch to 0000-03-01 so leap days fall at the end of each year
+    z = days + 719468
+    era = z // 146097
+    day_of_era = z - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_from_march = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_from_march + 2) // 5 + 1
+    month = month_from_march + 2 if month_from_march < 10 else month_from_march - 10
+    year = year_of_era + era * 400 + (month < 2)
+    # 1970-01-01 was a Thursday
+    return _CivilDate(year, month, day, (days + 4) % 7)
+
+
+def _get_utc_date_components(timestamp: int) -> _CivilDate:
     """Gets UTC date components from a Unix timestamp."""
-    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    return {
-        'year': dt.year,
-        'month': dt.month - 1,  # 0-indexed for consistency with MONTHS array
-        'day': dt.day,
-        'weekday': (dt.weekday() + 1) % 7,  # Convert Monday=0 to Sunday=0
-    }
+    return _civil_from_days(timestamp // SECONDS_PER_DAY)
 
 
 def _get_start_of_day_utc(timestamp: int) -> int:
     """Gets the start of day (midnight UTC) for a Unix timestamp."""
-    dt = datetime.fromtimestamp(timestamp, tz=timezone.utc)
-    midnight = datetime(dt.year, dt.month, dt.day, tzinfo=timezone.utc)
-    return int(midnight.timestamp())
+    return timestamp - timestamp % SECONDS_PER_DAY
+
+
+# Locales: registered definitions compiled on first use into immutable lookup tables
+
+def _plural_one_other(n: int) -> str:
+    """English, German, Dutch, Spanish, Italian, Swedish, ...: 1 is singular."""
+    return 'one' if n == 1 else 'other'
+
+
+def _plural_zero_one_other(n: int) -> str:
+    """French, Brazilian Portuguese: 0 and 1 are singular."""
+    return 'one' if n < 2 else 'other'
+
+
+def _plural_east_slavic(n: int) -> str:
+    """Russian, Ukrainian, Belarusian: 1, 21, 31 / 2-4, 22-24 / everything else."""
+    if n % 10 == 1 and n % 100 != 11:
+        return 'one'
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return 'few'
+    return 'many'
+
+
+def _plural_polish(n: int) -> str:
+    """Polish: 1 / 2-4, 22-24 / everything else."""
+    if n == 1:
+        return 'one'
+    if 2 <= n % 10 <= 4 and not 12 <= n % 100 <= 14:
+        return 'few'
+    return 'many'
+
+
+def _plural_czech(n: int) -> str:
+    """Czech, Slovak: 1 / 2-4 / everything else."""
+    if n == 1:
+        return 'one'
+    return 'few' if 2 <= n <= 4 else 'other'
+
+
+def _plural_other(n: int) -> str:
+    """Japanese, Chinese, Korean, Vietnamese, ...: no plural forms."""
+    return 'other'
+
+
+# Built-in plural rules a locale definition can name instead of passing a function
+_PLURAL_RULES: dict[str, Callable[[int], str]] = {
+    'one_other': _plural_one_other,
+    'zero_one_other': _plural_zero_one_other,
+    'east_slavic': _plural_east_slavic,
+    'polish': _plural_polish,
+    'czech': _plural_czech,
+    'other': _plural_other,
+}
+
+# The built-in English locale. Other locales supply the same keys;
+# 'plural', 'compact_units', the separators and 'date_months' are optional.
+_EN_LOCALE: Mapping = {
+    'plural': 'one_other',
+    # Per unit, one template per plural category ('other' is required)
+    'units': {
+        'year': {'one': '{n} year', 'other': '{n} years'},
+        'month': {'one': '{n} month', 'other': '{n} months'},
+        'day': {'one': '{n} day', 'other': '{n} days'},
+        'hour': {'one': '{n} hour', 'other': '{n} hours'},
+        'minute': {'one': '{n} minute', 'other': '{n} minutes'},
+        'second': {'one': '{n} second', 'other': '{n} seconds'},
+    },
+    'compact_units': {
+        'year': '{n}y', 'month': '{n}mo', 'day': '{n}d', 'hour': '{n}h', 'minute': '{n}m', 'second': '{n}s',
+    },
+    'duration_separator': ', ',
+    'compact_separator': ' ',
+    'just_now': 'just now',
+    'past': '{} ago',
+    'future': 'in {}',
+    'weekdays': WEEKDAYS,
+    'months': MONTHS,
+    'today': 'Today',
+    'yesterday': 'Yesterday',
+    'tomorrow': 'Tomorrow',
+    'last_weekday': 'Last {weekday}',
+    'next_weekday': 'This {weekday}',
+    'date': '{month} {day}',
+    'date_year': '{month} {day}, {year}',
+    'range_same_day': '{month} {day}, {year}',
+    'range_same_month': '{month} {start_day}–{end_day}, {year}',
+    'range_same_year': '{start_month} {start_day} – {end_month} {end_day}, {year}',
+    'range': '{start_month} {start_day}, {start_year} – {end_month} {end_day}, {end_year}',
+}
+_LOCALE_REQUIRED_KEYS = frozenset(_EN_LOCALE) - {
+    'plural', 'compact_units', 'duration_separator', 'compact_separator',
+}
+
+_locale_definitions: dict[str, Mapping | Callable[[], Mapping]] = {'en': _EN_LOCALE}
+_compiled_locales: dict[str, _Locale] = {}
+
+# Bound on each locale's output cache of formatted counts ("5 minutes", "3h")
+# and date ranges
+_LOCALE_CACHE_SIZE = 4096
+
+
+# Fields available to date_range templates, in the positional order they are compiled to
+_RANGE_FIELDS = ('start_month', 'start_day', 'start_year', 'end_month', 'end_day', 'end_year', 'month', 'day', 'year')
+
+
+def _positional(template: str, fields: tuple[str, ...]) -> str:
+    """Compiles a template's named fields ("{month} {day}") to indexes ("{0} {1}") for fast format(*args)."""
+    from string import Formatter as TemplateParser
+
+    compiled = []
+    for literal, field, spec, conversion in TemplateParser().parse(template):
+        compiled.append(literal.replace('{', '{{').replace('}', '}}'))
+        if field is None:
+            continue
+        if field not in fields:
+            raise ValueError(f'Unknown field {{{field}}} in locale template {template!r}')
+        compiled.append('{' + str(fields.index(field)))
+        if conversion:
+            compiled.append('!' + conversion)
+        if spec:
+            compiled.append(':' + spec)
+        compiled.append('}')
+    return ''.join(compiled)
+
+
+class _Locale:
+    """
+    One locale compiled for lookup: timeago rows, weekday and month-day labels
+    are precomputed strings, and formatted unit counts and date ranges are
+    cached on first use.
+    """
+
+    __slots__ = (
+        'code', '_plural', '_units', '_compact_units', '_separator', '_compact_separator',
+        '_past', '_future', '_timeago_past', '_timeago_future', '_today', '_yesterday', '_tomorrow',
+        '_last_weekday', '_next_weekday', '_month_days', '_months', '_date_year', '_ranges', '_cache',
+    )
 
+    def __init__(self, code: str, definition: Mapping):
+        missing = _LOCALE_REQUIRED_KEYS - definition.keys()
+        if missing:
+            raise ValueError(f'Locale {code!r} is missing {", ".join(sorted(missing))}')
+        plural = definition.get('plural', 'one_other')
+        if isinstance(plural, str):
+            if plural not in _PLURAL_RULES:
+                raise ValueError(f'Unknown plural rule {plural!r} for locale {code!r}')
+            plural = _PLURAL_RULES[plural]
+        units = definition['units']
+        compact_units = definition.get('compact_units', _EN_LOCALE['compact_units'])
+        weekdays = tuple(definition['weekdays'])
+        months = tuple(definition['months'])
+        date_months = tuple(definition.get('date_months', months))
+        if len(weekdays) != 7 or len(months) != 12 or len(date_months) != 12:
+            raise ValueError(f'Locale {code!r} needs 7 weekdays and 12 months')
+
+        self.code = code
+        self._plural = plural
+        # Indexed like _DURATION_PARTS: year, month, day, hour, minute, second
+        self._units = tuple(
+            {category: _positional(template, ('n',)) for category, template in units[part[0]].items()}
+            for part in _DURATION_PARTS
+        )
+        if any('other' not in forms for forms in self._units):
+            raise ValueError(f'Locale {code!r} needs an "other" form for every unit')
+        self._compact_units = tuple(_positional(compact_units[part[0]], ('n',)) for part in _DURATION_PARTS)
+        self._separator = definition.get('duration_separator', ', ')
+        self._compact_separator = definition.get('compact_separator', ' ')
+        self._cache: dict[tuple, str] = {}
+
+        self._past = definition['past']
+        self._future = definition['future']
+        just_now = definition['just_now']
+        unit_index = {part[0]: index for index, part in enumerate(_DURATION_PARTS)}
+        counts = [None if row is None else self.count(unit_index[row[0]], row[1]) for row in _TIMEAGO_ROWS]
+        self._timeago_past = tuple(just_now if c is None else self._past.format(c) for c in counts)
+        self._timeago_future = tuple(just_now if c is None else self._future.format(c) for c in counts)
+
+        self._today = definition['today']
+        self._yesterday = definition['yesterday']
+        self._tomorrow = definition['tomorrow']
+        last_weekday = _positional(definition['last_weekday'], ('weekday',))
+        next_weekday = _positional(definition['next_weekday'], ('weekday',))
+        self._last_weekday = tuple(last_weekday.format(name) for name in weekdays)
+        self._next_weekday = tuple(next_weekday.format(name) for name in weekdays)
+        # Index [month][day]; day 0 is unused
+        date = _positional(definition['date'], ('month', 'day'))
+        self._month_days = tuple(('',) + tuple(date.format(name, day) for day in range(1, 32)) for name in date_months)
+        self._months = date_months
+        self._date_year = _positional(definition['date_year'], ('month', 'day', 'year'))
+        self._ranges = tuple(
+            _positional(definition[key], _RANGE_FIELDS)
+            for key in ('range_same_day', 'range_same_month', 'range_same_year', 'range')
+        )
+
+    def __repr__(self) -> str:
+        return f'<locale {self.code}>'
+
+    def count(self, unit: int, n: int, compact: bool = False) -> str:
+        """A number with its unit word ("5 minutes", "5m"), unit indexed as in _DURATION_PARTS."""
+        key = (unit, n, compact)
+        text = self._cache.get(key)
+        if text is None:
+            if compact:
+                template = self._compact_units[unit]
+            else:
+                forms = self._units[unit]
+                template = forms.get(self._plural(n)) or forms['other']
+            text = self._store(key, template.format(n))
+        return text
+
+    def _store(self, key: tuple, text: str) -> str:
+        if len(self._cache) >= _LOCALE_CACHE_SIZE:
+            self._cache.clear()
+        self._cache[key] = text
+        return text
+
+    def timeago(self, diff: int) -> str:
+        """Same as _timeago_from_diff(), in this locale."""
+        if diff >= 0:
+            if diff < _TIMEAGO_TABLE_END:
+                return self._timeago_past[bisect_right(_TIMEAGO_BOUNDS, diff) - 1]
+            return self._past.format(self.count(0, _round_half_up(diff / SECONDS_PER_YEAR)))
+        abs_diff = -diff
+        if abs_diff < _TIMEAGO_TABLE_END:
+            return self._timeago_future[bisect_right(_TIMEAGO_BOUNDS, abs_diff) - 1]
+        return self._future.format(self.count(0, _round_half_up(abs_diff / SECONDS_PER_YEAR)))
+
+    def duration(self, seconds: int | float, compact: bool, max_units: int) -> str:
+        """Same as duration() for non-negative seconds, in this locale."""
+        if seconds == 0:
+            return self.count(len(_DURATION_PARTS) - 1, 0, compact)
+        parts = _duration_parts(int(seconds), max_units)
+        separator = self._compact_separator if compact else self._separator
+        return separator.join(self.count(index, value, compact) for index, value in parts)
+
+    def near_day(self, day_diff: int, weekday: int) -> str:
+        """Label of a day within six days of the reference day."""
+        if day_diff == 0:
+            return self._today
+        if day_diff == -1:
+            return self._yesterday
+        if day_diff == 1:
+            return self._tomorrow
+        return self._last_weekday[weekday] if day_diff < 0 else self._next_weekday[weekday]
+
+    def date(self, date: _CivilDate, with_year: bool) -> str:
+        if with_year:
+            return self._date_year.format(self._months[date.month], date.day, date.year)
+        return self._month_days[date.month][date.day]
+
+    def human_day(self, days: int, ref_days: int, ref_year: int) -> str:
+        """human_date() label of local day number ``days`` against ``ref_days``."""
+        day_diff = days - ref_days
+        if -6 <= day_diff <= 6 and _MIN_DAY <= days <= _MAX_DAY:
+            return self.near_day(day_diff, (days + 4) % 7)
+        date = _civil_from_days(days)
+        return self.date(date, date.year != ref_year)
+
+    def date_range(self, start_day: int, end_day: int) -> str:
+        """date_range() text for two ordered local day numbers."""
+        key = (start_day, end_day)
+        text = self._cache.get(key)
+        if text is not None:
+            return text
+        start = _civil_from_days(start_day)
+        end = _civil_from_days(end_day)
+        if start_day == end_day:
+            template = self._ranges[0]
+        elif start.year == end.year:
+            template = self._ranges[1] if start.month == end.month else self._ranges[2]
+        else:
+            template = self._ranges[3]
+        start_month = self._months[start.month]
+        return self._store(key, template.format(
+            start_month, start.day, start.year, self._months[end.month], end.day, end.year,
+            start_month, start.day, start.year,
+        ))
+
+
+def register_locale(code: str, definition: Mapping | Callable[[], Mapping]) -> None:
+    """
+    Registers (or replaces) a locale for the ``locale`` argument of the formatting functions.
+
+    The definition is compiled into lookup tables the first time the locale
+    is used, so registering many locales costs nothing up front. Pass a
+    zero-argument callable to defer loading the data itself (e.g. reading
+    a JSON file) until then too.
 
-def human_date(timestamp: Timestamp, reference: Timestamp | None = None) -> str:
+    Args:
+        code: Locale code, e.g. "de" or "pt-BR". "pt-BR" falls back to "pt"
+            when only the language is registered.
+        definition: Mapping with the keys of the built-in English locale
+            (see usage.md), or a callable returning one
+
+    Raises:
+        ValueError: On first use, if the definition is incomplete
+    """
+    _locale_definitions[code] = definition
+    # Drop the code and any regional codes ("de-AT") compiled through it as their fallback
+    for compiled in [c for c in _compiled_locales if c == code or _locale_language(c) == code]:
+        del _compiled_locales[compiled]
+
+
+def available_locales() -> list[str]:
+    """Codes of every registered locale, compiled or not."""
+    return sorted(_locale_definitions)
+
+
+def _locale_language(code: str) -> str:
+    """The language part of a locale code ("pt-BR", "pt_BR" -> "pt"), used as its fallback."""
+    return code.replace('_', '-').split('-')[0]
+
+
+def _get_locale(code: str) -> _Locale:
+    """The compiled locale for a code, compiling it on first use."""
+    locale = _compiled_locales.get(code)
+    if locale is not None:
+        return locale
+
+    key = code
+    if key not in _locale_definitions:
+        key = _locale_language(code)
+        if key not in _locale_definitions:
+            raise ValueError(f'Unknown locale: {code}')
+    definition = _locale_definitions[key]
+    if callable(definition):
+        definition = definition()
+    locale = _compiled_locales[code] = _Locale(code, definition)
+    return locale
+
+
+# Time zones: local wall-clock seconds from a per-zone index of UTC-offset transitions
+
+# Transitions between 1900 and 2200 are indexed in slabs of 2**27 seconds
+# (~4 years), each built on first use; other timestamps convert through
+# datetime one at a time
+_TZ_INDEX_START = -2208988800  # 1900-01-01
+_TZ_INDEX_END = 7258118400  # 2200-01-01
+_TZ_SLAB_BITS = 27
+# utcoffset() is sampled this often while building a slab. Weekly sampling
+# missed Africa/Freetown's four-day offset of September 1939; daily finds
+# every transition in the tzdata between 1900 and 2200
+_TZ_PROBE_STEP = SECONDS_PER_DAY
+
+
+class _ZoneIndex:
+    """
+    UTC offsets of one time zone as sorted transition times.
+
+    Transitions are found by probing the zone's own utcoffset() daily and
+    bisecting to the exact second of each change, so any tzinfo works and
+    zoneinfo zones read nothing but the system tzdata. Only an offset change
+    that reverts within a day would be missed; the tzdata has none. Lookups
+    are then a binary search instead of a datetime per call.
+    """
+
+    __slots__ = ('tz', 'fixed', '_slabs')
+
+    def __init__(self, tz: tzinfo, fixed: int | None = None):
+        self.tz = tz
+        self.fixed = fixed
+        self._slabs: dict[int, tuple[list[int], list[int]]] = {}
+
+    def offset(self, timestamp: int) -> int:
+        """UTC offset in seconds at a Unix timestamp."""
+        if self.fixed is not None:
+            return self.fixed
+        if not _TZ_INDEX_START <= timestamp < _TZ_INDEX_END:
+            return self._probe(timestamp)
+        slab = (timestamp - _TZ_INDEX_START) >> _TZ_SLAB_BITS
+        starts, offsets = self._slabs.get(slab) or self._build_slab(slab)
+        return offsets[bisect_right(starts, timestamp) - 1]
+
+    def transitions(self, lo: int, hi: int) -> tuple[list[int], list[int]] | None:
+        """
+        Sorted (start times, offsets) covering lo..hi inclusive, or None if that
+        leaves the indexed years.
+        """
+        if self.fixed is not None:
+            return [lo], [self.fixed]
+        if not _TZ_INDEX_START <= lo <= hi < _TZ_INDEX_END:
+            return None
+        starts: list[int] = []
+        offsets: list[int] = []
+        first = (lo - _TZ_INDEX_START) >> _TZ_SLAB_BITS
+        last = (hi - _TZ_INDEX_START) >> _TZ_SLAB_BITS
+        for slab in range(first, last + 1):
+            slab_starts, slab_offsets = self._slabs.get(slab) or self._build_slab(slab)
+            starts += slab_starts
+            offsets += slab_offsets
+        return starts, offsets
+
+    def _probe(self, timestamp: int) -> int:
+        try:
+            offset = datetime.fromtimestamp(timestamp, self.tz).utcoffset()
+        except (OverflowError, OSError, ValueError):
+            raise ValueError(f'Timestamp out of range: {timestamp}') from None
+        return int(offset.total_seconds()) if offset is not None else 0
+
+    def _build_slab(self, slab: int) -> tuple[list[int], list[int]]:
+        probe = self._probe
+        lo = _TZ_INDEX_START + (slab << _TZ_SLAB_BITS)
+        last = lo + (1 << _TZ_SLAB_BITS) - 1
+        starts = [lo]
+        offsets = [probe(lo)]
+
+        t = lo
+        while t < last:
+            end = min(t + _TZ_PROBE_STEP, last)
+            end_offset = probe(end)
+            while end_offset != offsets[-1]:
+                # Bisect (t, end] for the first second with a new offset
+                before, after = t, end
+                while after - before > 1:
+                    mid = (before + after) // 2
+                    if probe(mid) == offsets[-1]:
+                        before = mid
+                    else:
+                        after = mid
+                starts.append(after)
+                offsets.append(probe(after))
+                t = after
+            t = end
+
+        self._slabs[slab] = starts, offsets
+        return starts, offsets
+
+
+@lru_cache(maxsize=64)
+def _zone_index(tz: tzinfo | str | None) -> _ZoneIndex | None:
+    """Resolves a tz argument to its shared index; None stands for UTC."""
+    if tz is None:
+        return None
+    if isinstance(tz, str):
+        from zoneinfo import ZoneInfo
+
+        try:
+            tz = ZoneInfo(tz)
+        except (LookupError, ValueError):
+            raise ValueError(f'Unknown time zone: {tz}') from None
+    if not isinstance(tz, tzinfo):
+        raise TypeError(f'Invalid time zone type: {type(tz).__name__}')
+    if isinstance(tz, timezone):
+        fixed = int(tz.utcoffset(None).total_seconds())
+        return _ZoneIndex(tz, fixed) if fixed else None
+    return _ZoneIndex(tz)
+
+
+def _numpy_local_seconds(np, zone: _ZoneIndex, seconds):
+    """Shifts an int64 array of Unix seconds to local wall-clock seconds, or None if unindexed."""
+    if not seconds.size:
+        return seconds
+    transitions = zone.transitions(int(seconds.min()), int(seconds.max()))
+    if transitions is None:
+        return None
+    starts, offsets = (np.array(values, dtype=np.int64) for values in transitions)
+    return seconds + offsets[np.searchsorted(starts, seconds, side='right') - 1]
+
+
+def human_date(
+    timestamp: Timestamp,
+    reference: Timestamp | None = None,
+    tz: tzinfo | str | None = None,
+    locale: str | None = None,
+    unit: str = 's',
+) -> str:
     """
     Returns a contextual date string.
 
     Args:
         timestamp: Unix seconds, ISO 8601 string, or datetime object
         reference: Optional comparison time (defaults to timestamp)
+        tz: Time zone whose calendar days are compared: a tzinfo such as
+            ``timezone(timedelta(hours=-5))`` or ``ZoneInfo('Europe/Paris')``,
+            or an IANA key. Defaults to UTC.
+        locale: Optional registered locale code; defaults to English
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
 
     Returns:
         Contextual date string ("Today", "Yesterday", "Last Tuesday", "March 5", etc.)
     """
-    ts = _normalize_timestamp(timestamp)
-    ref = _normalize_timestamp(reference) if reference is not None else ts
+    if unit == 's':
+        ts = _normalize_timestamp(timestamp)
+        ref = _normalize_timestamp(reference) if reference is not None else ts
+    else:
+        ticks = _unit_ticks(unit)
+        ts = _normalize_ticks(timestamp, ticks)
+        ref = _normalize_ticks(reference, ticks) if reference is not None else ts
+
+    zone = _zone_index(tz) if tz is not None else None
+    if zone is not None:
+        ts += zone.offset(ts)
+        ref += zone.offset(ref)
+
+    if locale is not None:
+        ref_day = ref // SECONDS_PER_DAY
+        return _get_locale(locale).human_day(ts // SECONDS_PER_DAY, ref_day, _civil_from_days(ref_day).year)
 
     ts_date = _get_utc_date_components(ts)
     ref_date = _get_utc_date_components(ref)
@@ -302,55 +1792,1143 @@ def human_date(timestamp: Timestamp, reference: Timestamp | None = None) -> str:
 
     # Within past 7 days (but not yesterday)
     if -6 <= day_diff < -1:
-        return f'Last {WEEKDAYS[ts_date["weekday"]]}'
+        return f'Last {WEEKDAYS[ts_date.weekday]}'
 
     # Within next 7 days (but not tomorrow)
     if 1 < day_diff <= 6:
-        return f'This {WEEKDAYS[ts_date["weekday"]]}'
+        return f'This {WEEKDAYS[ts_date.weekday]}'
 
     # Same year
-    if ts_date['year'] == ref_date['year']:
-        return f'{MONTHS[ts_date["month"]]} {ts_date["day"]}'
+    if ts_date.year == ref_date.year:
+        return f'{MONTHS[ts_date.month]} {ts_date.day}'
 
     # Different year
-    return f'{MONTHS[ts_date["month"]]} {ts_date["day"]}, {ts_date["year"]}'
+    return f'{MONTHS[ts_date.month]} {ts_date.day}, {ts_date.year}'
 
 
-def date_range(start: Timestamp, end: Timestamp) -> str:
+def date_range(
+    start: Timestamp,
+    end: Timestamp,
+    tz: tzinfo | str | None = None,
+    locale: str | None = None,
+    unit: str = 's',
+) -> str:
     """
     Formats a date range with smart abbreviation.
 
     Args:
         start: Start timestamp
         end: End timestamp
+        tz: Time zone whose calendar dates are shown (tzinfo or IANA key); defaults to UTC
+        locale: Optional registered locale code; defaults to English
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
 
     Returns:
         Formatted date range string
     """
-    start_ts = _normalize_timestamp(start)
-    end_ts = _normalize_timestamp(end)
+    if unit == 's':
+        start_ts = _normalize_timestamp(start)
+        end_ts = _normalize_timestamp(end)
+    else:
+        ticks = _unit_ticks(unit)
+        start_ts = _normalize_ticks(start, ticks)
+        end_ts = _normalize_ticks(end, ticks)
+
+    return _date_range(
+        start_ts, end_ts,
+        _zone_index(tz) if tz is not None else None,
+        _get_locale(locale) if locale is not None else None,
+    )
+
 
+def _date_range(start_ts: int, end_ts: int, zone: _ZoneIndex | None, loc: _Locale | None) -> str:
+    """date_range() of two normalized timestamps; zone and loc default to UTC and English."""
     # Swap if start is after end
     if start_ts > end_ts:
         start_ts, end_ts = end_ts, start_ts
 
-    start_date = _get_utc_date_components(start_ts)
-    end_date = _get_utc_date_components(end_ts)
+    if zone is not None:
+        start_ts += zone.offset(start_ts)
+        end_ts += zone.offset(end_ts)
+
+    if loc is not None:
+        return loc.date_range(start_ts // SECONDS_PER_DAY, end_ts // SECONDS_PER_DAY)
+    return _date_range_days(start_ts // SECONDS_PER_DAY, end_ts // SECONDS_PER_DAY)
+
 
-    start_day_start = _get_start_of_day_utc(start_ts)
-    end_day_start = _get_start_of_day_utc(end_ts)
+def _date_range_days(start_day: int, end_day: int) -> str:
+    """date_range() text for two ordered day numbers, in English."""
+    start_date = _civil_from_days(start_day)
+    end_date = _civil_from_days(end_day)
 
     # Same day
-    if start_day_start == end_day_start:
-        return f'{MONTHS[start_date["month"]]} {start_date["day"]}, {start_date["year"]}'
+    if start_day == end_day:
+        return f'{MONTHS[start_date.month]} {start_date.day}, {start_date.year}'
 
     # Same month and year
-    if start_date['year'] == end_date['year'] and start_date['month'] == end_date['month']:
-        return f'{MONTHS[start_date["month"]]} {start_date["day"]}–{end_date["day"]}, {start_date["year"]}'
+    if start_date.year == end_date.year and start_date.month == end_date.month:
+        return f'{MONTHS[start_date.month]} {start_date.day}–{end_date.day}, {start_date.year}'
 
     # Same year, different months
-    if start_date['year'] == end_date['year']:
-        return f'{MONTHS[start_date["month"]]} {start_date["day"]} – {MONTHS[end_date["month"]]} {end_date["day"]}, {start_date["year"]}'
+    if start_date.year == end_date.year:
+        return f'{MONTHS[start_date.month]} {start_date.day} – {MONTHS[end_date.month]} {end_date.day}, {start_date.year}'
 
     # Different years
-    return f'{MONTHS[start_date["month"]]} {start_date["day"]}, {start_date["year"]} – {MONTHS[end_date["month"]]} {end_date["day"]}, {end_date["year"]}'
+    return f'{MONTHS[start_date.month]} {start_date.day}, {start_date.year} – {MONTHS[end_date.month]} {end_date.day}, {end_date.year}'
+
+
+def _numpy_civil_from_days(np, days):
+    """_civil_from_days() over an int64 array of in-range day numbers, as (year, month, day) arrays."""
+    z = days + 719468
+    era = z // 146097
+    day_of_era = z - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    month_from_march = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * month_from_march + 2) // 5 + 1
+    month = np.where(month_from_march < 10, month_from_march + 2, month_from_march - 10)
+    year = year_of_era + era * 400 + (month < 2)
+    return year, month, day
+
+
+@lru_cache(maxsize=None)
+def _english_ranges() -> tuple[str, ...]:
+    """The English date_range() templates compiled like _Locale._ranges, for the vectorized path."""
+    return tuple(
+        _positional(_EN_LOCALE[key], _RANGE_FIELDS)
+        for key in ('range_same_day', 'range_same_month', 'range_same_year', 'range')
+    )
+
+
+def _date_range_numpy(np, starts, ends, ticks: int, zone: _ZoneIndex | None, locale: _Locale | None) -> list[str] | None:
+    """
+    Vectorized date_range_many() over NumPy arrays.
+
+    Returns None if the arrays need the scalar path (see _numpy_seconds(),
+    unindexed time zones, or dates outside datetime's range).
+    """
+    start_seconds = _numpy_seconds(np, starts, ticks)
+    end_seconds = _numpy_seconds(np, ends, ticks)
+    if start_seconds is None or end_seconds is None:
+        return None
+    # Order each pair on UTC seconds first, as date_range() does
+    start_seconds, end_seconds = np.minimum(start_seconds, end_seconds), np.maximum(start_seconds, end_seconds)
+    if zone is not None:
+        start_seconds = _numpy_local_seconds(np, zone, start_seconds)
+        end_seconds = _numpy_local_seconds(np, zone, end_seconds)
+        if start_seconds is None or end_seconds is None:
+            return None
+    start_days = start_seconds // SECONDS_PER_DAY
+    end_days = end_seconds // SECONDS_PER_DAY
+    if start_days.size and not (
+        _MIN_DAY <= min(int(start_days.min()), int(end_days.min()))
+        and max(int(start_days.max()), int(end_days.max())) <= _MAX_DAY
+    ):
+        return None
+
+    # Format each distinct (start day, end day) pair once
+    span = _MAX_DAY - _MIN_DAY + 1
+    pairs, inverse = np.unique((start_days - _MIN_DAY) * span + (end_days - _MIN_DAY), return_inverse=True)
+    start_days, end_days = pairs // span + _MIN_DAY, pairs % span + _MIN_DAY
+    start_year, start_month, start_day = _numpy_civil_from_days(np, start_days)
+    end_year, end_month, end_day = _numpy_civil_from_days(np, end_days)
+    # Template index as in _Locale.date_range(): same day, same month, same year, otherwise
+    kinds = np.where(
+        start_year != end_year, 3,
+        np.where(start_month != end_month, 2, np.where(start_days != end_days, 1, 0)),
+    )
+
+    templates = _english_ranges() if locale is None else locale._ranges
+    months = MONTHS if locale is None else locale._months
+    labels = [
+        templates[kind].format(months[m1], d1, y1, months[m2], d2, y2, months[m1], d1, y1)
+        for kind, y1, m1, d1, y2, m2, d2 in zip(
+            kinds.tolist(), start_year.tolist(), start_month.tolist(), start_day.tolist(),
+            end_year.tolist(), end_month.tolist(), end_day.tolist(),
+        )
+    ]
+    return np.array(labels, dtype=object)[inverse.reshape(-1)].tolist()
+
+
+def date_range_many(
+    starts: Iterable[Timestamp],
+    ends: Iterable[Timestamp],
+    tz: tzinfo | str | None = None,
+    locale: str | None = None,
+    unit: str = 's',
+) -> list[str]:
+    """
+    Formats many date ranges from parallel start and end sequences.
+
+    Each distinct pair of calendar days is formatted once. NumPy arrays
+    convert every endpoint to a day number and calendar date in one
+    vectorized pass, choosing the same-day, same-month, same-year or
+    cross-year template per pair without building a datetime.
+
+    Args:
+        starts: Start timestamps: a sequence, integer array.array or NumPy array
+        ends: End timestamps, one per start
+        tz: Time zone whose calendar dates are shown (tzinfo or IANA key); defaults to UTC
+        locale: Optional registered locale code; defaults to English
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
+
+    Returns:
+        List of strings, identical to calling date_range() on each pair
+
+    Raises:
+        ValueError: If starts and ends differ in length or a timestamp is invalid
+    """
+    ticks = _unit_ticks(unit)
+    zone = _zone_index(tz) if tz is not None else None
+    compiled = _get_locale(locale) if locale is not None else None
+
+    np = sys.modules.get('numpy')
+    if np is not None and (isinstance(starts, np.ndarray) or isinstance(ends, np.ndarray)):
+        start_array, end_array = np.asarray(starts), np.asarray(ends)
+        if start_array.shape != end_array.shape:
+            raise ValueError('starts and ends must have the same length')
+        vectorized = _date_range_numpy(np, start_array, end_array, ticks, zone, compiled)
+        if vectorized is not None:
+            return vectorized
+        starts, ends = start_array.tolist(), end_array.tolist()
+
+    # Integer arrays hold Unix ticks already; anything else goes through normalize
+    normalize: Callable[[Any], int] | None
+    if all(isinstance(values, array) and values.typecode in _INT_TYPECODES for values in (starts, ends)):
+        normalize = None if ticks == 1 else (lambda ts: ts // ticks)
+    else:
+        normalize = _normalize_timestamp if ticks == 1 else (lambda ts: _normalize_ticks(ts, ticks))
+    render = _date_range_days if compiled is None else compiled.date_range
+    ranges: dict[tuple[int, int], str] = {}
+    labels = []
+    pairs: Iterable[tuple[Any, Any]] = zip(starts, ends, strict=True)
+    for start, end in pairs:
+        if normalize is None:
+            start_ts, end_ts = start, end
+        else:
+            start_ts = normalize(start)
+            end_ts = normalize(end)
+        if start_ts > end_ts:
+            start_ts, end_ts = end_ts, start_ts
+        if zone is not None:
+            start_ts += zone.offset(start_ts)
+            end_ts += zone.offset(end_ts)
+        key = (start_ts // SECONDS_PER_DAY, end_ts // SECONDS_PER_DAY)
+        label = ranges.get(key)
+        if label is None:
+            label = ranges[key] = render(*key)
+        labels.append(label)
+    return labels
+
+
+class Formatter:
+    """
+    Formats many timestamps against one fixed reference time.
+
+    The reference is normalized once, and its day number, year and the
+    labels for the surrounding week ("Yesterday", "Last Friday", "This
+    Sunday", ...) are precomputed, so each call only normalizes its own
+    timestamp. Results are identical to the module-level functions.
+    An optional tz (tzinfo or IANA key) applies to human_date() and
+    date_range(), and an optional locale and unit to every method, as they
+    do for the module-level functions; the unit covers the reference too.
+    """
+
+    __slots__ = ('_reference', '_tz', '_zone', '_locale', '_unit', '_ticks', '_ref_day', '_ref_year', '_near_labels')
+
+    def __init__(
+        self,
+        reference: Timestamp,
+        tz: tzinfo | str | None = None,
+        locale: str | None = None,
+        unit: str = 's',
+    ):
+        self._unit = unit
+        self._ticks = _unit_ticks(unit)
+        self._reference = _normalize_ticks(reference, self._ticks)
+        self._tz = tz
+        self._zone = _zone_index(tz) if tz is not None else None
+        self._locale = _get_locale(locale) if locale is not None else None
+        self._ref_day = self._local_seconds(self._reference) // SECONDS_PER_DAY
+        self._ref_year = _civil_from_days(self._ref_day).year
+
+        # Labels for day offsets -6..6, indexed by offset + 6. Days outside the
+        # supported calendar stay None so they raise like human_date() does.
+        near_labels: list[str | None] = []
+        for offset in range(-6, 7):
+            day = self._ref_day + offset
+            if not _MIN_DAY <= day <= _MAX_DAY:
+                near_labels.append(None)
+            elif self._locale is not None:
+                near_labels.append(self._locale.near_day(offset, (day + 4) % 7))
+            elif offset == 0:
+                near_labels.append('Today')
+            elif offset == -1:
+                near_labels.append('Yesterday')
+            elif offset == 1:
+                near_labels.append('Tomorrow')
+            else:
+                weekday = WEEKDAYS[_civil_from_days(day).weekday]
+                near_labels.append(f'Last {weekday}' if offset < 0 else f'This {weekday}')
+        self._near_labels = tuple(near_labels)
+
+    @property
+    def reference(self) -> int:
+        """The normalized reference time in Unix seconds."""
+        return self._reference
+
+    def __repr__(self) -> str:
+        args = [f'reference={self._reference}']
+        if self._tz is not None:
+            args.append(f'tz={self._tz!r}')
+        if self._locale is not None:
+            args.append(f'locale={self._locale.code!r}')
+        if self._unit != 's':
+            args.append(f'unit={self._unit!r}')
+        return f'Formatter({", ".join(args)})'
+
+    def _local_seconds(self, timestamp: int) -> int:
+        zone = self._zone
+        return timestamp if zone is None else timestamp + zone.offset(timestamp)
+
+    def timeago(self, timestamp: Timestamp) -> str:
+        """Same as timeago(timestamp, reference, locale, unit)."""
+        ticks = self._ticks
+        ts = _normalize_timestamp(timestamp) if ticks == 1 else _normalize_ticks(timestamp, ticks)
+        diff = self._reference - ts
+        return _timeago_from_diff(diff) if self._locale is None else self._locale.timeago(diff)
+
+    def human_date(self, timestamp: Timestamp) -> str:
+        """Same as human_date(timestamp, reference, tz, locale, unit)."""
+        ticks = self._ticks
+        ts = _normalize_timestamp(timestamp) if ticks == 1 else _normalize_ticks(timestamp, ticks)
+        return self._human_day(self._local_seconds(ts) // SECONDS_PER_DAY)
+
+    def _human_day(self, days: int) -> str:
+        """human_date() label of a local day number."""
+        offset = days - self._ref_day
+        if -6 <= offset <= 6:
+            label = self._near_labels[offset + 6]
+            if label is not None:
+                return label
+
+        ts_date = _civil_from_days(days)
+        if self._locale is not None:
+            return self._locale.date(ts_date, ts_date.year != self._ref_year)
+        if ts_date.year == self._ref_year:
+            return f'{MONTHS[ts_date.month]} {ts_date.day}'
+        return f'{MONTHS[ts_date.month]} {ts_date.day}, {ts_date.year}'
+
+    def date_range(self, start: Timestamp, end: Timestamp) -> str:
+        """Same as date_range(start, end, tz, locale, unit); the reference does not affect ranges."""
+        ticks = self._ticks
+        if ticks == 1:
+            start_ts, end_ts = _normalize_timestamp(start), _normalize_timestamp(end)
+        else:
+            start_ts, end_ts = _normalize_ticks(start, ticks), _normalize_ticks(end, ticks)
+        return _date_range(start_ts, end_ts, self._zone, self._locale)
+
+
+def _format_chunk(func: Callable[..., object], chunk: list, args: tuple) -> list:
+    """Applies func to every item of one chunk (module-level so process pools can pickle it)."""
+    return [func(item, *args) for item in chunk]
+
+
+async def aformat(
+    func: Callable[..., object],
+    items: Iterable,
+    *args: object,
+    chunk_size: int = 1000,
+    executor: Executor | None = None,
+    offload_threshold: int = 100_000,
+) -> list:
+    """
+    Applies a whenwords function to many items without blocking the event loop.
+
+    Each result is ``func(item, *args)``, returned in input order. Inputs of
+    at most chunk_size items run inline with no scheduling overhead. Larger
+    inputs are processed chunk by chunk, yielding to the event loop between
+    chunks; with an executor, inputs of at least offload_threshold items are
+    processed there instead. Cancelling the awaiting task stops the batch
+    at the next chunk boundary.
+
+    Args:
+        func: Function to apply, e.g. timeago or human_date
+        items: Values passed as the first argument to func
+        *args: Extra arguments shared by every call (e.g. the reference time)
+        chunk_size: Items processed between yields to the event loop
+        executor: Optional thread or process pool for very large batches
+        offload_threshold: Minimum batch size sent to the executor
+
+    Returns:
+        List of results in the same order as items
+    """
+    import asyncio
+
+    if chunk_size < 1:
+        raise ValueError('chunk_size must be at least 1')
+
+    items = items if isinstance(items, list) else list(items)
+    if len(items) <= chunk_size:
+        return [func(item, *args) for item in items]
+
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    results: list = []
+
+    if executor is not None and len(items) >= offload_threshold:
+        loop = asyncio.get_running_loop()
+        futures = [loop.run_in_executor(executor, _format_chunk, func, chunk, args) for chunk in chunks]
+        for chunk_results in await asyncio.gather(*futures):
+            results.extend(chunk_results)
+        return results
+
+    for chunk in chunks:
+        results.extend(_format_chunk(func, chunk, args))
+        await asyncio.sleep(0)
+    return results
+
+
+# Columnar output: UTF-8 data plus int32 offsets, as in Arrow's string layout
+
+# Encoded " year"/" years"/"y" style unit labels, parallel to _DURATION_PARTS
+_DURATION_PARTS_UTF8 = tuple(
+    (f' {singular}'.encode(), f' {plural}'.encode(), short.encode())
+    for singular, plural, short, _ in _DURATION_PARTS
+)
+_ASCII_NUMBERS = tuple(str(n).encode() for n in range(1000))
+
+
+def _output_buffers(data, offsets, count: int) -> tuple[memoryview, memoryview]:
+    """Validates caller-supplied buffers and returns writable byte and int32 views."""
+    out = memoryview(data).cast('B')
+    if out.readonly:
+        raise TypeError('data must be a writable buffer (e.g. bytearray)')
+    offs = memoryview(offsets)
+    if offs.readonly or offs.format not in ('i', '@i', '=i'):
+        raise TypeError("offsets must be a writable native int32 buffer (e.g. array('i'))")
+    if len(offs) < count + 1:
+        raise ValueError(f'offsets buffer too small: need {count + 1} entries, got {len(offs)}')
+    offs[0] = 0
+    return out, offs
+
+
+def _write_rows(rows: Iterable[bytes], out: memoryview, offs: memoryview) -> int:
+    """Copies encoded rows into out in batches, recording each row's end in offs."""
+    capacity = len(out)
+    pos = start = 0
+    batch: list[bytes] = []
+
+    for row, encoded in enumerate(rows, start=1):
+        pos += len(encoded)
+        if pos > capacity:
+            raise ValueError(f'data buffer too small at row {row - 1} ({capacity} bytes)')
+        offs[row] = pos
+        batch.append(encoded)
+        if len(batch) == 4096:
+            out[start:pos] = b''.join(batch)
+            start = pos
+            batch.clear()
+
+    if batch:
+        out[start:pos] = b''.join(batch)
+    return pos
+
+
+def timeago_into(timestamps: Sequence[Timestamp], reference: Timestamp, data, offsets, unit: str = 's') -> int:
+    """
+    Writes timeago() strings for many timestamps into preallocated buffers.
+
+    Row i is stored as UTF-8 in ``data[offsets[i]:offsets[i + 1]]`` (Arrow's
+    string layout), copied from pre-encoded labels without creating a str
+    per row.
+
+    Args:
+        timestamps: Sequence of timestamps, integer array.array or NumPy array
+        reference: Comparison time shared by every timestamp
+        data: Writable byte buffer (bytearray, memoryview, NumPy uint8, ...)
+        offsets: Writable native int32 buffer with room for len(timestamps) + 1 entries
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
+
+    Returns:
+        Number of bytes written to data
+
+    Raises:
+        ValueError: If a buffer is too small or a timestamp or unit is invalid
+    """
+    ticks = _unit_ticks(unit)
+    ref = _normalize_ticks(reference, ticks)
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(timestamps, np.ndarray):
+        timestamps = timestamps.tolist()
+    out, offs = _output_buffers(data, offsets, len(timestamps))
+
+    if isinstance(timestamps, array) and timestamps.typecode in _INT_TYPECODES:
+        normalize = None if ticks == 1 else (lambda ts: ts // ticks)
+    else:
+        normalize = _normalize_timestamp if ticks == 1 else (lambda ts: _normalize_ticks(ts, ticks))
+
+    def encoded_rows():
+        bounds = _TIMEAGO_BOUNDS
+        labels = _TIMEAGO_LABELS_UTF8
+        for ts in timestamps:
+            diff = ref - (normalize(ts) if normalize else ts)
+            abs_diff = -diff if diff < 0 else diff
+            if abs_diff < _TIMEAGO_TABLE_END:
+                yield labels[(bisect_right(bounds, abs_diff) - 1) * 2 + (diff < 0)]
+            else:
+                yield _timeago_from_diff(diff).encode()
+
+    return _write_rows(encoded_rows(), out, offs)
+
+
+def duration_into(
+    values: Sequence[int | float],
+    data,
+    offsets,
+    options: DurationOptions | None = None,
+) -> int:
+    """
+    Writes duration() strings for many values into preallocated buffers.
+
+    Uses the same layout as timeago_into(): row i is the UTF-8 text in
+    ``data[offsets[i]:offsets[i + 1]]``, assembled from pre-encoded unit
+    labels and digits rather than per-row str objects.
+
+    Args:
+        values: Durations in seconds (must be non-negative)
+        data: Writable byte buffer
+        offsets: Writable native int32 buffer with room for len(values) + 1 entries
+        options: Optional formatting options shared by every row
+
+    Returns:
+        Number of bytes written to data
+
+    Raises:
+        ValueError: If a buffer is too small or a value is negative
+    """
+    if options is None:
+        compact, max_units = False, 2
+    else:
+        compact, max_units = options.compact, options.max_units
+
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(values, np.ndarray):
+        values = values.tolist()
+    out, offs = _output_buffers(data, offsets, len(values))
+
+    def encoded_rows():
+        zero = b'0s' if compact else b'0 seconds'
+        separator = b' ' if compact else b', '
+        numbers = _ASCII_NUMBERS
+        for seconds in values:
+            if seconds < 0:
+                raise ValueError('Duration must be a non-negative number')
+            if seconds == 0:
+                yield zero
+                continue
+            pieces = []
+            for index, value in _duration_parts(int(seconds), max_units):
+                digits = numbers[value] if value < 1000 else b'%d' % value
+                labels = _DURATION_PARTS_UTF8[index]
+                pieces.append(digits + (labels[2] if compact else labels[0] if value == 1 else labels[1]))
+            yield separator.join(pieces)
+
+    return _write_rows(encoded_rows(), out, offs)
+
+
+# Dictionary-encoded output: unique strings plus uint16 codes
+
+_MAX_CATEGORIES = 1 << 16
+
+
+def _dictionary_encode(labels: Iterable[str]) -> tuple[list[str], array]:
+    """Encodes labels as (unique labels in first-seen order, array('H') of codes)."""
+    categories: list[str] = []
+    index: dict[str, int] = {}
+    codes = array('H')
+    append = codes.append
+    for label in labels:
+        code = index.get(label)
+        if code is None:
+            code = len(categories)
+            if code == _MAX_CATEGORIES:
+                raise ValueError(f'More than {_MAX_CATEGORIES} distinct strings; cannot use uint16 codes')
+            index[label] = code
+            categories.append(label)
+        append(code)
+    return categories, codes
+
+
+def _numpy_dictionary_encode(np, labels: list[str], codes) -> tuple[list[str], object]:
+    """Compacts codes into a (possibly larger) label list down to only the labels used."""
+    used, inverse = np.unique(codes, return_inverse=True)
+    # Distinct table rows can share a string ("just now" past and future)
+    categories, remap = _dictionary_encode([labels[i] for i in used.tolist()])
+    return categories, np.frombuffer(remap, dtype=np.uint16)[inverse.reshape(-1)]
+
+
+def timeago_codes(
+    timestamps: Iterable[Timestamp], reference: Timestamp, unit: str = 's',
+) -> tuple[list[str], object]:
+    """
+    Dictionary-encodes timeago() output for many timestamps.
+
+    Returns the distinct strings plus one uint16 code per timestamp, so
+    ``categories[codes[i]] == timeago(timestamps[i], reference)``.
+
+    Args:
+        timestamps: Sequence of timestamps, integer array.array or NumPy array
+        reference: Comparison time shared by every timestamp
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
+
+    Returns:
+        (categories, codes): codes is an array('H'), or a NumPy uint16 array
+        for NumPy input
+
+    Raises:
+        ValueError: If a timestamp is invalid or there are over 65536 distinct strings
+    """
+    ticks = _unit_ticks(unit)
+    ref = _normalize_ticks(reference, ticks)
+
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(timestamps, np.ndarray):
+        encoded = _timeago_numpy_codes(np, timestamps, ref, ticks)
+        if encoded is not None:
+            return _numpy_dictionary_encode(np, *encoded)
+        categories, codes = _dictionary_encode(_timeago_many(timestamps.tolist(), ref, ticks))
+        return categories, np.frombuffer(codes, dtype=np.uint16)
+
+    return _dictionary_encode(_timeago_many(timestamps, ref, ticks))
+
+
+def human_date_codes(
+    timestamps: Iterable[Timestamp],
+    reference: Timestamp,
+    tz: tzinfo | str | None = None,
+    locale: str | None = None,
+    unit: str = 's',
+) -> tuple[list[str], object]:
+    """
+    Dictionary-encodes human_date() output for many timestamps.
+
+    Each distinct day is formatted once, so the cost is proportional to the
+    number of distinct days rather than rows.
+
+    Args:
+        timestamps: Sequence of timestamps, integer array.array or NumPy array
+        reference: Comparison time shared by every timestamp
+        tz: Time zone (tzinfo or IANA key); defaults to UTC
+        locale: Optional registered locale code; defaults to English
+        unit: What numeric timestamps count ('s', 'ms', 'us' or 'ns'), as in timeago()
+
+    Returns:
+        (categories, codes) with ``categories[codes[i]] == human_date(timestamps[i], reference, tz, locale, unit)``;
+        codes is an array('H'), or a NumPy uint16 array for NumPy input
+
+    Raises:
+        ValueError: If a timestamp is invalid or there are over 65536 distinct days
+    """
+    formatter = Formatter(reference, tz, locale, unit)
+    zone = formatter._zone
+    ticks = formatter._ticks
+
+    np = sys.modules.get('numpy')
+    if np is not None and isinstance(timestamps, np.ndarray):
+        seconds = _numpy_seconds(np, timestamps, ticks)
+        if seconds is not None and zone is not None:
+            seconds = _numpy_local_seconds(np, zone, seconds)
+        if seconds is not None:
+            days, inverse = np.unique(seconds // SECONDS_PER_DAY, return_inverse=True)
+            if len(days) > _MAX_CATEGORIES:
+                raise ValueError(f'More than {_MAX_CATEGORIES} distinct strings; cannot use uint16 codes')
+            labels = [formatter._human_day(day) for day in days.tolist()]
+            return labels, inverse.reshape(-1).astype(np.uint16)
+        timestamps = timestamps.tolist()
+
+    normalize = _normalize_timestamp if ticks == 1 else (lambda ts: _normalize_ticks(ts, ticks))
+    local = formatter._local_seconds
+    day_labels: dict[int, str] = {}
+
+    def day_labels_iter():
+        for ts in timestamps:
+            day = local(normalize(ts)) // SECONDS_PER_DAY
+            label = day_labels.get(day)
+            if label is None:
+                label = day_labels[day] = formatter._human_day(day)
+            yield label
+
+    return _dictionary_encode(day_labels_iter())
+
+
+# Opt-in instrumentation: call counts, latency histograms and input types
+
+# Public functions enable_stats() wraps. Generator and coroutine functions
+# (parse_duration_many, parse_duration_lines, aformat) are left out: their
+# calls return before the work is done.
+_INSTRUMENTED = (
+    'timeago', 'timeago_many', 'duration', 'parse_duration', 'human_date', 'date_range',
+    'date_range_many', 'timeago_into', 'duration_into', 'timeago_codes', 'human_date_codes',
+)
+# Latency bucket i counts calls taking under 2**i nanoseconds (the last is open-ended)
+_LATENCY_BUCKETS = 48
+_INPUT_TYPE_NAMES = {int: 'int', float: 'float', str: 'str', datetime: 'datetime'}
+
+_stats_originals: dict[str, Callable] = {}
+_stats_lock: threading.Lock | None = None
+_stats_local: threading.local | None = None
+# (thread, its counters) for every thread that has recorded since the last reset
+_thread_stats: list[tuple[threading.Thread, _ThreadStats]] = []
+
+
+class FunctionStats(_FrozenRecord):
+    """Counters for one instrumented function."""
+    __slots__ = ('calls', 'errors', 'total_ns', 'latency_ns')
+    calls: int
+    errors: int
+    total_ns: int
+    latency_ns: dict[int, int]
+
+    def __init__(self, calls: int, errors: int, total_ns: int, latency_ns: dict[int, int]):
+        set_field = object.__setattr__
+        set_field(self, 'calls', calls)
+        set_field(self, 'errors', errors)
+        set_field(self, 'total_ns', total_ns)
+        set_field(self, 'latency_ns', latency_ns)
+
+
+class Stats(_FrozenRecord):
+    """Snapshot returned by stats()."""
+    __slots__ = ('enabled', 'functions', 'input_types')
+    enabled: bool
+    functions: dict[str, FunctionStats]
+    input_types: dict[str, int]
+
+    def __init__(self, enabled: bool, functions: dict[str, FunctionStats], input_types: dict[str, int]):
+        set_field = object.__setattr__
+        set_field(self, 'enabled', enabled)
+        set_field(self, 'functions', functions)
+        set_field(self, 'input_types', input_types)
+
+
+class _CallRecorder:
+    """Mutable counters of one function in one thread."""
+    __slots__ = ('calls', 'errors', 'total_ns', 'buckets')
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.total_ns = 0
+        self.buckets = [0] * _LATENCY_BUCKETS
+
+
+class _ThreadStats:
+    """One thread's counters. Only the owning thread writes them, so recording takes no lock."""
+    __slots__ = ('recorders', 'input_types')
+
+    def __init__(self) -> None:
+        self.recorders = {name: _CallRecorder() for name in _INSTRUMENTED}
+        self.input_types: dict[str, int] = {}
+
+    def reset(self) -> None:
+        for recorder in self.recorders.values():
+            recorder.reset()
+        self.input_types.clear()
+
+
+def _register_thread_stats(local: threading.local, lock: threading.Lock) -> _ThreadStats:
+    """Creates the calling thread's counters on its first recorded call."""
+    import threading
+
+    thread_stats = local.stats = _ThreadStats()
+    with lock:
+        _thread_stats.append((threading.current_thread(), thread_stats))
+    return thread_stats
+
+
+def _timed(name: str, func: Callable, local: threading.local, lock: threading.Lock) -> Callable:
+    """Wraps func to record its call count, errors and latency."""
+    from functools import wraps
+    from time import perf_counter_ns
+
+    last_bucket = _LATENCY_BUCKETS - 1
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        failed = True
+        start = perf_counter_ns()
+        try:
+            result = func(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            elapsed = perf_counter_ns() - start
+            try:
+                recorder = local.stats.recorders[name]
+            except AttributeError:
+                recorder = _register_thread_stats(local, lock).recorders[name]
+            recorder.calls += 1
+            recorder.errors += failed
+            recorder.total_ns += elapsed
+            recorder.buckets[min(elapsed.bit_length(), last_bucket)] += 1
+
+    return wrapper
+
+
+def _counting_input_types(
+    normalize: Callable[[Timestamp], int], local: threading.local, lock: threading.Lock,
+) -> Callable[[Timestamp], int]:
+    """Wraps _normalize_timestamp to tally the type of every timestamp it sees."""
+    def wrapper(timestamp: Timestamp) -> int:
+        kind = _INPUT_TYPE_NAMES.get(type(timestamp))
+        if kind is None:
+            kind = next((name for cls, name in _INPUT_TYPE_NAMES.items() if isinstance(timestamp, cls)), 'other')
+        try:
+            counts = local.stats.input_types
+        except AttributeError:
+            counts = _register_thread_stats(local, lock).input_types
+        counts[kind] = counts.get(kind, 0) + 1
+        return normalize(timestamp)
+
+    return wrapper
+
+
+def enable_stats() -> None:
+    """
+    Starts recording per-function call counts, errors, latency and input types.
+
+    The public functions are swapped for timed wrappers, so there is no cost at
+    all while stats are disabled. Because the module attributes are replaced,
+    names bound earlier with ``from whenwords import timeago`` keep calling the
+    unwrapped function; call through the module (``whenwords.timeago``) or
+    import after enabling. Calling it again while enabled does nothing.
+    """
+    global _stats_lock, _stats_local
+    if _stats_originals:
+        return
+    lock, local = _stats_lock, _stats_local
+    if lock is None or local is None:
+        import threading
+        lock = _stats_lock = threading.Lock()
+        local = _stats_local = threading.local()
+
+    module = globals()
+    for name in (*_INSTRUMENTED, '_normalize_timestamp'):
+        _stats_originals[name] = module[name]
+    for name in _INSTRUMENTED:
+        module[name] = _timed(name, module[name], local, lock)
+    module['_normalize_timestamp'] = _counting_input_types(module['_normalize_timestamp'], local, lock)
+
+
+def disable_stats() -> None:
+    """Restores the uninstrumented functions. Counters are kept until reset_stats()."""
+    globals().update(_stats_originals)
+    _stats_originals.clear()
+
+
+def reset_stats() -> None:
+    """Zeroes every counter and forgets threads that have exited since the last reset."""
+    if _stats_lock is None:
+        return
+    with _stats_lock:
+        _thread_stats[:] = [(thread, counters) for thread, counters in _thread_stats if thread.is_alive()]
+        for _, counters in _thread_stats:
+            counters.reset()
+
+
+def stats() -> Stats:
+    """
+    Returns a snapshot of the counters recorded since enable_stats() or reset_stats().
+
+    Counters are kept per thread and summed here. ``functions`` maps each
+    instrumented function to its FunctionStats, whose ``latency_ns`` maps a
+    bucket's upper bound in nanoseconds (a power of two) to the number of
+    calls that finished under it and at or above the previous bound.
+    ``input_types`` counts timestamps normalized one at a time by type (int,
+    float, str, datetime, other); integer ``array.array`` and NumPy batches
+    skip per-item normalization and are not broken down. A public function
+    that builds on another (timeago_codes() on timeago_many()) is recorded
+    once, under its own name.
+    """
+    totals = {name: _CallRecorder() for name in _INSTRUMENTED}
+    input_types: dict[str, int] = {}
+    if _stats_lock is not None:
+        with _stats_lock:
+            threads = [counters for _, counters in _thread_stats]
+        for counters in threads:
+            for name, recorder in counters.recorders.items():
+                total = totals[name]
+                total.calls += recorder.calls
+                total.errors += recorder.errors
+                total.total_ns += recorder.total_ns
+                total.buckets = [a + b for a, b in zip(total.buckets, recorder.buckets)]
+            for kind, count in counters.input_types.items():
+                input_types[kind] = input_types.get(kind, 0) + count
+
+    functions = {
+        name: FunctionStats(
+            total.calls, total.errors, total.total_ns,
+            {1 << i: count for i, count in enumerate(total.buckets) if count},
+        )
+        for name, total in totals.items()
+    }
+    return Stats(bool(_stats_originals), functions, input_types)
+
+
+# Command-line interface: python -m whenwords
+
+_CLI_OPS = ('timeago', 'human_date', 'duration', 'parse_duration')
+
+
+def _cli_coerce_number(value: object) -> object:
+    """Turns numeric strings (e.g. CSV cells) into int/float; leaves other values alone."""
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+
+def _cli_timestamp(value: object) -> Timestamp:
+    """A field value as a timestamp, numeric strings included; TypeError like _normalize_timestamp() otherwise."""
+    value = _cli_coerce_number(value)
+    if not isinstance(value, (int, float, str, datetime)):
+        raise TypeError(f'Invalid timestamp type: {type(value).__name__}')
+    return value
+
+
+def _cli_apply(op: str, value: object, reference: Timestamp | None, options: DurationOptions) -> str | int:
+    """Applies one CLI operation to a single field value."""
+    if op == 'timeago':
+        return timeago(_cli_timestamp(value), reference)
+    if op == 'human_date':
+        return human_date(_cli_timestamp(value), reference)
+    if op == 'duration':
+        seconds = _cli_coerce_number(value)
+        if not isinstance(seconds, (int, float)):
+            raise ValueError(f'Invalid duration: {value!r}')
+        return duration(seconds, options)
+    if not isinstance(value, str):
+        raise ValueError(f'Invalid duration string: {value!r}')
+    return parse_duration(value)
+
+
+def _cli_process_chunk(task: tuple) -> str:
+    """
+    Transforms one chunk of JSONL lines or CSV rows and returns the encoded output.
+
+    Runs in worker processes when --workers > 1, so it only takes picklable arguments.
+    """
+    import csv
+    import io
+    import json
+
+    fmt, spec, first_line, records = task
+    op, field, target, reference, options, on_error = spec
+    out = io.StringIO()
+
+    if fmt == 'jsonl':
+        for line_no, line in enumerate(records, start=first_line):
+            if not line.strip():
+                out.write(line)
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                if on_error == 'fail':
+                    raise ValueError(f'line {line_no}: invalid JSON: {e}') from None
+                out.write('null\n')
+                continue
+            if not isinstance(row, dict):
+                if on_error == 'fail':
+                    raise ValueError(f'line {line_no}: expected a JSON object, got {type(row).__name__}')
+                out.write(line if line.endswith('\n') else line + '\n')
+                continue
+            try:
+                row[target] = _cli_apply(op, row[field], reference, options)
+            except (ValueError, TypeError, KeyError) as e:
+                if on_error == 'fail':
+                    raise ValueError(f'line {line_no}: {e}') from None
+                row[target] = None
+            out.write(json.dumps(row, ensure_ascii=False))
+            out.write('\n')
+    else:
+        writer = csv.writer(out, lineterminator='\n')
+        for line_no, row in enumerate(records, start=first_line):
+            try:
+                result = _cli_apply(op, row[field], reference, options)
+            except (ValueError, TypeError, IndexError) as e:
+                if on_error == 'fail':
+                    raise ValueError(f'row {line_no}: {e}') from None
+                result = ''
+            if target >= len(row):
+                row.extend([''] * (target + 1 - len(row)))
+            row[target] = result
+            writer.writerow(row)
+
+    return out.getvalue()
+
+
+def _cli_run(tasks: Iterable[tuple], workers: int, write) -> None:
+    """Processes CLI chunks in order, in worker processes when workers > 1."""
+    for output in _ordered_map(_cli_process_chunk, tasks, workers):
+        write(output)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Streams JSONL or CSV from stdin to stdout, formatting one field per record.
+
+    Example:
+        python -m whenwords --field ts --op timeago --reference 1704067200 < events.jsonl
+    """
+    import argparse
+    import csv
+    import os
+
+    parser = argparse.ArgumentParser(
+        prog='python -m whenwords',
+        description='Add human-readable time columns to JSONL or CSV streams (stdin to stdout).',
+    )
+    parser.add_argument('--field', required=True, help='input field (JSON key or CSV column name)')
+    parser.add_argument('--op', required=True, choices=_CLI_OPS)
+    parser.add_argument('--output-field', help='write results here instead of replacing --field')
+    parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+    parser.add_argument('--reference',
+                        help='reference time for timeago/human_date (Unix seconds or ISO 8601; default now)')
+    parser.add_argument('--compact', action='store_true', help='compact duration output ("1h 30m")')
+    parser.add_argument('--max-units', type=int, default=2, help='max duration units (default 2)')
+    parser.add_argument('--on-error', choices=('fail', 'null'), default='fail',
+                        help='abort on a bad value, or emit null/empty and continue')
+    parser.add_argument('--workers', type=int, default=1, help='worker processes (default 1)')
+    parser.add_argument('--chunk-size', type=int, default=10_000, help='records per chunk')
+    args = parser.parse_args(argv)
+
+    if args.chunk_size < 1:
+        parser.error('--chunk-size must be at least 1')
+
+    reference = None
+    if args.reference is not None:
+        reference = _cli_timestamp(args.reference)
+        try:
+            _normalize_timestamp(reference)
+        except ValueError as e:
+            parser.error(f'--reference: {e}')
+    elif args.op in ('timeago', 'human_date'):
+        # Fixed once here so every chunk and worker shares the same "now"
+        import time
+
+        reference = int(time.time())
+
+    options = DurationOptions(compact=args.compact, max_units=args.max_units)
+
+    try:
+        with open(sys.stdin.fileno(), encoding='utf-8', newline='', closefd=False) as stdin, \
+                open(sys.stdout.fileno(), 'w', encoding='utf-8', newline='', closefd=False,
+                     buffering=1 << 16) as stdout:
+            if args.format == 'jsonl':
+                target = args.output_field or args.field
+                spec = (args.op, args.field, target, reference, options, args.on_error)
+                tasks = (
+                    ('jsonl', spec, 1 + i * args.chunk_size, chunk)
+                    for i, chunk in enumerate(_chunked(stdin, args.chunk_size))
+                )
+            else:
+                reader = csv.reader(stdin)
+                header = next(reader, None)
+                if header is None:
+                    return 0
+                if args.field not in header:
+                    parser.error(f'--field: no column named {args.field!r}')
+                if args.output_field and args.output_field not in header:
+                    header.append(args.output_field)
+                target = header.index(args.output_field or args.field)
+                spec = (args.op, header.index(args.field), target, reference, options, args.on_error)
+                csv.writer(stdout, lineterminator='\n').writerow(header)
+                tasks = (
+                    ('csv', spec, 2 + i * args.chunk_size, chunk)
+                    for i, chunk in enumerate(_chunked(reader, args.chunk_size))
+                )
+
+            _cli_run(tasks, args.workers, stdout.write)
+    except ValueError as e:
+        print(f'whenwords: {e}', file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Downstream closed early (e.g. piped into head); silence the final flush
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+# Optional compiled accelerator: this same file built by build_accel.py into
+# an extension module saved beside it. When one matching this interpreter is
+# present it takes this module's place in sys.modules, so `import whenwords`
+# returns the compiled functions; WHENWORDS_PURE_PYTHON=1 keeps this code.
+_ACCELERATOR = '_whenwords_accel'
+# build_accel.py replaces None with _source_digest() of the file it compiled,
+# so a build older than this file is detected and ignored
+_SOURCE_DIGEST = None
+
+# True in the compiled build, whose functions are not Python function objects
+COMPILED = not isinstance(_round_half_up, FunctionType)
+
+
+def _source_digest(path: str) -> str:
+    """SHA-256 of a source file, as embedded in the compiled build."""
+    from hashlib import sha256
+
+    with open(path, 'rb') as f:
+        return sha256(f.read()).hexdigest()
+
+
+def _load_accelerator():
+    """Loads the compiled build of this module, or returns None if it is absent, stale or disabled."""
+    import os
+    if COMPILED or os.environ.get('WHENWORDS_PURE_PYTHON'):
+        return None
+    from importlib.machinery import EXTENSION_SUFFIXES
+    base = os.path.join(os.path.dirname(os.path.abspath(__file__)), _ACCELERATOR)
+    for suffix in EXTENSION_SUFFIXES:
+        if os.path.exists(base + suffix):
+            break
+    else:
+        return None
+
+    import importlib.util
+    # Built under the name whenwords, so its classes and functions pickle
+    # interchangeably with this module's
+    spec = importlib.util.spec_from_file_location('whenwords', base + suffix)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+    except ImportError:
+        # Built for another interpreter or from an incompatible source
+        return None
+    if module._SOURCE_DIGEST != _source_digest(__file__):
+        import warnings
+
+        warnings.warn(
+            f'ignoring {os.path.basename(base + suffix)}: built from an older whenwords.py '
+            '(rebuild with python build_accel.py)', RuntimeWarning, stacklevel=2,
+        )
+        return None
+    return module
+
+
+if __name__ in ('whenwords', '__main__'):
+    _accelerated = _load_accelerator()
+    if _accelerated is not None:
+        sys.modules['whenwords'] = _accelerated
+        if __name__ == '__main__':
+            main = _accelerated.main
+
+
+if __name__ == '__main__':
+    sys.exit(main())